@@ -15,41 +15,63 @@ This package contains the core processing modules:
 - title_extractor: Title extraction from remaining tokens
 """
 
-# Explicit imports make the public API clear and prevent namespace pollution
-from .tokenizer import Tokenizer, TokenizationResult, Token
-from .pre_tokenizer import (
-    PreTokenizer,
-    PreTokenizationResult,
-    RemovedToken,
-    EarlyRemovalCategory
-)
-from .path_parser import PathParser, PathParseResult
-from .resolver import PathFilenameResolver
-from .date_extractor import DateExtractor, DateMatch
-from .studio_matcher import StudioMatcher
-from .studio_code_finder import StudioCodeFinder
-from .performer_matcher import PerformerMatcher
-from .sequence_extractor import SequenceExtractor
-from .final_stage_extractor import FinalStageExtractor
-from .title_extractor import TitleExtractor
-
-__all__ = [
-    'Tokenizer',
-    'TokenizationResult',
-    'Token',
-    'PreTokenizer',
-    'PreTokenizationResult',
-    'RemovedToken',
-    'EarlyRemovalCategory',
-    'PathParser',
-    'PathParseResult',
-    'PathFilenameResolver',
-    'DateExtractor',
-    'DateMatch',
-    'StudioMatcher',
-    'StudioCodeFinder',
-    'PerformerMatcher',
-    'SequenceExtractor',
-    'FinalStageExtractor',
-    'TitleExtractor',
-]
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+# Public names and the submodule defining each. Submodules are imported on
+# first attribute access (PEP 562), so importing one module of the package
+# (e.g. `modules.report_sinks`) does not load the whole parsing pipeline.
+_EXPORTS = {
+    'Tokenizer': 'tokenizer',
+    'TokenizationResult': 'tokenizer',
+    'Token': 'tokenizer',
+    'SpanToken': 'tokenizer',
+    'PreTokenizer': 'pre_tokenizer',
+    'PreTokenizationResult': 'pre_tokenizer',
+    'RemovedToken': 'pre_tokenizer',
+    'EarlyRemovalCategory': 'pre_tokenizer',
+    'PathParser': 'path_parser',
+    'PathParseResult': 'path_parser',
+    'PathFilenameResolver': 'resolver',
+    'DateExtractor': 'date_extractor',
+    'DateMatch': 'date_extractor',
+    'StudioMatcher': 'studio_matcher',
+    'StudioCodeFinder': 'studio_code_finder',
+    'PerformerMatcher': 'performer_matcher',
+    'SequenceExtractor': 'sequence_extractor',
+    'FinalStageExtractor': 'final_stage_extractor',
+    'TitleExtractor': 'title_extractor',
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .tokenizer import Tokenizer, TokenizationResult, Token, SpanToken
+    from .pre_tokenizer import (
+        PreTokenizer,
+        PreTokenizationResult,
+        RemovedToken,
+        EarlyRemovalCategory
+    )
+    from .path_parser import PathParser, PathParseResult
+    from .resolver import PathFilenameResolver
+    from .date_extractor import DateExtractor, DateMatch
+    from .studio_matcher import StudioMatcher
+    from .studio_code_finder import StudioCodeFinder
+    from .performer_matcher import PerformerMatcher
+    from .sequence_extractor import SequenceExtractor
+    from .final_stage_extractor import FinalStageExtractor
+    from .title_extractor import TitleExtractor
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_EXPORTS))
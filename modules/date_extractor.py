@@ -12,7 +12,7 @@ from .tokenizer import Token, TokenizationResult
 from .dictionary_loader import DictionaryLoader
 
 
-@dataclass
+@dataclass(slots=True)
 class DateMatch:
     """Represents a date found within a token."""
     date_str: str
@@ -53,7 +53,7 @@ class DateExtractor:
 
         patterns = []
         month_pattern = config.get('month_pattern', '')
-        month_names = config.get('month_names', {})
+        month_names = dict(config.get('month_names', {}))
 
         for pattern_entry in config.get('patterns', []):
             regex_str = pattern_entry.get('regex', '')
@@ -113,7 +113,9 @@ class DateExtractor:
             group=result.group,
             studio_code=getattr(result, "studio_code", None),
             sources=result.sources,
-            confidences=result.confidences
+            confidences=result.confidences,
+            removed_tokens=result.removed_tokens,
+            pre_tokenization=result.pre_tokenization,
         )
 
     def _find_dates_in_tokens(self, tokens: List[Token]) -> List[DateMatch]:
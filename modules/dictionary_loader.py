@@ -4,18 +4,43 @@ Dictionary loader utility for centralized dictionary loading and caching.
 
 Provides a single point of access for loading parser dictionaries with
 error handling and optional caching to avoid redundant file reads.
+
+Loaded dictionaries are deeply read-only: JSON objects become
+`MappingProxyType` views and arrays become tuples. One cached copy is shared
+by every parser in the process (and every thread), so nothing may mutate
+it; callers that need to modify data copy it into their own structures.
+The cache itself is only written under a lock, which makes concurrent
+`FilenameParser` construction safe on free-threaded builds as well.
 """
 
 import json
+import threading
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Dict, Optional
 
 
+def freeze(value: Any) -> Any:
+    """
+    Return a deeply read-only copy of parsed JSON.
+
+    Dicts become `MappingProxyType` views over private dicts and lists become
+    tuples; strings, numbers, booleans and None are returned unchanged.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
 class DictionaryLoader:
     """Centralized dictionary loader with caching support."""
 
-    # Cache for loaded dictionaries to avoid redundant file reads
-    _cache: Dict[str, Dict[str, Any]] = {}
+    # Cache for loaded (frozen) dictionaries to avoid redundant file reads
+    _cache: Dict[str, Any] = {}
+    # Serializes cache writes; reads of an already-cached entry take no lock.
+    _lock = threading.RLock()
 
     @staticmethod
     def get_dictionary_path(dictionary_name: str = "parser-dictionary.json") -> Path:
@@ -44,23 +69,34 @@ class DictionaryLoader:
             use_cache: Whether to use cached version if available
 
         Returns:
-            Dictionary contents (can be dict, list, or other JSON types), or None if loading fails
+            Read-only dictionary contents (mapping, tuple, or other JSON scalar; see
+            `freeze`), or None if loading fails
         """
         # Check cache first if caching is enabled
-        if use_cache and dictionary_name in cls._cache:
-            return cls._cache[dictionary_name]
+        if use_cache:
+            dictionary = cls._cache.get(dictionary_name)
+            if dictionary is not None:
+                return dictionary
+
+            with cls._lock:
+                # Another thread may have loaded it while we waited.
+                dictionary = cls._cache.get(dictionary_name)
+                if dictionary is None:
+                    dictionary = cls._read(dictionary_name)
+                    if dictionary is not None:
+                        cls._cache[dictionary_name] = dictionary
+                return dictionary
+
+        return cls._read(dictionary_name)
 
+    @classmethod
+    def _read(cls, dictionary_name: str) -> Optional[Any]:
+        """Read and freeze a dictionary file, or return None if it cannot be loaded."""
         dictionary_path = cls.get_dictionary_path(dictionary_name)
 
         try:
             with open(dictionary_path, 'r', encoding='utf-8') as f:
-                dictionary = json.load(f)
-
-            # Cache the result if caching is enabled
-            if use_cache:
-                cls._cache[dictionary_name] = dictionary
-
-            return dictionary
+                return freeze(json.load(f))
 
         except (FileNotFoundError, json.JSONDecodeError, IOError):
             return None
@@ -89,6 +125,26 @@ class DictionaryLoader:
 
         return dictionary.get(section_name)
 
+    @classmethod
+    def reload(cls, dictionary_name: str) -> Optional[Any]:
+        """
+        Re-read a dictionary from disk and replace its cached copy.
+
+        The cache entry is only replaced when the file parses, so a
+        half-written edit leaves the previous contents in place.
+
+        Args:
+            dictionary_name: Name of the dictionary file to reload
+
+        Returns:
+            The new dictionary contents, or None if the file could not be loaded
+        """
+        dictionary = cls._read(dictionary_name)
+        if dictionary is not None:
+            with cls._lock:
+                cls._cache[dictionary_name] = dictionary
+        return dictionary
+
     @classmethod
     def clear_cache(cls, dictionary_name: Optional[str] = None) -> None:
         """
@@ -97,10 +153,11 @@ class DictionaryLoader:
         Args:
             dictionary_name: Specific dictionary to clear, or None to clear all
         """
-        if dictionary_name:
-            cls._cache.pop(dictionary_name, None)
-        else:
-            cls._cache.clear()
+        with cls._lock:
+            if dictionary_name:
+                cls._cache.pop(dictionary_name, None)
+            else:
+                cls._cache.clear()
 
     @classmethod
     def preload_all(cls) -> None:
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Hot reload of parser dictionaries for long-running processes.
+
+Parser components copy dictionary data into their own lookup tables when
+they are constructed, so editing `dictionaries/*.json` has no effect on a
+running parser. `ReloadingParser` wraps a FilenameParser in numbered
+generations:
+
+- It fingerprints every dictionary file (mtime and size first, then a
+  content hash to ignore touches that did not change anything).
+- When files change, it reloads them into DictionaryLoader and builds the
+  next generation with `FilenameParser.with_reloaded_dictionaries`, which
+  rebuilds only the affected components. This can run on a background thread.
+- The new generation is swapped in with a single attribute assignment.
+  `parse` reads the current generation once, so parses already in flight
+  finish on the generation they started with.
+
+A dictionary that fails to load (e.g. half-written JSON) keeps the current
+generation in place; the change is retried on the next check.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .dictionary_loader import DictionaryLoader
+from .tokenizer import TokenizationResult
+
+
+@dataclass(frozen=True, slots=True)
+class DictionaryFingerprint:
+    """Identity of one dictionary file's contents."""
+    mtime_ns: int
+    size: int
+    digest: str
+
+
+@dataclass(frozen=True, slots=True)
+class ParserGeneration:
+    """A parser built from one consistent set of dictionary files."""
+    number: int
+    parser: Any
+    fingerprints: Dict[str, DictionaryFingerprint]
+    changed: Tuple[str, ...] = ()
+    built_at: float = field(default_factory=time.time)
+
+
+def dictionary_directory() -> Path:
+    """Folder holding the parser dictionaries."""
+    return DictionaryLoader.get_dictionary_path().parent
+
+
+def fingerprint_file(path: Path, previous: Optional[DictionaryFingerprint] = None) -> DictionaryFingerprint:
+    """
+    Fingerprint a file, reusing `previous` when mtime and size are unchanged.
+
+    Args:
+        path: File to fingerprint
+        previous: Last known fingerprint of the same file
+
+    Returns:
+        DictionaryFingerprint for the file's current contents
+    """
+    stat = path.stat()
+    if previous is not None and (previous.mtime_ns, previous.size) == (stat.st_mtime_ns, stat.st_size):
+        return previous
+    digest = hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+    return DictionaryFingerprint(mtime_ns=stat.st_mtime_ns, size=stat.st_size, digest=digest)
+
+
+def fingerprint_dictionaries(
+    directory: Optional[Path] = None,
+    previous: Optional[Dict[str, DictionaryFingerprint]] = None,
+) -> Dict[str, DictionaryFingerprint]:
+    """Fingerprint every `*.json` file in the dictionaries folder, keyed by file name."""
+    directory = directory or dictionary_directory()
+    previous = previous or {}
+    fingerprints: Dict[str, DictionaryFingerprint] = {}
+    for path in sorted(directory.glob("*.json")):
+        try:
+            fingerprints[path.name] = fingerprint_file(path, previous.get(path.name))
+        except OSError:
+            continue  # Removed or replaced between glob and stat
+    return fingerprints
+
+
+class ReloadingParser:
+    """FilenameParser front-end that swaps in rebuilt parsers when dictionaries change."""
+
+    def __init__(
+        self,
+        parser: Any,
+        interval: float = 2.0,
+        on_reload: Optional[Callable[[ParserGeneration], None]] = None,
+    ):
+        """
+        Initialize the reloader around an already-built parser (generation 0).
+
+        Args:
+            parser: FilenameParser (anything with `parse` and `with_reloaded_dictionaries`)
+            interval: Seconds between checks when running in the background
+            on_reload: Called with each new generation after it is swapped in
+        """
+        self.interval = interval
+        self.on_reload = on_reload
+        self.last_error: Optional[str] = None
+        self._generation = ParserGeneration(
+            number=0, parser=parser, fingerprints=fingerprint_dictionaries()
+        )
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def generation(self) -> ParserGeneration:
+        """The generation new parses run on."""
+        return self._generation
+
+    @property
+    def parser(self) -> Any:
+        """The current generation's parser."""
+        return self._generation.parser
+
+    def parse(self, filename: Any, *, existing_studio: Optional[str] = None) -> TokenizationResult:
+        """Parse with the current generation (see FilenameParser.parse)."""
+        return self._generation.parser.parse(filename, existing_studio=existing_studio)
+
+    def changed_dictionaries(self) -> List[str]:
+        """Names of dictionary files whose contents differ from the current generation."""
+        current = self._generation.fingerprints
+        return list(_changed_names(current, fingerprint_dictionaries(previous=current)))
+
+    def reload_if_changed(self) -> Optional[ParserGeneration]:
+        """
+        Build and swap in a new generation if any dictionary changed.
+
+        Returns:
+            The new generation, or None when nothing changed or a changed
+            dictionary could not be loaded (see `last_error`)
+        """
+        with self._reload_lock:
+            previous = self._generation
+            latest = fingerprint_dictionaries(previous=previous.fingerprints)
+            changed = _changed_names(previous.fingerprints, latest)
+            if not changed:
+                if latest != previous.fingerprints:
+                    # Touched but identical: remember the new mtimes so the
+                    # files are not hashed again on every check.
+                    self._generation = replace(previous, fingerprints=latest)
+                return None
+
+            failed = [
+                name for name in changed
+                if name in latest and DictionaryLoader.reload(name) is None
+            ]
+            if failed:
+                self.last_error = f"Could not load {', '.join(failed)}; keeping generation {previous.number}"
+                return None
+            for name in changed:
+                if name not in latest:
+                    DictionaryLoader.clear_cache(name)
+
+            generation = ParserGeneration(
+                number=previous.number + 1,
+                parser=previous.parser.with_reloaded_dictionaries(changed),
+                fingerprints=latest,
+                changed=changed,
+            )
+            self._generation = generation
+            self.last_error = None
+
+        if self.on_reload is not None:
+            self.on_reload(generation)
+        return generation
+
+    def start(self) -> None:
+        """Check for dictionary changes every `interval` seconds on a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="yansa-dictionary-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread (a rebuild in progress completes first)."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> "ReloadingParser":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.reload_if_changed()
+            except Exception as exc:  # noqa: BLE001 - keep watching; report via last_error
+                self.last_error = f"Dictionary reload failed: {exc}"
+
+
+def _changed_names(
+    before: Dict[str, DictionaryFingerprint], after: Dict[str, DictionaryFingerprint]
+) -> Tuple[str, ...]:
+    def digest(fingerprints: Dict[str, DictionaryFingerprint], name: str) -> Optional[str]:
+        fingerprint = fingerprints.get(name)
+        return fingerprint.digest if fingerprint is not None else None
+
+    return tuple(sorted(name for name in set(before) | set(after) if digest(before, name) != digest(after, name)))
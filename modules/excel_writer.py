@@ -4,18 +4,24 @@ Utility helpers for writing Excel reports in a consistent table style.
 
 Provides thin wrappers around openpyxl so both the evaluation harness and the
 Stash plugin can share the same formatting logic (headers, auto-width, tables).
+Workbooks are written in write-only (streaming) mode with column widths
+measured in the same pass that buffers the rows (see RowSpool).
+
+openpyxl is imported when a workbook is written, not when this module is
+imported, so callers that never produce Excel output do not pay for it.
 """
 
 from __future__ import annotations
 
+import pickle
+import tempfile
+import warnings
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Optional, Sequence
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill
-from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.table import Table, TableStyleInfo
+if TYPE_CHECKING:
+    from openpyxl import Workbook
 
 
 HighlightPredicate = Callable[[Any], bool]
@@ -29,58 +35,170 @@ class ExcelSheetData:
     Attributes:
         name: Sheet/tab name.
         headers: Ordered list of column headers.
-        rows: Iterable of row values already ordered to match headers.
+        rows: Iterable of row values already ordered to match headers (may be a
+            generator, or a RowSpool carrying its own bold masks).
         highlight_discrepancies: Whether to apply yellow fill when predicate matches.
         discrepancy_predicate: Optional predicate used when highlighting is enabled.
+        bold_cells: Optional per-row bold masks, aligned with rows (may be a generator).
     """
 
     name: str
     headers: Sequence[str]
-    rows: Sequence[Sequence[Any]]
+    rows: Iterable[Sequence[Any]]
     highlight_discrepancies: bool = False
     discrepancy_predicate: Optional[HighlightPredicate] = None
-    bold_cells: Optional[Sequence[Sequence[bool]]] = None
+    bold_cells: Optional[Iterable[Sequence[bool]]] = None
 
 
-def _write_excel_sheet(ws, sheet: ExcelSheetData) -> None:
-    """Render a single sheet using provided headers/rows and optional highlighting."""
-    ws.title = sheet.name
+class _SharedStyles:
+    """Style objects created once per workbook and reused for every styled cell."""
 
-    headers = list(sheet.headers)
-    for col_idx, header in enumerate(headers, 1):
-        ws.cell(row=1, column=col_idx, value=header)
+    def __init__(self) -> None:
+        from openpyxl.styles import Font, PatternFill
+
+        self.highlight_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+        self.bold_font = Font(bold=True)
+
+
+def _measure(row: Sequence[Any], widths: List[int]) -> None:
+    """Widen `widths` to fit every value of `row`."""
+    for col_idx, value in enumerate(row):
+        if value is None:
+            continue
+        length = len(str(value))
+        if col_idx >= len(widths):
+            widths.extend([0] * (col_idx + 1 - len(widths)))
+        if length > widths[col_idx]:
+            widths[col_idx] = length
+
+
+class RowSpool:
+    """
+    Rows and bold masks spooled to an anonymous temp file as they arrive.
+
+    Column widths are measured on append, so a producer that emits rows one at
+    a time (e.g. a report sink) can hand the spool to `write_excel_workbook` as
+    `ExcelSheetData.rows` without holding the rows in memory. Bold masks travel
+    with the rows, so leave `bold_cells` unset for a spooled sheet.
+    """
 
-    yellow_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-    should_highlight = sheet.highlight_discrepancies and sheet.discrepancy_predicate
-    bold_font = Font(bold=True)
+    def __init__(self) -> None:
+        self.widths: List[int] = []
+        self.count = 0
+        self._file: IO[bytes] = tempfile.TemporaryFile()
 
-    for row_idx, row in enumerate(sheet.rows, 2):
-        bold_row: Optional[Sequence[bool]] = None
-        if sheet.bold_cells is not None and (row_idx - 2) < len(sheet.bold_cells):
-            bold_row = sheet.bold_cells[row_idx - 2]
+    def append(self, row: Sequence[Any], bold_row: Optional[Sequence[bool]] = None) -> None:
+        """Spool one row (and its optional bold mask)."""
+        row = list(row)
+        _measure(row, self.widths)
+        pickle.dump((row, list(bold_row) if bold_row is not None else None), self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.count += 1
 
-        for col_idx, value in enumerate(row, 1):
-            cell = ws.cell(row=row_idx, column=col_idx, value=value)
-            if should_highlight and sheet.discrepancy_predicate(value):
-                cell.fill = yellow_fill
-            if bold_row is not None and (col_idx - 1) < len(bold_row) and bool(bold_row[col_idx - 1]):
-                cell.font = bold_font
+    def replay(self) -> Iterator[Tuple[Sequence[Any], Optional[Sequence[bool]]]]:
+        """Yield the spooled (row, bold mask) pairs in order."""
+        self._file.seek(0)
+        for _ in range(self.count):
+            yield pickle.load(self._file)
 
-    for col_idx in range(1, len(headers) + 1):
-        col_letter = get_column_letter(col_idx)
-        max_length = len(headers[col_idx - 1])
+    def __iter__(self) -> Iterator[Sequence[Any]]:
+        return (row for row, _ in self.replay())
 
-        for cell in ws[col_letter]:
-            if cell.value is not None:
-                max_length = max(max_length, len(str(cell.value)))
+    def close(self) -> None:
+        """Delete the temp file."""
+        self._file.close()
 
-        ws.column_dimensions[col_letter].width = min(max_length + 2, 50)
 
-    if sheet.rows:
+def _spool_rows(
+    sheet: ExcelSheetData,
+    widths: List[int],
+) -> Tuple[Iterable[Tuple[Sequence[Any], Optional[Sequence[bool]]]], int, Optional[RowSpool]]:
+    """
+    Make a single pass over the sheet rows, tracking the widest value per column.
+
+    Rows that are already materialized (lists/tuples) are just measured and
+    replayed from memory. Iterators are spooled to an anonymous temp file so
+    widths are known before the first row is written without holding every
+    row in memory; a RowSpool is replayed as is.
+
+    Returns:
+        (replayable row/bold pairs, row count, spool to close or None)
+    """
+    if isinstance(sheet.rows, (list, tuple)) and (sheet.bold_cells is None or isinstance(sheet.bold_cells, (list, tuple))):
+        for row in sheet.rows:
+            _measure(row, widths)
+        bold_rows = sheet.bold_cells or []
+        pairs = [
+            (row, bold_rows[idx] if idx < len(bold_rows) else None)
+            for idx, row in enumerate(sheet.rows)
+        ]
+        return pairs, len(sheet.rows), None
+
+    if isinstance(sheet.rows, RowSpool):
+        spool = sheet.rows
+    else:
+        bold_iter = iter(sheet.bold_cells) if sheet.bold_cells is not None else None
+        spool = RowSpool()
+        for row in sheet.rows:
+            spool.append(row, next(bold_iter, None) if bold_iter is not None else None)
+
+    for col_idx, width in enumerate(spool.widths):
+        if col_idx >= len(widths):
+            widths.append(width)
+        elif width > widths[col_idx]:
+            widths[col_idx] = width
+    return spool.replay(), spool.count, spool
+
+
+def _write_streaming_sheet(wb: Workbook, sheet: ExcelSheetData, styles: _SharedStyles) -> None:
+    """Render a single sheet into a write-only workbook."""
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils import get_column_letter
+    from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
+
+    ws = wb.create_sheet(title=sheet.name)
+
+    headers = list(sheet.headers)
+    widths = [len(str(header)) for header in headers]
+    rows, row_count, spool = _spool_rows(sheet, widths)
+
+    try:
+        # Write-only sheets emit <cols> before the first row, so widths go first.
+        for col_idx in range(1, len(headers) + 1):
+            ws.column_dimensions[get_column_letter(col_idx)].width = min(widths[col_idx - 1] + 2, 50)
+
+        ws.append(headers)
+
+        should_highlight = bool(sheet.highlight_discrepancies and sheet.discrepancy_predicate)
+        for row, bold_row in rows:
+            if not should_highlight and not (bold_row and any(bold_row)):
+                ws.append(row)
+                continue
+
+            cells: List[Any] = []
+            for col_idx, value in enumerate(row):
+                highlight = should_highlight and sheet.discrepancy_predicate(value)
+                bold = bold_row is not None and col_idx < len(bold_row) and bool(bold_row[col_idx])
+                if not highlight and not bold:
+                    cells.append(value)
+                    continue
+                cell = WriteOnlyCell(ws, value=value)
+                if highlight:
+                    cell.fill = styles.highlight_fill
+                if bold:
+                    cell.font = styles.bold_font
+                cells.append(cell)
+            ws.append(cells)
+    finally:
+        if spool is not None:
+            spool.close()
+
+    if row_count:
         last_col = get_column_letter(len(headers))
-        data_range = f"A1:{last_col}{len(sheet.rows) + 1}"
+        data_range = f"A1:{last_col}{row_count + 1}"
         table_name = sheet.name.replace(" ", "") + "Table"
         table = Table(displayName=table_name, ref=data_range)
+        # Write-only sheets cannot read header cells back, so name columns explicitly.
+        table.tableColumns = [TableColumn(id=idx, name=str(header)) for idx, header in enumerate(headers, 1)]
         table.tableStyleInfo = TableStyleInfo(
             name="TableStyleMedium9",
             showFirstColumn=False,
@@ -88,13 +206,20 @@ def _write_excel_sheet(ws, sheet: ExcelSheetData) -> None:
             showRowStripes=True,
             showColumnStripes=False,
         )
-        ws.add_table(table)
+        with warnings.catch_warnings():
+            # openpyxl always warns for write-only tables; columns are set above.
+            warnings.simplefilter("ignore", UserWarning)
+            ws.add_table(table)
 
 
 def write_excel_workbook(output_path: Path | str, sheets: Sequence[ExcelSheetData]) -> Path:
     """
     Write a workbook consisting of the provided sheets.
 
+    Uses openpyxl's write-only mode: rows are streamed to the file instead of
+    being kept as cell objects, so sheet rows (and bold masks) may be
+    iterators of arbitrary length.
+
     Args:
         output_path: Destination path for the workbook.
         sheets: Ordered sheet definitions to render.
@@ -105,13 +230,15 @@ def write_excel_workbook(output_path: Path | str, sheets: Sequence[ExcelSheetDat
     if not sheets:
         raise ValueError("At least one sheet must be provided to write a workbook.")
 
+    from openpyxl import Workbook
+
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    wb = Workbook()
-    for idx, sheet in enumerate(sheets):
-        ws = wb.active if idx == 0 else wb.create_sheet()
-        _write_excel_sheet(ws, sheet)
+    wb = Workbook(write_only=True)
+    styles = _SharedStyles()
+    for sheet in sheets:
+        _write_streaming_sheet(wb, sheet, styles)
 
     wb.save(output_path)
     return output_path
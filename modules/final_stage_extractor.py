@@ -19,7 +19,7 @@ from .tokenizer import TokenizationResult
 from .trimmer import Trimmer
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LabeledSequenceMatch:
     key: str
     number: int
@@ -42,9 +42,24 @@ class FinalStageExtractor:
     _LEADING_NUMBER_RE = re.compile(r"^\s*(\d{1,3})\s+(.+?)\s*$")
     _SEAN_CODY_CODE_RE = re.compile(r"^sc-?\d{4}$", re.IGNORECASE)
 
+    # (group name, sequence key, label regex), tried in this order at each
+    # position: explicit labels (preferred) before shorthand forms.
+    _SEQUENCE_LABELS: Tuple[Tuple[str, str, str], ...] = (
+        ("scene", "scene", r"(?:scene|sc)\b"),
+        ("part", "part", r"(?:part|pt)\b"),
+        ("episode", "episode", r"(?:episode|ep)\b"),
+        ("volume", "volume", r"(?:volume|vol)\b"),
+        ("disc", "disc", r"(?:disc|disk|cd)\b"),
+        # Shorthand forms (more ambiguous).
+        ("scene_short", "scene", r"s"),
+        ("part_short", "part", r"p"),
+        ("episode_short", "episode", r"e"),
+        ("volume_short", "volume", r"v"),
+    )
+
     def __init__(self) -> None:
         self.trimmer = Trimmer()
-        self._sequence_patterns = self._build_sequence_patterns()
+        self._sequence_pattern, self._sequence_keys = self._build_sequence_pattern()
 
     def process(self, result: TokenizationResult) -> TokenizationResult:
         if not result.tokens:
@@ -72,26 +87,19 @@ class FinalStageExtractor:
         result.pattern = self._rebuild_pattern_for_title(result.pattern, result.tokens)
         return result
 
-    def _build_sequence_patterns(self) -> List[Tuple[str, re.Pattern[str]]]:
-        patterns: List[Tuple[str, re.Pattern[str]]] = []
-
-        def add(key: str, expr: str) -> None:
-            patterns.append((key, re.compile(expr, re.IGNORECASE)))
-
-        # Explicit labels (preferred).
-        add("scene", r"\b(?:scene|sc)\b[.\s-]?#?\s*(\d+)\b")
-        add("part", r"\b(?:part|pt)\b[.\s-]?#?\s*(\d+)\b")
-        add("episode", r"\b(?:episode|ep)\b[.\s-]?#?\s*(\d+)\b")
-        add("volume", r"\b(?:volume|vol)\b[.\s-]?#?\s*(\d+)\b")
-        add("disc", r"\b(?:disc|disk|cd)\b[.\s-]?#?\s*(\d+)\b")
-
-        # Shorthand forms (more ambiguous, applied after explicit labels).
-        add("scene", r"\bs[.\s-]?#?\s*(\d+)\b")
-        add("part", r"\bp[.\s-]?#?\s*(\d+)\b")
-        add("episode", r"\be[.\s-]?#?\s*(\d+)\b")
-        add("volume", r"\bv[.\s-]?#?\s*(\d+)\b")
+    def _build_sequence_pattern(self) -> Tuple[re.Pattern[str], Dict[str, str]]:
+        """
+        Compile every sequence label into one alternation with a named number group each.
 
-        return patterns
+        The labels cannot overlap (shorthand letters must be followed by a
+        separator, "#" or digit; explicit labels are whole words), so one
+        left-to-right scan finds the same markers as scanning once per label.
+        """
+        alternatives = [
+            rf"\b{label}[.\s-]?#?\s*(?P<{name}>\d+)\b" for name, _, label in self._SEQUENCE_LABELS
+        ]
+        keys = {name: key for name, key, _ in self._SEQUENCE_LABELS}
+        return re.compile("|".join(alternatives), re.IGNORECASE), keys
 
     def _extract_labeled_sequences(
         self,
@@ -123,14 +131,8 @@ class FinalStageExtractor:
 
             # Use the rightmost match for group/title splitting heuristics.
             primary = max(matches, key=lambda m: (m.end, m.start))
-            prefix_raw = original[: primary.start].strip()
-            suffix_raw = original[primary.end :].strip()
-
-            prefix = self._remove_sequence_markers(prefix_raw)
-            suffix = self._remove_sequence_markers(suffix_raw)
-
-            prefix = self._clean_text(prefix)
-            suffix = self._clean_text(suffix)
+            prefix = self._clean_text(self._remove_sequence_markers(original, matches, 0, primary.start))
+            suffix = self._clean_text(self._remove_sequence_markers(original, matches, primary.end, len(original)))
 
             # Scene/volume/episode/disc markers at the end typically indicate group.
             group_markers = {"scene", "volume", "episode", "disc"}
@@ -315,37 +317,30 @@ class FinalStageExtractor:
         return f"{', '.join(names[:-1])} & {names[-1]}"
 
     def _find_labeled_sequences(self, text: str) -> List[LabeledSequenceMatch]:
-        matches: List[LabeledSequenceMatch] = []
-        for key, pattern in self._sequence_patterns:
-            for match in pattern.finditer(text):
-                try:
-                    number = int(match.group(1))
-                except (TypeError, ValueError):
-                    continue
-                matches.append(
-                    LabeledSequenceMatch(
-                        key=key,
-                        number=number,
-                        start=match.start(),
-                        end=match.end(),
-                    )
-                )
-        # Sort by position for stable downstream handling.
-        matches.sort(key=lambda m: (m.start, m.end))
-        return matches
-
-    def _remove_sequence_markers(self, text: str) -> str:
-        if not text:
-            return ""
-        matches = self._find_labeled_sequences(text)
-        if not matches:
-            return text
-
-        # Remove from right to left so indices remain stable.
-        cleaned = text
-        for match in sorted(matches, key=lambda m: m.start, reverse=True):
-            cleaned = cleaned[: match.start] + cleaned[match.end :]
-        return cleaned
+        """Sequence markers in `text`, in position order."""
+        keys = self._sequence_keys
+        return [
+            LabeledSequenceMatch(
+                key=keys[match.lastgroup],
+                number=int(match.group(match.lastgroup)),
+                start=match.start(),
+                end=match.end(),
+            )
+            for match in self._sequence_pattern.finditer(text)
+        ]
+
+    def _remove_sequence_markers(
+        self, text: str, matches: Iterable[LabeledSequenceMatch], start: int, end: int
+    ) -> str:
+        """`text[start:end]` without the already-found markers that lie inside it."""
+        pieces: List[str] = []
+        position = start
+        for match in matches:
+            if match.start >= position and match.end <= end:
+                pieces.append(text[position:match.start])
+                position = match.end
+        pieces.append(text[position:end])
+        return "".join(pieces)
 
     def _is_numeric_only(self, text: str) -> bool:
         return bool(self._NUMERIC_ONLY_RE.match(text))
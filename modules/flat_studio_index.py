@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Flat, shareable studio lookup table.
+
+`StudioMatcher.studios` is a dict of a few thousand str -> str entries. Forked
+workers inherit it copy-on-write, but every lookup bumps reference counts on
+the key and value objects, so the pages holding them are gradually copied
+into each worker anyway. `FlatStudioIndex` stores the same mapping as plain
+bytes in one buffer (a `multiprocessing.shared_memory` segment or an mmap'd
+file). Lookups binary-search the sorted keys without creating Python objects
+for the table itself, so every worker reads the same physical pages.
+
+Buffer layout (native byte order, all integers unsigned 32-bit):
+
+    header        magic, key count, value count
+    key_offsets   key_count + 1 offsets into the key blob (keys sorted by UTF-8 bytes)
+    key_values    value index of each sorted key
+    key_order     sorted position of each key in original insertion order
+    value_offsets value_count + 1 offsets into the value blob
+    key blob, value blob
+
+The index is a read-only `Mapping` that iterates in the original insertion
+order, so it can stand in for the dict wherever `StudioMatcher` reads it.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Mapping
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+_MAGIC = b"YSFIDX01"
+_HEADER = struct.Struct("=8sII")
+
+
+def encode_studio_index(studios: Mapping) -> bytes:
+    """
+    Serialize a lowercase-key -> canonical-name mapping into the flat layout.
+
+    Args:
+        studios: Mapping to encode, in the iteration order lookups should keep
+
+    Returns:
+        Buffer contents for `FlatStudioIndex`
+    """
+    items = [(key.encode("utf-8"), value) for key, value in studios.items()]
+    sorted_positions = sorted(range(len(items)), key=lambda idx: items[idx][0])
+
+    value_ids: Dict[str, int] = {}
+    values: List[bytes] = []
+    key_offsets = array("I", [0])
+    key_values = array("I")
+    key_order = array("I", bytes(4 * len(items)))
+    key_blob = bytearray()
+    for sorted_idx, item_idx in enumerate(sorted_positions):
+        key, value = items[item_idx]
+        key_blob += key
+        key_offsets.append(len(key_blob))
+        value_id = value_ids.get(value)
+        if value_id is None:
+            value_id = value_ids[value] = len(values)
+            values.append(value.encode("utf-8"))
+        key_values.append(value_id)
+        key_order[item_idx] = sorted_idx
+
+    value_offsets = array("I", [0])
+    value_blob = bytearray()
+    for value in values:
+        value_blob += value
+        value_offsets.append(len(value_blob))
+
+    return b"".join((
+        _HEADER.pack(_MAGIC, len(items), len(values)),
+        key_offsets.tobytes(),
+        key_values.tobytes(),
+        key_order.tobytes(),
+        value_offsets.tobytes(),
+        bytes(key_blob),
+        bytes(value_blob),
+    ))
+
+
+class FlatStudioIndex(Mapping):
+    """Read-only str -> str mapping backed by a flat shared buffer."""
+
+    def __init__(self, buffer: Any, *, shm: Optional[shared_memory.SharedMemory] = None,
+                 path: Optional[Path] = None, owner: bool = False):
+        """
+        Wrap an encoded buffer. Use the `create`/`attach`/`open` constructors.
+
+        Args:
+            buffer: Object supporting the buffer protocol holding the encoded index
+            shm: Shared memory segment backing `buffer`, if any
+            path: File backing `buffer`, if any
+            owner: Whether `unlink()` should remove the backing segment/file
+        """
+        self._shm = shm
+        self._path = path
+        self._owner = owner
+        self._mmap: Optional[mmap.mmap] = buffer if isinstance(buffer, mmap.mmap) else None
+        self._view: Optional[memoryview] = memoryview(buffer)
+
+        magic, key_count, value_count = _HEADER.unpack_from(self._view, 0)
+        if magic != _MAGIC:
+            raise ValueError("Not a flat studio index buffer")
+        self._count = key_count
+
+        cursor = _HEADER.size
+        self._key_offsets, cursor = self._uint_array(cursor, key_count + 1)
+        self._key_values, cursor = self._uint_array(cursor, key_count)
+        self._key_order, cursor = self._uint_array(cursor, key_count)
+        self._value_offsets, cursor = self._uint_array(cursor, value_count + 1)
+        key_end = cursor + self._key_offsets[key_count]
+        self._keys = self._view[cursor:key_end]
+        self._values = self._view[key_end:key_end + self._value_offsets[value_count]]
+
+    @classmethod
+    def create(cls, studios: Mapping, path: Optional[str | os.PathLike] = None) -> "FlatStudioIndex":
+        """
+        Encode `studios` into a new shared memory segment, or into `path` when given.
+
+        The returned index owns the segment/file; call `close()` and `unlink()`
+        when every process is done with it.
+        """
+        data = encode_studio_index(studios)
+        if path is not None:
+            path = Path(path)
+            path.write_bytes(data)
+            index = cls.open(path)
+            index._owner = True
+            return index
+
+        shm = shared_memory.SharedMemory(create=True, size=len(data))
+        shm.buf[:len(data)] = data
+        return cls(shm.buf, shm=shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "FlatStudioIndex":
+        """Attach to a shared memory segment created by another process."""
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm.buf, shm=shm)
+
+    @classmethod
+    def open(cls, path: str | os.PathLike) -> "FlatStudioIndex":
+        """Map an index file written by `create(..., path=...)` read-only."""
+        path = Path(path)
+        with open(path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, path=path)
+
+    @property
+    def name(self) -> Optional[str]:
+        """Shared memory segment name (None for file-backed indexes)."""
+        return self._shm.name if self._shm is not None else None
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the encoded index."""
+        return self._view.nbytes
+
+    def __reduce__(self):
+        # Pickling (e.g. into a spawn worker bundle) re-attaches to the same
+        # backing store instead of copying the table.
+        if self._shm is not None:
+            return (FlatStudioIndex.attach, (self._shm.name,))
+        if self._path is not None:
+            return (FlatStudioIndex.open, (str(self._path),))
+        return (FlatStudioIndex, (self._view.tobytes(),))
+
+    def _uint_array(self, cursor: int, count: int):
+        end = cursor + 4 * count
+        return self._view[cursor:end].cast("I"), end
+
+    def _find(self, key: str) -> int:
+        """Sorted position of `key`, or -1."""
+        target = key.encode("utf-8")
+        keys = self._keys
+        offsets = self._key_offsets
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = keys[offsets[mid]:offsets[mid + 1]].tobytes()
+            if probe < target:
+                lo = mid + 1
+            elif probe > target:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def _value_at(self, position: int) -> str:
+        value_id = self._key_values[position]
+        return self._values[self._value_offsets[value_id]:self._value_offsets[value_id + 1]].tobytes().decode("utf-8")
+
+    def _key_at(self, position: int) -> str:
+        return self._keys[self._key_offsets[position]:self._key_offsets[position + 1]].tobytes().decode("utf-8")
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if not isinstance(key, str):
+            return default
+        position = self._find(key)
+        return self._value_at(position) if position >= 0 else default
+
+    def __getitem__(self, key: str) -> str:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._find(key) >= 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for position in self._key_order:
+            yield self._key_at(position)
+
+    def items(self):
+        """(key, value) pairs in original insertion order."""
+        return [(self._key_at(position), self._value_at(position)) for position in self._key_order]
+
+    def close(self) -> None:
+        """Release this process's views of the buffer (safe to call twice)."""
+        if self._view is None:
+            return
+        for view in (self._key_offsets, self._key_values, self._key_order, self._value_offsets,
+                     self._keys, self._values, self._view):
+            view.release()
+        if self._shm is not None:
+            self._shm.close()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._view = None
+
+    def __del__(self) -> None:
+        # The segment refuses to close while our memoryviews are exported.
+        try:
+            self.close()
+        except (AttributeError, BufferError):
+            pass
+
+    def unlink(self) -> None:
+        """Remove the backing segment/file (owner only; other processes keep their mappings)."""
+        if not self._owner:
+            return
+        if self._shm is not None:
+            self._shm.unlink()
+        elif self._path is not None:
+            self._path.unlink(missing_ok=True)
+        self._owner = False
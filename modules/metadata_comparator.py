@@ -5,19 +5,30 @@ Metadata comparator for comparing parsed and existing scene metadata.
 This module provides field-by-field comparison between yansa.py parsed
 metadata (ParsedMetadata) and existing Stash metadata (Scene), including:
 - string normalization
-- similarity scoring (Levenshtein)
+- similarity scoring (bit-parallel Levenshtein, see modules.similarity)
 - conflict classification (minor/major/conflict)
 - per-field recommendations (accept/keep/manual review)
+- batch comparison (`compare_many`) returning columnar status/score arrays
 """
 
 from __future__ import annotations
 
 import re
+from array import array
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised when numpy is not installed
+    np = None
+    NUMPY_AVAILABLE = False
 
 from .scene_transformer import ParsedMetadata
+from .similarity import normalized_similarity
 from .stash_client import Scene
 
 
@@ -42,6 +53,54 @@ class ComparisonResult:
     requires_review: bool
 
 
+# Status codes used by `ComparisonBatch` (index into STATUS_NAMES).
+STATUS_NAMES: Tuple[str, ...] = (
+    "no_change",
+    "no_data",
+    "new_data",
+    "match",
+    "minor_diff",
+    "major_diff",
+    "conflict",
+)
+NO_CHANGE, NO_DATA, NEW_DATA, MATCH, MINOR_DIFF, MAJOR_DIFF, CONFLICT = range(len(STATUS_NAMES))
+
+OVERALL_STATUS_NAMES: Tuple[str, ...] = ("no_conflicts", "minor_conflicts", "major_conflicts")
+
+COMPARED_FIELDS: Tuple[str, ...] = ("studio", "title", "date", "studio_code")
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass
+class ComparisonBatch:
+    """
+    Columnar result of `MetadataComparator.compare_many`.
+
+    `status[field]` holds status codes (see STATUS_NAMES) and `similarity[field]`
+    the matching scores, one entry per scene. Text fields scoring below the
+    major-diff threshold are conflicts whatever their exact score, so their
+    score is 0.0. Arrays are numpy arrays when numpy is installed and
+    `array.array` otherwise.
+    """
+
+    scene_ids: List[str]
+    status: Dict[str, Any]
+    similarity: Dict[str, Any]
+    overall_status: Any
+    auto_approve: Any
+    requires_review: Any
+
+    def __len__(self) -> int:
+        return len(self.scene_ids)
+
+    def status_name(self, field_name: str, index: int) -> str:
+        return STATUS_NAMES[int(self.status[field_name][index])]
+
+    def overall_status_name(self, index: int) -> str:
+        return OVERALL_STATUS_NAMES[int(self.overall_status[index])]
+
+
 class MetadataComparator:
     def __init__(self) -> None:
         self.confidence_threshold = 0.8
@@ -91,6 +150,221 @@ class MetadataComparator:
             requires_review=requires_review,
         )
 
+    def compare_many(
+        self,
+        parsed_list: Sequence[ParsedMetadata],
+        scenes: Sequence[Scene],
+        config: Optional[Dict[str, Any]] = None,
+    ) -> ComparisonBatch:
+        """
+        Compare many parsed/original pairs at once.
+
+        Produces the same per-field statuses and similarity scores as
+        `compare_scene_metadata`, but normalizes each distinct value once,
+        decides presence/equality for whole columns at a time and only runs
+        edit-distance scoring on pairs that actually differ, stopping early
+        once a text pair cannot reach the major-diff threshold (those
+        conflicts score 0.0). Confidence, recommendations and reasons are not
+        materialized.
+
+        Args:
+            parsed_list: Parsed metadata, aligned with `scenes`
+            scenes: Original Stash scenes
+            config: Optional comparator config applied once for the whole batch
+
+        Returns:
+            ComparisonBatch with status codes and scores per field
+
+        Raises:
+            ValueError: If the two sequences differ in length
+        """
+        if len(parsed_list) != len(scenes):
+            raise ValueError("parsed_list and scenes must have the same length")
+        if config:
+            self._update_config(config)
+
+        studio_cache: Dict[str, str] = {}
+        title_cache: Dict[str, str] = {}
+        code_cache: Dict[str, str] = {}
+
+        status: Dict[str, Any] = {}
+        similarity: Dict[str, Any] = {}
+        status["studio"], similarity["studio"] = self._compare_text_column(
+            [parsed.studio for parsed in parsed_list],
+            [scene.studio.name if scene.studio else None for scene in scenes],
+            lambda value: _cached(studio_cache, value, self._normalize_studio_name),
+        )
+        status["title"], similarity["title"] = self._compare_text_column(
+            [parsed.title for parsed in parsed_list],
+            [scene.title for scene in scenes],
+            lambda value: _cached(title_cache, value, self._normalize_title),
+        )
+        status["date"], similarity["date"] = self._compare_date_column(
+            [parsed.date for parsed in parsed_list],
+            [scene.date for scene in scenes],
+        )
+        status["studio_code"], similarity["studio_code"] = self._compare_text_column(
+            [parsed.studio_code for parsed in parsed_list],
+            [scene.code for scene in scenes],
+            lambda value: _cached(code_cache, value, lambda v: re.sub(r"\s+", "", v.upper())),
+        )
+
+        overall_status, auto_approve, requires_review = self._overall_columns(status, len(scenes))
+        return ComparisonBatch(
+            scene_ids=[scene.id for scene in scenes],
+            status=status,
+            similarity=similarity,
+            overall_status=overall_status,
+            auto_approve=auto_approve,
+            requires_review=requires_review,
+        )
+
+    def _compare_text_column(
+        self,
+        parsed_values: List[Optional[str]],
+        original_values: List[Optional[str]],
+        normalize: Callable[[str], str],
+    ) -> Tuple[Any, Any]:
+        count = len(parsed_values)
+        parsed_clean = [normalize(value) if value is not None else None for value in parsed_values]
+        original_clean = [normalize(value) if value is not None else None for value in original_values]
+
+        if NUMPY_AVAILABLE:
+            parsed_missing = np.fromiter((value is None for value in parsed_values), dtype=bool, count=count)
+            original_missing = np.fromiter((value is None for value in original_values), dtype=bool, count=count)
+            equal = np.fromiter(
+                (a == b for a, b in zip(parsed_clean, original_clean)),
+                dtype=bool,
+                count=count,
+            )
+            codes = np.full(count, CONFLICT, dtype=np.int8)
+            codes[equal] = MATCH
+            codes[original_missing] = NEW_DATA
+            codes[parsed_missing] = NO_DATA
+            codes[parsed_missing & original_missing] = NO_CHANGE
+            scores = np.where(np.isin(codes, (NO_CHANGE, NEW_DATA, MATCH)), 1.0, 0.0)
+            pending = np.flatnonzero(codes == CONFLICT).tolist()
+        else:
+            codes = array("b", [CONFLICT]) * count
+            scores = array("d", [0.0]) * count
+            pending = []
+            for index in range(count):
+                if parsed_values[index] is None:
+                    codes[index] = NO_CHANGE if original_values[index] is None else NO_DATA
+                    scores[index] = 1.0 if original_values[index] is None else 0.0
+                elif original_values[index] is None:
+                    codes[index], scores[index] = NEW_DATA, 1.0
+                elif parsed_clean[index] == original_clean[index]:
+                    codes[index], scores[index] = MATCH, 1.0
+                else:
+                    pending.append(index)
+
+        cutoff = self.similarity_thresholds["major_diff"]
+        for index in pending:
+            score = self._calculate_string_similarity(parsed_clean[index], original_clean[index], score_cutoff=cutoff)
+            codes[index] = self._classify_similarity(score)
+            scores[index] = score
+        return codes, scores
+
+    def _compare_date_column(
+        self,
+        parsed_values: List[Optional[str]],
+        original_values: List[Optional[str]],
+    ) -> Tuple[Any, Any]:
+        count = len(parsed_values)
+        all_seconds = self._date_seconds(parsed_values + original_values)
+        parsed_seconds, original_seconds = all_seconds[:count], all_seconds[count:]
+
+        codes = array("b", [CONFLICT]) * count
+        scores = array("d", [0.0]) * count
+        both_parsed: List[int] = []
+        for index in range(count):
+            parsed_value, original_value = parsed_values[index], original_values[index]
+            if parsed_value is None:
+                codes[index] = NO_CHANGE if original_value is None else NO_DATA
+                scores[index] = 1.0 if original_value is None else 0.0
+            elif original_value is None:
+                codes[index], scores[index] = NEW_DATA, 1.0
+            elif parsed_seconds[index] is None or original_seconds[index] is None:
+                score = self._calculate_string_similarity(parsed_value, original_value)
+                codes[index] = CONFLICT if score < 0.8 else MAJOR_DIFF
+                scores[index] = score
+            else:
+                both_parsed.append(index)
+
+        if NUMPY_AVAILABLE:
+            codes = np.frombuffer(codes, dtype=np.int8).copy()
+            scores = np.frombuffer(scores, dtype=np.float64).copy()
+            if both_parsed:
+                rows = np.asarray(both_parsed, dtype=np.intp)
+                delta = np.asarray([parsed_seconds[i] - original_seconds[i] for i in both_parsed], dtype=np.int64)
+                days = np.abs(np.floor_divide(delta, 86400))
+                codes[rows] = np.select(
+                    [delta == 0, days <= 1, days <= 7],
+                    [MATCH, MINOR_DIFF, MAJOR_DIFF],
+                    default=CONFLICT,
+                )
+                scores[rows] = np.select([delta == 0, days <= 1, days <= 7], [1.0, 0.95, 0.8], default=0.3)
+        else:
+            for index in both_parsed:
+                delta = parsed_seconds[index] - original_seconds[index]
+                days = abs(delta // 86400)
+                if delta == 0:
+                    codes[index], scores[index] = MATCH, 1.0
+                elif days <= 1:
+                    codes[index], scores[index] = MINOR_DIFF, 0.95
+                elif days <= 7:
+                    codes[index], scores[index] = MAJOR_DIFF, 0.8
+                else:
+                    codes[index], scores[index] = CONFLICT, 0.3
+        return codes, scores
+
+    def _date_seconds(self, values: List[Optional[str]]) -> List[Optional[int]]:
+        """
+        Seconds since the epoch for each date string (None when missing or unparseable).
+
+        Each distinct value is parsed once. With numpy, strict ISO dates
+        (YYYY-MM-DD, the form Stash stores) are converted in one datetime64
+        pass; anything else goes through `_parse_date` per value.
+        """
+        distinct = [value for value in dict.fromkeys(values) if value is not None]
+        resolved: Dict[str, Optional[int]] = {}
+        if NUMPY_AVAILABLE and distinct:
+            resolved.update(_iso_date_seconds(distinct))
+        for value in distinct:
+            if value not in resolved:
+                parsed = self._parse_date(value)
+                resolved[value] = None if parsed is None else int((parsed - _EPOCH).total_seconds())
+        return [None if value is None else resolved[value] for value in values]
+
+    def _overall_columns(self, status: Dict[str, Any], count: int) -> Tuple[Any, Any, Any]:
+        if NUMPY_AVAILABLE:
+            stacked = np.vstack([status[field_name] for field_name in COMPARED_FIELDS])
+            major = np.isin(stacked, (MAJOR_DIFF, CONFLICT)).any(axis=0)
+            minor = (stacked == MINOR_DIFF).any(axis=0)
+            overall = np.where(major, 2, np.where(minor, 1, 0)).astype(np.int8)
+            return overall, overall == 0, overall != 0
+
+        overall = array("b", [0]) * count
+        for index in range(count):
+            codes = [status[field_name][index] for field_name in COMPARED_FIELDS]
+            if any(code in (MAJOR_DIFF, CONFLICT) for code in codes):
+                overall[index] = 2
+            elif MINOR_DIFF in codes:
+                overall[index] = 1
+        auto_approve = array("b", [code == 0 for code in overall])
+        requires_review = array("b", [code != 0 for code in overall])
+        return overall, auto_approve, requires_review
+
+    def _classify_similarity(self, similarity: float) -> int:
+        if similarity >= self.similarity_thresholds["exact_match"]:
+            return MATCH
+        if similarity >= self.similarity_thresholds["minor_diff"]:
+            return MINOR_DIFF
+        if similarity >= self.similarity_thresholds["major_diff"]:
+            return MAJOR_DIFF
+        return CONFLICT
+
     def _compare_studio(
         self,
         parsed_value: Optional[str],
@@ -442,33 +716,8 @@ class MetadataComparator:
                 continue
         return None
 
-    def _calculate_string_similarity(self, str1: str, str2: str) -> float:
-        if str1 == str2:
-            return 1.0
-        len1, len2 = len(str1), len(str2)
-        if len1 == 0:
-            return 0.0 if len2 > 0 else 1.0
-        if len2 == 0:
-            return 0.0
-
-        matrix = [[0] * (len2 + 1) for _ in range(len1 + 1)]
-        for i in range(len1 + 1):
-            matrix[i][0] = i
-        for j in range(len2 + 1):
-            matrix[0][j] = j
-
-        for i in range(1, len1 + 1):
-            for j in range(1, len2 + 1):
-                cost = 0 if str1[i - 1] == str2[j - 1] else 1
-                matrix[i][j] = min(
-                    matrix[i - 1][j] + 1,
-                    matrix[i][j - 1] + 1,
-                    matrix[i - 1][j - 1] + cost,
-                )
-
-        distance = matrix[len1][len2]
-        max_len = max(len1, len2)
-        return 1.0 - (distance / max_len)
+    def _calculate_string_similarity(self, str1: str, str2: str, score_cutoff: Optional[float] = None) -> float:
+        return normalized_similarity(str1, str2, score_cutoff=score_cutoff)
 
     def _update_config(self, config: Dict[str, Any]) -> None:
         if "confidence_threshold" in config:
@@ -478,3 +727,44 @@ class MetadataComparator:
         if "field_weights" in config:
             self.field_weights.update(config["field_weights"])
 
+
+def _iso_date_seconds(values: List[str]) -> Dict[str, int]:
+    """
+    Epoch seconds for the values of `values` written as YYYY-MM-DD, computed with numpy.
+
+    Digits are read and calendar-checked with array arithmetic; values of
+    any other shape, and impossible dates such as 2024-02-30, are left out
+    for per-value parsing.
+    """
+    strings = np.asarray(values, dtype=str)
+    chars = strings.astype("U10").view("U1").reshape(len(values), 10)
+    digits = chars[:, [0, 1, 2, 3, 5, 6, 8, 9]]
+    iso = (
+        (np.char.str_len(strings) == 10)
+        & (chars[:, 4] == "-")
+        & (chars[:, 7] == "-")
+        & ((digits >= "0") & (digits <= "9")).all(axis=1)
+    )
+    numbers = digits[iso].view(np.int32) - ord("0")
+    year = numbers[:, :4] @ np.array([1000, 100, 10, 1])
+    month = numbers[:, 4:6] @ np.array([10, 1])
+    day = numbers[:, 6:] @ np.array([10, 1])
+
+    months = ((year - 1970) * 12 + month - 1).astype("datetime64[M]")
+    days = months.astype("datetime64[D]") + (day - 1)
+    # Day 31 of a 30-day month rolls into the next month; datetime has no year 0.
+    valid = (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1) & (days.astype("datetime64[M]") == months)
+    seconds = days.astype(np.int64) * 86400
+    return {
+        value: second
+        for value, second, ok in zip(strings[iso].tolist(), seconds.tolist(), valid.tolist())
+        if ok
+    }
+
+
+def _cached(cache: Dict[str, Any], value: str, func: Callable[[str], Any]) -> Any:
+    try:
+        return cache[value]
+    except KeyError:
+        result = cache[value] = func(value)
+        return result
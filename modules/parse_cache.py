@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Run-level deduplication of filename parses.
+
+Large libraries repeat basenames (re-encodes in other folders, copies,
+multi-file scenes). Parsing is a pure function of the filename and the
+scene's existing studio (parent folders are ignored, as in PreTokenizer),
+so a batch run only needs to parse each `(basename, existing_studio)` pair
+once and can hand the same result to every scene that shares it.
+
+Cached results are shared between callers and must be treated as read-only.
+Their tokens are compacted to spans over the cleaned filename (see
+`TokenizationResult.compact_tokens`) to keep a run's cache small.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Any, Dict, Optional, Tuple
+
+from .tokenizer import TokenizationResult
+
+
+class ParseCache:
+    """Memoizing wrapper around a FilenameParser for the duration of one run."""
+
+    def __init__(self, parser: Any, compact_tokens: bool = True):
+        """
+        Initialize the cache.
+
+        Args:
+            parser: Object exposing `parse(filename, *, existing_studio=None)`
+            compact_tokens: Store results with span tokens instead of substrings
+        """
+        self.parser = parser
+        self.compact_tokens = compact_tokens
+        self.lookups = 0
+        self._results: Dict[Tuple[str, Optional[str]], TokenizationResult] = {}
+
+    def parse(self, filename: str, *, existing_studio: Optional[str] = None) -> TokenizationResult:
+        """
+        Return the parse result for `filename`, parsing it on first use.
+
+        Args:
+            filename: Filename or path to parse
+            existing_studio: Studio already set on the scene, if any
+
+        Returns:
+            TokenizationResult whose fields are shared by every caller with the
+            same key; only `original` reflects the requested filename
+        """
+        self.lookups += 1
+        filename = str(filename)
+        key = (_basename(filename), existing_studio)
+        result = self._results.get(key)
+        if result is None:
+            result = self.parser.parse(filename, existing_studio=existing_studio)
+            if self.compact_tokens:
+                result.compact_tokens()
+            self._results[key] = result
+        elif result.original != filename:
+            result = replace(result, original=filename)
+        return result
+
+    @property
+    def unique(self) -> int:
+        """Number of distinct keys parsed."""
+        return len(self._results)
+
+    @property
+    def reused(self) -> int:
+        """Number of lookups answered from the cache."""
+        return self.lookups - self.unique
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Lookups per actual parse (1.0 means every filename was unique)."""
+        return self.lookups / self.unique if self.unique else 1.0
+
+    def summary(self, noun: str = "scenes") -> str:
+        """One-line description for logs; `noun` names what the lookups were for."""
+        if not self.lookups:
+            return "No filenames parsed"
+        saved = self.reused / self.lookups * 100
+        return (
+            f"Parsed {self.unique} unique basenames for {self.lookups} {noun} "
+            f"(dedup ratio {self.dedup_ratio:.2f}x, {self.reused} parses saved, {saved:.1f}%)"
+        )
+
+    def clear(self) -> None:
+        """Drop cached results and reset counters."""
+        self._results.clear()
+        self.lookups = 0
+
+
+def _basename(filename: str) -> str:
+    """Strip parent folders the same way PreTokenizer does."""
+    return filename.replace("\\", "/").rstrip("/").rsplit("/", 1)[-1]
@@ -293,7 +293,9 @@ class PerformerMatcher:
             group=result.group,
             studio_code=getattr(result, "studio_code", None),
             sources=result.sources,
-            confidences=result.confidences
+            confidences=result.confidences,
+            removed_tokens=result.removed_tokens,
+            pre_tokenization=result.pre_tokenization,
         )
     
     def _rebuild_pattern(
@@ -14,7 +14,7 @@ from .trimmer import Trimmer
 from .dictionary_loader import DictionaryLoader
 
 
-@dataclass
+@dataclass(slots=True)
 class RemovedToken:
     """Represents a token that was removed from the filename."""
     value: str
@@ -23,7 +23,7 @@ class RemovedToken:
     confidence: float
 
 
-@dataclass
+@dataclass(slots=True)
 class PreTokenizationResult:
     """Result of pre-tokenization processing on a filename."""
     original: str
@@ -69,6 +69,11 @@ class PreTokenizer:
         self.trimmer = Trimmer(dictionary_path)
         config = DictionaryLoader.load_dictionary('parser-dictionary.json') or {}
         self.extensions = [ext.lower() for ext in config.get('extensions', [])]
+        # Strings replaced with a dash, read once so a parser keeps the
+        # dictionary generation it was built from.
+        self.replace_with_dash_patterns = [
+            re.compile(re.escape(replace_str)) for replace_str in config.get('replace_with_dash', [])
+        ]
         self.early_removal_categories = self._default_early_removal_categories()
 
     def process(self, filename: str) -> PreTokenizationResult:
@@ -166,18 +171,8 @@ class PreTokenizer:
         for old, new in replacements.items():
             cleaned = cleaned.replace(old, new)
 
-        # Load replacement strings from config
-        config = DictionaryLoader.load_dictionary('parser-dictionary.json') or {}
-        replace_strings = config.get('replace_with_dash', [])
-        
-        # Replace each string with dash anywhere it appears
-        for replace_str in replace_strings:
-            # Escape special regex characters in the replacement string
-            escaped_str = re.escape(replace_str)
-            
-            # Pattern to replace the string with dash anywhere it appears
-            pattern = re.compile(escaped_str)
-            
+        # Replace each configured string with dash anywhere it appears
+        for pattern in self.replace_with_dash_patterns:
             # Replace all occurrences with a dash with proper spacing
             # We handle spacing here to avoid affecting pre-existing dashes
             cleaned = pattern.sub(' - ', cleaned)
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Pluggable output sinks for parser reports.
+
+The Stash plugin and the evaluation harness both produce a table of report
+rows. Excel remains the default, but it is the slowest format to write and to
+load into analysis tools, so rows can also be streamed to:
+
+- csv: header row plus one line per report row
+- jsonl: one JSON object per row, keyed by header
+- parquet: columnar file written in row-group batches (requires pyarrow)
+
+Every sink takes rows positionally (aligned with the headers it was opened
+with), so `SceneReportRow.to_excel_row()` / `ParsedRow.to_excel_row()` values
+can be written to any of them unchanged.
+"""
+
+from __future__ import annotations
+
+import csv
+import importlib.util
+import json
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Sequence
+
+from .excel_writer import ExcelSheetData, HighlightPredicate, RowSpool, write_excel_workbook
+
+# pyarrow is large; only check it is installed here and import it when a
+# Parquet sink is opened.
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+
+REPORT_FORMATS = ("xlsx", "csv", "jsonl", "parquet")
+
+_SUFFIXES = {
+    "xlsx": ".xlsx",
+    "csv": ".csv",
+    "jsonl": ".jsonl",
+    "parquet": ".parquet",
+}
+
+# Accepted alternative names (and file suffixes) for report formats.
+_ALIASES = {"xls": "xlsx", "json": "jsonl"}
+
+
+class ReportSink:
+    """Base class for report outputs; subclasses implement `_write` and `_close`."""
+
+    format_name = ""
+
+    def __init__(self, path: Path | str, headers: Sequence[str]):
+        """
+        Open a sink.
+
+        Args:
+            path: Destination file
+            headers: Ordered column names every row is aligned with
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.headers = list(headers)
+        self.rows_written = 0
+        self._closed = False
+
+    def write_row(self, values: Sequence[Any], bold_mask: Optional[Sequence[bool]] = None) -> None:
+        """Write one row. `bold_mask` is only honoured by formats that can style cells."""
+        self._write(values, bold_mask)
+        self.rows_written += 1
+
+    def write_record(self, record: Any) -> None:
+        """Write a report row object exposing `to_excel_row()` (and optionally `bold_mask`)."""
+        self.write_row(record.to_excel_row(), getattr(record, "bold_mask", None))
+
+    def close(self) -> Path:
+        """Flush and close the sink, returning the written path."""
+        if not self._closed:
+            self._close()
+            self._closed = True
+        return self.path
+
+    def __enter__(self) -> "ReportSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _write(self, values: Sequence[Any], bold_mask: Optional[Sequence[bool]]) -> None:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        raise NotImplementedError
+
+
+class ExcelReportSink(ReportSink):
+    """Spools rows to a temp file and renders a single styled sheet via `write_excel_workbook`."""
+
+    format_name = "xlsx"
+
+    def __init__(
+        self,
+        path: Path | str,
+        headers: Sequence[str],
+        sheet_name: str = "Results",
+        highlight_predicate: Optional[HighlightPredicate] = None,
+    ):
+        super().__init__(path, headers)
+        self.sheet_name = sheet_name
+        self.highlight_predicate = highlight_predicate
+        # Column widths must be known before the first row of a write-only
+        # sheet, so rows go to a measuring temp-file spool, not memory.
+        self._spool = RowSpool()
+
+    def _write(self, values: Sequence[Any], bold_mask: Optional[Sequence[bool]]) -> None:
+        self._spool.append(values, bold_mask)
+
+    def _close(self) -> None:
+        try:
+            write_excel_workbook(
+                self.path,
+                [
+                    ExcelSheetData(
+                        name=self.sheet_name,
+                        headers=self.headers,
+                        rows=self._spool,
+                        highlight_discrepancies=self.highlight_predicate is not None,
+                        discrepancy_predicate=self.highlight_predicate,
+                    )
+                ],
+            )
+        finally:
+            self._spool.close()
+
+
+class CsvReportSink(ReportSink):
+    """Streams rows to a UTF-8 CSV file."""
+
+    format_name = "csv"
+
+    def __init__(self, path: Path | str, headers: Sequence[str]):
+        super().__init__(path, headers)
+        self._handle: IO[str] = self.path.open("w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._handle)
+        self._writer.writerow(self.headers)
+
+    def _write(self, values: Sequence[Any], bold_mask: Optional[Sequence[bool]]) -> None:
+        self._writer.writerow(["" if value is None else value for value in values])
+
+    def _close(self) -> None:
+        self._handle.close()
+
+
+class JsonLinesReportSink(ReportSink):
+    """Streams rows as JSON objects, one per line."""
+
+    format_name = "jsonl"
+
+    def __init__(self, path: Path | str, headers: Sequence[str]):
+        super().__init__(path, headers)
+        self._handle: IO[str] = self.path.open("w", encoding="utf-8")
+
+    def _write(self, values: Sequence[Any], bold_mask: Optional[Sequence[bool]]) -> None:
+        self._handle.write(json.dumps(dict(zip(self.headers, values)), ensure_ascii=False))
+        self._handle.write("\n")
+
+    def _close(self) -> None:
+        self._handle.close()
+
+
+class ParquetReportSink(ReportSink):
+    """Buffers rows into string columns and writes them as Parquet row groups."""
+
+    format_name = "parquet"
+
+    def __init__(self, path: Path | str, headers: Sequence[str], batch_size: int = 10000):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow).")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        super().__init__(path, headers)
+        self._pa = pa
+        self.batch_size = batch_size
+        self._schema = pa.schema([(header, pa.string()) for header in self.headers])
+        self._writer = pq.ParquetWriter(str(self.path), self._schema)
+        self._columns: Dict[str, List[Optional[str]]] = {header: [] for header in self.headers}
+        self._buffered = 0
+
+    def _write(self, values: Sequence[Any], bold_mask: Optional[Sequence[bool]]) -> None:
+        for header, value in zip(self.headers, values):
+            self._columns[header].append(None if value is None else str(value))
+        self._buffered += 1
+        if self._buffered >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffered:
+            return
+        self._writer.write_table(self._pa.table(self._columns, schema=self._schema))
+        self._columns = {header: [] for header in self.headers}
+        self._buffered = 0
+
+    def _close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+def report_suffix(report_format: str) -> str:
+    """Return the file suffix (including the dot) for a report format."""
+    return _SUFFIXES[normalize_report_format(report_format)]
+
+
+def format_for_suffix(path: Path | str) -> Optional[str]:
+    """Return the report format named by a path's suffix, or None if the suffix is not a report format."""
+    value = Path(path).suffix.lstrip(".").lower()
+    value = _ALIASES.get(value, value)
+    return value if value in REPORT_FORMATS else None
+
+
+def report_path_for_format(path: Path | str, report_format: str) -> Path:
+    """
+    Return `path`, with its suffix replaced when it names a report format other than `report_format`.
+
+    Suffixes that are not a report format (".out", ".xlsm") are kept, so only
+    e.g. CSV written into a ".xlsx" file is corrected.
+    """
+    path = Path(path)
+    suffix_format = format_for_suffix(path)
+    if suffix_format is not None and suffix_format != normalize_report_format(report_format):
+        return path.with_suffix(report_suffix(report_format))
+    return path
+
+
+def normalize_report_format(report_format: Optional[str], path: Optional[Path | str] = None) -> str:
+    """
+    Resolve a report format name.
+
+    Args:
+        report_format: Requested format (case-insensitive); None infers it from `path`
+        path: Optional output path whose suffix is used when no format is given;
+              suffixes that are not a report format (".xlsm", ".out") mean xlsx
+
+    Returns:
+        One of REPORT_FORMATS
+
+    Raises:
+        ValueError: If an explicitly requested format is not supported
+    """
+    if not report_format and path is not None:
+        return format_for_suffix(path) or "xlsx"
+    value = (report_format or "xlsx").strip().lower()
+    value = _ALIASES.get(value, value)
+    if value not in REPORT_FORMATS:
+        raise ValueError(f"Unsupported report format: {report_format} (expected one of {', '.join(REPORT_FORMATS)})")
+    return value
+
+
+def open_report_sink(
+    path: Path | str,
+    headers: Sequence[str],
+    report_format: Optional[str] = None,
+    sheet_name: str = "Results",
+    highlight_predicate: Optional[HighlightPredicate] = None,
+) -> ReportSink:
+    """
+    Open the sink for a report format.
+
+    Args:
+        path: Destination file
+        headers: Ordered column names
+        report_format: One of REPORT_FORMATS; inferred from the path suffix when None
+        sheet_name: Sheet name (Excel only)
+        highlight_predicate: Optional discrepancy highlighter (Excel only)
+
+    Returns:
+        An open ReportSink; close it (or use it as a context manager) to finish the file
+
+    Raises:
+        ValueError: If the format is not supported
+        RuntimeError: If the format needs an optional dependency that is missing
+    """
+    report_format = normalize_report_format(report_format, path)
+    if report_format == "xlsx":
+        return ExcelReportSink(path, headers, sheet_name=sheet_name, highlight_predicate=highlight_predicate)
+    if report_format == "csv":
+        return CsvReportSink(path, headers)
+    if report_format == "jsonl":
+        return JsonLinesReportSink(path, headers)
+    return ParquetReportSink(path, headers)
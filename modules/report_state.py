@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Persistent report state for incremental plugin runs.
+
+A full report run stores every parsed row in a small SQLite database inside the
+plugin directory, together with the highest scene `updated_at` seen (the
+watermark) and a fingerprint of the parser code, dictionaries and pipeline
+settings that produced the rows. Incremental runs then only fetch scenes
+updated at or after that watermark (timestamps have second granularity, and
+re-parsing a scene is idempotent), merge the re-parsed rows into the stored
+state, drop rows of scenes that no longer exist or are no longer unorganized,
+and regenerate the full workbook from the stored rows without reparsing
+unchanged scenes. When the fingerprint changes, the stored rows are stale and
+a full run is done instead.
+
+State is keyed per Stash instance so several servers (or a GraphQL and a
+direct-SQLite source) never mix rows or watermarks.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Sequence, Set
+
+
+@dataclass
+class StoredReportRow:
+    """A report row as persisted in the state database."""
+
+    scene_id: str
+    sort_key: str
+    values: List[Any]
+    bold_mask: Optional[List[bool]] = None
+
+
+class ReportStateStore:
+    """SQLite-backed store of report rows and `updated_at` watermarks."""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS report_rows (
+            instance TEXT NOT NULL,
+            scene_id TEXT NOT NULL,
+            sort_key TEXT NOT NULL,
+            row_json TEXT NOT NULL,
+            bold_json TEXT,
+            PRIMARY KEY (instance, scene_id)
+        );
+        CREATE INDEX IF NOT EXISTS report_rows_sort ON report_rows (instance, sort_key);
+        CREATE TABLE IF NOT EXISTS watermarks (
+            instance TEXT PRIMARY KEY,
+            updated_at TEXT NOT NULL,
+            refreshed_at TEXT NOT NULL,
+            fingerprint TEXT
+        );
+    """
+
+    def __init__(self, path: Path | str):
+        """
+        Open (or create) the state database.
+
+        Args:
+            path: Location of the SQLite state file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(self._SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(watermarks)")}
+        if "fingerprint" not in columns:
+            # State written before fingerprints were stored; its rows never match.
+            self._conn.execute("ALTER TABLE watermarks ADD COLUMN fingerprint TEXT")
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "ReportStateStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def get_watermark(self, instance: str) -> Optional[str]:
+        """Return the stored `updated_at` watermark for an instance, if any."""
+        row = self._conn.execute(
+            "SELECT updated_at FROM watermarks WHERE instance = ?",
+            (instance,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_fingerprint(self, instance: str) -> Optional[str]:
+        """Return the fingerprint stored with an instance's watermark, if any."""
+        row = self._conn.execute(
+            "SELECT fingerprint FROM watermarks WHERE instance = ?",
+            (instance,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, instance: str, updated_at: str, fingerprint: Optional[str] = None) -> None:
+        """Persist the `updated_at` watermark (and the fingerprint of the stored rows) for an instance."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO watermarks (instance, updated_at, refreshed_at, fingerprint) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(instance) DO UPDATE SET updated_at = excluded.updated_at, "
+                "refreshed_at = excluded.refreshed_at, fingerprint = excluded.fingerprint",
+                (instance, updated_at, datetime.now().isoformat(timespec="seconds"), fingerprint),
+            )
+
+    def replace_rows(self, instance: str, rows: Iterable[StoredReportRow]) -> None:
+        """Replace every stored row for an instance (used by full runs)."""
+        with self._conn:
+            self._conn.execute("DELETE FROM report_rows WHERE instance = ?", (instance,))
+            self._insert_rows(instance, rows)
+
+    def upsert_rows(self, instance: str, rows: Iterable[StoredReportRow]) -> None:
+        """Insert or overwrite rows for the given scenes."""
+        with self._conn:
+            self._insert_rows(instance, rows)
+
+    def delete_rows(self, instance: str, scene_ids: Sequence[str]) -> None:
+        """Drop rows for scenes that no longer belong in the report."""
+        if not scene_ids:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM report_rows WHERE instance = ? AND scene_id = ?",
+                [(instance, scene_id) for scene_id in scene_ids],
+            )
+
+    def count_rows(self, instance: str) -> int:
+        """Return the number of stored rows for an instance."""
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM report_rows WHERE instance = ?",
+            (instance,),
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def scene_ids(self, instance: str) -> Set[str]:
+        """Return the IDs of every scene with a stored row for an instance."""
+        cursor = self._conn.execute("SELECT scene_id FROM report_rows WHERE instance = ?", (instance,))
+        return {scene_id for (scene_id,) in cursor}
+
+    def iter_rows(self, instance: str) -> Iterator[StoredReportRow]:
+        """Yield stored rows for an instance in report order."""
+        cursor = self._conn.execute(
+            "SELECT scene_id, sort_key, row_json, bold_json FROM report_rows "
+            "WHERE instance = ? ORDER BY sort_key, scene_id",
+            (instance,),
+        )
+        for scene_id, sort_key, row_json, bold_json in cursor:
+            yield StoredReportRow(
+                scene_id=scene_id,
+                sort_key=sort_key,
+                values=json.loads(row_json),
+                bold_mask=json.loads(bold_json) if bold_json else None,
+            )
+
+    def _insert_rows(self, instance: str, rows: Iterable[StoredReportRow]) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO report_rows (instance, scene_id, sort_key, row_json, bold_json) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                (
+                    instance,
+                    row.scene_id,
+                    row.sort_key,
+                    json.dumps(row.values),
+                    json.dumps(row.bold_mask) if row.bold_mask is not None else None,
+                )
+                for row in rows
+            ),
+        )
+
+
+def state_fingerprint(paths: Iterable[Path], settings: Mapping[str, Any]) -> str:
+    """
+    Fingerprint the inputs that determine report rows.
+
+    Args:
+        paths: Parser source and dictionary files (missing files are skipped)
+        settings: JSON-serializable settings that change parser output
+
+    Returns:
+        Hex digest that changes whenever a file's contents or a setting changes
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+    for path in sorted(Path(path) for path in paths):
+        try:
+            data = path.read_bytes()
+        except OSError:
+            continue
+        hasher.update(f"\0{path.name}\0{len(data)}\0".encode("utf-8"))
+        hasher.update(data)
+    return hasher.hexdigest()
+
+
+def max_timestamp(current: Optional[str], candidate: Optional[str]) -> Optional[str]:
+    """
+    Return the later of two Stash timestamps.
+
+    Timestamps from one source share a format, so they are compared as parsed
+    datetimes when possible and as plain strings otherwise.
+    """
+    if not candidate:
+        return current
+    if not current:
+        return candidate
+
+    current_dt = _parse_timestamp(current)
+    candidate_dt = _parse_timestamp(candidate)
+    if current_dt is not None and candidate_dt is not None:
+        try:
+            return candidate if candidate_dt > current_dt else current
+        except TypeError:
+            # Mixed naive/aware timestamps: fall back to string ordering.
+            pass
+    return candidate if candidate > current else current
+
+
+def _parse_timestamp(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
@@ -14,11 +14,12 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
+from .similarity import normalized_similarity
 from .stash_client import Scene, SceneFile
 from .tokenizer import TokenizationResult
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedMetadata:
     """Metadata parsed from a filename."""
 
@@ -201,7 +202,9 @@ class SceneTransformer:
         if parsed_clean == original_clean:
             return {"status": "match", "parsed": parsed_value, "original": original_value, "confidence": 1.0}
 
-        similarity = self._calculate_similarity(parsed_clean, original_clean)
+        # Only the status depends on scores below 0.5, so the distance may
+        # stop early there; conflicts then report a similarity of 0.0.
+        similarity = self._calculate_similarity(parsed_clean, original_clean, score_cutoff=0.5)
         if similarity > 0.9:
             status = "minor_diff"
         elif similarity > 0.5:
@@ -225,34 +228,8 @@ class SceneTransformer:
             normalized = normalized.replace("_", " ").replace("-", " ")
         return normalized
 
-    def _calculate_similarity(self, str1: str, str2: str) -> float:
-        if str1 == str2:
-            return 1.0
-
-        len1, len2 = len(str1), len(str2)
-        if len1 == 0:
-            return 0.0 if len2 > 0 else 1.0
-        if len2 == 0:
-            return 0.0
-
-        matrix = [[0] * (len2 + 1) for _ in range(len1 + 1)]
-        for i in range(len1 + 1):
-            matrix[i][0] = i
-        for j in range(len2 + 1):
-            matrix[0][j] = j
-
-        for i in range(1, len1 + 1):
-            for j in range(1, len2 + 1):
-                cost = 0 if str1[i - 1] == str2[j - 1] else 1
-                matrix[i][j] = min(
-                    matrix[i - 1][j] + 1,
-                    matrix[i][j - 1] + 1,
-                    matrix[i - 1][j - 1] + cost,
-                )
-
-        distance = matrix[len1][len2]
-        max_len = max(len1, len2)
-        return 1.0 - (distance / max_len)
+    def _calculate_similarity(self, str1: str, str2: str, score_cutoff: Optional[float] = None) -> float:
+        return normalized_similarity(str1, str2, score_cutoff=score_cutoff)
 
     def _should_mark_organized(self, parsed: ParsedMetadata, approved_fields: List[str]) -> bool:
         has_studio = "studio" in approved_fields and parsed.studio is not None
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Shared string similarity helpers.
+
+Levenshtein distance is computed with Myers' bit-parallel algorithm (in
+Hyyrö's formulation for global edit distance). Each character of the shorter
+string is one bit of a Python int, so a whole DP column is updated with a
+handful of integer operations instead of filling an (n+1)x(m+1) matrix.
+
+`normalized_similarity` accepts a `score_cutoff`: once the remaining text can
+no longer bring the similarity up to the cutoff, the computation stops and 0.0
+is returned. That 0.0 is not the real score, so only use the cutoff where the
+result is a yes/no decision; similarities that are reported or feed a
+confidence must be computed without it.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+
+def levenshtein_distance(str1: str, str2: str, max_distance: Optional[int] = None) -> int:
+    """
+    Return the Levenshtein distance between two strings.
+
+    Args:
+        str1: First string
+        str2: Second string
+        max_distance: Optional bound; when the distance is certain to exceed it,
+                      the computation stops early and `max_distance + 1` is returned
+
+    Returns:
+        Edit distance (or `max_distance + 1` when the bound is exceeded)
+    """
+    if str1 == str2:
+        return 0
+
+    # The shorter string is the bit-vector "pattern", the longer one is scanned.
+    pattern, text = (str1, str2) if len(str1) <= len(str2) else (str2, str1)
+    m, n = len(pattern), len(text)
+
+    if max_distance is not None:
+        if max_distance < 0:
+            return 0 if m == n == 0 else max_distance + 1
+        if n - m > max_distance:
+            return max_distance + 1
+    if m == 0:
+        return n
+
+    peq: Dict[str, int] = {}
+    for i, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | (1 << i)
+
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    vp = mask
+    vn = 0
+    score = m
+
+    for j, char in enumerate(text):
+        eq = peq.get(char, 0)
+        xv = eq | vn
+        xh = (((eq & vp) + vp) ^ vp) | eq
+        hp = vn | ~(xh | vp)
+        hn = vp & xh
+
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+
+        if max_distance is not None and score - (n - j - 1) > max_distance:
+            # Each remaining column lowers the score by at most one.
+            return max_distance + 1
+
+        hp = ((hp << 1) | 1) & mask
+        hn = (hn << 1) & mask
+        vp = (hn | ~(xv | hp)) & mask
+        vn = hp & xv
+
+    return score
+
+
+def normalized_similarity(str1: str, str2: str, score_cutoff: Optional[float] = None) -> float:
+    """
+    Return `1 - distance / max(len)` for two strings.
+
+    Args:
+        str1: First string
+        str2: Second string
+        score_cutoff: Optional minimum similarity; results below it are returned as 0.0
+                      and the distance computation exits early
+
+    Returns:
+        Similarity between 0.0 and 1.0
+    """
+    if str1 == str2:
+        return 1.0
+
+    max_len = max(len(str1), len(str2))
+    if min(len(str1), len(str2)) == 0:
+        return 0.0
+
+    if score_cutoff is None:
+        return 1.0 - (levenshtein_distance(str1, str2) / max_len)
+
+    if score_cutoff > 1.0:
+        return 0.0
+
+    # Largest distance that still reaches the cutoff (epsilon guards float rounding).
+    max_distance = int((1.0 - score_cutoff) * max_len + 1e-9)
+    distance = levenshtein_distance(str1, str2, max_distance=max_distance)
+    if distance > max_distance:
+        return 0.0
+
+    similarity = 1.0 - (distance / max_len)
+    return similarity if similarity >= score_cutoff else 0.0
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Declarative registry of the FilenameParser stages that run after tokenization.
+
+Pre-tokenization and tokenization always run; every later step is a Stage
+that names the result fields it reads (`inputs`) and fills in (`outputs`).
+A StageGraph runs the registered stages in order and can be configured
+(normally from the `pipeline` section of runtime_config.json) to:
+
+- skip stages a deployment never needs (`disabled_stages`)
+- turn on optional stages that are off by default (`enabled_stages`)
+- stop early once certain fields are known (`early_exit` rules)
+- profile each stage, including an estimate of the time skipped stages saved
+
+Example `pipeline` section:
+
+    {
+        "disabled_stages": ["performers", "studios_partial_fallback"],
+        "enabled_stages": ["studios_fuzzy_fallback"],
+        "early_exit": [{"after": "studio_codes", "when": ["studio", "studio_code"]}],
+        "profile": true
+    }
+
+An empty (or missing) section runs every non-optional stage, matching
+FilenameParser's historical behavior.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .tokenizer import TokenizationResult
+
+StageFunction = Callable[[Any, TokenizationResult, "StageContext"], TokenizationResult]
+
+# Fields available once tokenization has run.
+TOKENIZE_OUTPUTS: Tuple[str, ...] = ("cleaned", "pattern", "tokens")
+
+# Fields that live on tokens (by token type) rather than as result attributes.
+_TOKEN_FIELDS = {"date", "performers", "studio_code"}
+
+
+@dataclass(frozen=True)
+class StageContext:
+    """Per-parse values stages may need besides the result itself."""
+
+    existing_studio: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One pipeline step."""
+
+    name: str
+    run: StageFunction
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    description: str = ""
+    optional: bool = False  # Off unless named in `enabled_stages`
+
+
+@dataclass(frozen=True)
+class EarlyExit:
+    """Stop the pipeline after `after` once every field in `when` has a value."""
+
+    after: str
+    when: Tuple[str, ...]
+
+    def matches(self, result: TokenizationResult) -> bool:
+        return all(result_has_field(result, name) for name in self.when)
+
+
+def result_has_field(result: TokenizationResult, name: str) -> bool:
+    """Return True when `name` has a non-empty value on the result or its tokens."""
+    value = getattr(result, name, None)
+    if isinstance(value, str):
+        value = value.strip()
+    if value:
+        return True
+    if name in _TOKEN_FIELDS:
+        return any(token.type == name and token.value.strip() for token in result.tokens or [])
+    return False
+
+
+def _dates(parser: Any, result: TokenizationResult, context: StageContext) -> TokenizationResult:
+    return parser.extract_dates(result)
+
+
+def _studios(parser: Any, result: TokenizationResult, context: StageContext) -> TokenizationResult:
+    return parser.match_studios(result)
+
+
+def _studios_dash_fallback(parser: Any, result: TokenizationResult, context: StageContext) -> TokenizationResult:
+    return parser.match_studios_dash_fallback(result)
+
+
+def _studios_word_fallback(parser: Any, result: TokenizationResult, context: StageContext) -> TokenizationResult:
+    return parser.match_studios_word_fallback(result)
+
+
+def _studios_partial_fallback(parser: Any, result: TokenizationResult, context: StageContext) -> TokenizationResult:
+    return parser.match_studios_partial_fallback(result)
+
+
+def _studios_fuzzy_fallback(parser: Any, result: TokenizationResult, context: StageContext) -> TokenizationResult:
+    return parser.match_studios_fuzzy_fallback(result)
+
+
+def _existing_studio(parser: Any, result: TokenizationResult, context: StageContext) -> TokenizationResult:
+    return parser.apply_existing_studio(result, context.existing_studio)
+
+
+def _studio_codes(parser: Any, result: TokenizationResult, context: StageContext) -> TokenizationResult:
+    return parser.find_studio_codes(result)
+
+
+def _performers(parser: Any, result: TokenizationResult, context: StageContext) -> TokenizationResult:
+    return parser.match_performers(result)
+
+
+def _final_structure(parser: Any, result: TokenizationResult, context: StageContext) -> TokenizationResult:
+    return parser.finalize_structure(result)
+
+
+def _catalog(parser: Any, result: TokenizationResult, context: StageContext) -> TokenizationResult:
+    return parser.match_catalog(result)
+
+
+# The default profile: FilenameParser's pipeline order after tokenization.
+DEFAULT_STAGES: Tuple[Stage, ...] = (
+    Stage("dates", _dates, ("tokens",), ("tokens", "date"), "Extract dates into {date} tokens"),
+    Stage("studios", _studios, ("tokens",), ("tokens", "studio"), "Match known studios"),
+    Stage(
+        "studios_dash_fallback",
+        _studios_dash_fallback,
+        ("tokens",),
+        ("tokens", "studio"),
+        "Studio matching inside dashed tokens (only when no studio yet)",
+    ),
+    Stage(
+        "studios_word_fallback",
+        _studios_word_fallback,
+        ("tokens",),
+        ("tokens", "studio"),
+        "Multi-word studio names on word boundaries inside tokens (only when no studio yet)",
+    ),
+    Stage(
+        "studios_partial_fallback",
+        _studios_partial_fallback,
+        ("tokens",),
+        ("tokens", "studio"),
+        "Substring studio matching (only when no studio yet)",
+    ),
+    Stage(
+        "studios_fuzzy_fallback",
+        _studios_fuzzy_fallback,
+        ("tokens",),
+        ("tokens", "studio"),
+        "Approximate (trigram + edit distance) studio matching (only when no studio yet)",
+        optional=True,
+    ),
+    Stage(
+        "existing_studio",
+        _existing_studio,
+        (),
+        ("studio",),
+        "Use the studio already set in Stash when none was parsed",
+    ),
+    Stage("studio_codes", _studio_codes, ("tokens",), ("tokens", "studio_code"), "Find studio codes"),
+    Stage("performers", _performers, ("tokens",), ("tokens", "performers"), "Match performer names"),
+    Stage(
+        "final_structure",
+        _final_structure,
+        ("tokens",),
+        ("tokens", "sequence", "group", "title"),
+        "Extract sequence, group and title",
+    ),
+    Stage(
+        "catalog",
+        _catalog,
+        ("studio", "title"),
+        ("title", "date", "studio_code"),
+        "Confirm and fill title, date and code from the studio's scene catalog",
+        optional=True,
+    ),
+)
+
+
+class StageProfiler:
+    """
+    Per-stage timing hook for StageGraph.
+
+    Skipped stages (disabled or cut off by an early exit) are occasionally
+    run on a throwaway copy of the result purely to time them, so the time
+    they save can be estimated even when they never run for real.
+    """
+
+    def __init__(self, sample_every: int = 25):
+        """
+        Initialize the profiler.
+
+        Args:
+            sample_every: Time every Nth skip of a stage on a copy of the result
+                          (0 disables sampling; estimates then rely on real runs)
+        """
+        self.sample_every = sample_every
+        self.runs: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+        self.skips: Dict[str, int] = {}
+        self.sample_runs: Dict[str, int] = {}
+        self.sample_seconds: Dict[str, float] = {}
+        self.parses = 0
+        # Parsers may be shared between threads; counters update under a lock.
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def record_parse(self) -> None:
+        with self._lock:
+            self.parses += 1
+
+    def record_run(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.runs[name] = self.runs.get(name, 0) + 1
+            self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def record_skip(self, name: str) -> bool:
+        """Count a skip; returns True when this skip should be timed on a copy."""
+        with self._lock:
+            count = self.skips.get(name, 0) + 1
+            self.skips[name] = count
+        return bool(self.sample_every) and (count - 1) % self.sample_every == 0
+
+    def record_sample(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.sample_runs[name] = self.sample_runs.get(name, 0) + 1
+            self.sample_seconds[name] = self.sample_seconds.get(name, 0.0) + seconds
+
+    def mean_seconds(self, name: str) -> Optional[float]:
+        """Average cost of one stage call, from real runs or, failing that, samples."""
+        if self.runs.get(name):
+            return self.seconds[name] / self.runs[name]
+        if self.sample_runs.get(name):
+            return self.sample_seconds[name] / self.sample_runs[name]
+        return None
+
+    def saved_seconds(self) -> Dict[str, Optional[float]]:
+        """Estimated seconds saved per skipped stage (None when never timed)."""
+        saved: Dict[str, Optional[float]] = {}
+        for name, count in self.skips.items():
+            mean = self.mean_seconds(name)
+            saved[name] = None if mean is None else mean * count
+        return saved
+
+    def summary(self) -> str:
+        """Multi-line per-stage report."""
+        names = list(dict.fromkeys([*self.runs, *self.skips]))
+        lines = [f"Stage profile over {self.parses} parses:"]
+        for name in names:
+            runs = self.runs.get(name, 0)
+            line = f"  {name}: {runs} runs, {self.seconds.get(name, 0.0):.3f}s"
+            skips = self.skips.get(name, 0)
+            if skips:
+                saved = self.saved_seconds()[name]
+                estimate = "not timed" if saved is None else f"~{saved:.3f}s saved"
+                line += f"; {skips} skipped ({estimate})"
+            lines.append(line)
+        total = sum(value for value in self.saved_seconds().values() if value is not None)
+        lines.append(f"  estimated time saved by skipped stages: {total:.3f}s")
+        return "\n".join(lines)
+
+
+class StageGraph:
+    """Ordered, configurable set of stages run by FilenameParser."""
+
+    def __init__(
+        self,
+        stages: Sequence[Stage] = DEFAULT_STAGES,
+        disabled: Iterable[str] = (),
+        early_exits: Iterable[EarlyExit] = (),
+        profiler: Optional[StageProfiler] = None,
+        enabled: Iterable[str] = (),
+    ):
+        """
+        Build and validate a stage graph.
+
+        Args:
+            stages: Stages in execution order
+            disabled: Names of stages to skip
+            early_exits: Rules that end the pipeline after a stage
+            profiler: Optional timing hook
+            enabled: Names of optional stages to run
+
+        Raises:
+            ValueError: On unknown stage or field names, or when an enabled
+                        stage reads a field no earlier enabled stage produces
+        """
+        self.stages: Tuple[Stage, ...] = tuple(stages)
+        self.disabled = frozenset(disabled)
+        self.enabled = frozenset(enabled)
+        # Optional stages nobody enabled are left out entirely (not profiled as skips).
+        self.inactive = frozenset(
+            stage.name for stage in self.stages if stage.optional and stage.name not in self.enabled
+        )
+        self.profiler = profiler
+        self._exits: Dict[str, List[EarlyExit]] = {}
+        for rule in early_exits:
+            self._exits.setdefault(rule.after, []).append(rule)
+        self._validate()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]], stages: Sequence[Stage] = DEFAULT_STAGES) -> "StageGraph":
+        """
+        Build a graph from a runtime_config `pipeline` section.
+
+        Args:
+            config: Mapping with optional `disabled_stages`, `enabled_stages`,
+                    `early_exit`, `profile` and `profile_sample_every` keys
+            stages: Stage registry to configure
+
+        Returns:
+            Configured StageGraph
+
+        Raises:
+            ValueError: If the configuration is malformed or inconsistent
+        """
+        config = config or {}
+        rules: List[EarlyExit] = []
+        for entry in config.get("early_exit") or []:
+            if not isinstance(entry, dict) or not entry.get("after") or not entry.get("when"):
+                raise ValueError(f"Invalid early_exit rule (need 'after' and 'when'): {entry!r}")
+            when = entry["when"]
+            rules.append(EarlyExit(after=str(entry["after"]), when=(when,) if isinstance(when, str) else tuple(when)))
+
+        profiler = None
+        if config.get("profile"):
+            profiler = StageProfiler(sample_every=int(config.get("profile_sample_every", 25)))
+
+        return cls(
+            stages=stages,
+            disabled=config.get("disabled_stages") or (),
+            early_exits=rules,
+            profiler=profiler,
+            enabled=config.get("enabled_stages") or (),
+        )
+
+    @property
+    def stage_names(self) -> List[str]:
+        return [stage.name for stage in self.stages]
+
+    @property
+    def enabled_stages(self) -> List[Stage]:
+        return [stage for stage in self.stages if stage.name not in self.disabled | self.inactive]
+
+    def run(self, parser: Any, result: TokenizationResult, context: Optional[StageContext] = None) -> TokenizationResult:
+        """
+        Run the enabled stages over a tokenized result.
+
+        Args:
+            parser: Object providing the stage methods (a FilenameParser)
+            result: Tokenization result to refine
+            context: Per-parse context (existing studio)
+
+        Returns:
+            The final TokenizationResult
+        """
+        context = context or StageContext()
+        profiler = self.profiler
+        if profiler is None:
+            for stage in self.stages:
+                if stage.name in self.disabled or stage.name in self.inactive:
+                    continue
+                result = stage.run(parser, result, context)
+                if self._should_exit(stage.name, result):
+                    break
+            return result
+
+        profiler.record_parse()
+        stopped = False
+        for stage in self.stages:
+            if stage.name in self.inactive:
+                continue
+            if stopped or stage.name in self.disabled:
+                if profiler.record_skip(stage.name):
+                    sample = copy.deepcopy(result)
+                    started = time.perf_counter()
+                    stage.run(parser, sample, context)
+                    profiler.record_sample(stage.name, time.perf_counter() - started)
+                continue
+            started = time.perf_counter()
+            result = stage.run(parser, result, context)
+            profiler.record_run(stage.name, time.perf_counter() - started)
+            stopped = self._should_exit(stage.name, result)
+        return result
+
+    def _should_exit(self, stage_name: str, result: TokenizationResult) -> bool:
+        rules = self._exits.get(stage_name)
+        return bool(rules) and any(rule.matches(result) for rule in rules)
+
+    def _validate(self) -> None:
+        names = self.stage_names
+        known = set(names)
+        if len(known) != len(names):
+            raise ValueError("Duplicate stage names in pipeline")
+
+        unknown = sorted((self.disabled | self.enabled) - known)
+        if unknown:
+            raise ValueError(f"Unknown pipeline stage(s): {', '.join(unknown)} (expected one of {', '.join(names)})")
+
+        all_fields = set(TOKENIZE_OUTPUTS)
+        for stage in self.stages:
+            all_fields.update(stage.outputs)
+
+        off = self.disabled | self.inactive
+        available = set(TOKENIZE_OUTPUTS)
+        produced_by: Dict[str, set] = {}
+        for stage in self.stages:
+            if stage.name not in off:
+                missing = sorted(set(stage.inputs) - available)
+                if missing:
+                    raise ValueError(
+                        f"Stage '{stage.name}' needs {', '.join(missing)}, which no earlier enabled stage produces"
+                    )
+                available.update(stage.outputs)
+            produced_by[stage.name] = set(available)
+
+        for after, rules in self._exits.items():
+            if after not in known:
+                raise ValueError(f"early_exit refers to unknown stage '{after}'")
+            if after in off:
+                raise ValueError(f"early_exit refers to disabled stage '{after}'")
+            for rule in rules:
+                unknown_fields = sorted(set(rule.when) - all_fields)
+                if unknown_fields:
+                    raise ValueError(f"early_exit uses unknown field(s): {', '.join(unknown_fields)}")
+                unavailable = sorted(set(rule.when) - produced_by[after])
+                if unavailable:
+                    raise ValueError(
+                        f"early_exit after '{after}' checks {', '.join(unavailable)}, "
+                        "which no enabled stage up to that point produces"
+                    )
@@ -8,18 +8,42 @@ with specialized methods for:
 - fetching scenes by id
 - resolving studios by name
 - applying scene updates (single and bulk)
+
+The scene/studio dataclasses are used by code that never talks to Stash
+(SQLite reader, report state, transformers), so `stashapi` (and the
+`requests` stack behind it) is imported when the first StashClient is
+created rather than at module import.
 """
 
 from __future__ import annotations
 
+import json
 import time
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
 
-from stashapi.stashapp import StashInterface
+if TYPE_CHECKING:
+    from stashapi.stashapp import StashInterface
 
 
-@dataclass
+def __getattr__(name: str) -> Any:
+    # PEP 562: resolve `modules.stash_client.StashInterface` on first access.
+    if name == "StashInterface":
+        return _load_stash_interface()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _load_stash_interface() -> Any:
+    """Import StashInterface and publish it as a module global."""
+    global StashInterface
+    from stashapi.stashapp import StashInterface as interface
+
+    StashInterface = interface
+    return interface
+
+
+@dataclass(slots=True)
 class SceneFile:
     """Represents a file associated with a scene."""
 
@@ -29,16 +53,17 @@ class SceneFile:
     parent_folder_path: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SceneStudio:
     """Represents a studio associated with a scene."""
 
     id: str
     name: str
     aliases: List[str] = field(default_factory=list)
+    updated_at: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ScenePerformer:
     """Represents a performer associated with a scene."""
 
@@ -46,7 +71,7 @@ class ScenePerformer:
     name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Scene:
     """Represents a scene from Stash."""
 
@@ -59,6 +84,141 @@ class Scene:
     performers: List[ScenePerformer] = field(default_factory=list)
     tags: List[Dict[str, Any]] = field(default_factory=list)
     organized: bool = False
+    updated_at: Optional[str] = None
+
+
+# Scene selection sets ("projection profiles") keyed by name.
+#
+# - full: everything the plugin and batch tooling may read
+# - report: only the fields `StashYansaPlugin._build_report_row` reads; the parent
+#   folder is derived from the file path instead of joining parent_folder
+# - update: only what parsing plus `SceneTransformer.metadata_to_update` needs;
+#   it lacks `updated_at` and performers, so it cannot back a report
+SCENE_PROJECTIONS: Dict[str, str] = {
+    "full": """
+        id
+        title
+        date
+        code
+        organized
+        updated_at
+        studio {
+            id
+            name
+        }
+        files {
+            id
+            path
+            basename
+            parent_folder { path }
+        }
+        performers {
+            id
+            name
+        }
+    """,
+    "report": """
+        id
+        title
+        date
+        code
+        organized
+        updated_at
+        studio {
+            id
+            name
+        }
+        files {
+            id
+            path
+            basename
+        }
+        performers {
+            id
+            name
+        }
+    """,
+    "update": """
+        id
+        title
+        date
+        code
+        organized
+        studio { id }
+        files {
+            id
+            path
+            basename
+        }
+    """,
+}
+
+
+# Profiles with every field report rows and the incremental watermark read.
+REPORT_PROJECTIONS: Tuple[str, ...] = ("full", "report")
+
+
+@dataclass
+class FetchTelemetry:
+    """
+    Payload size and timing for one paginated scene fetch.
+
+    Payload bytes are measured as the JSON size of the scene dicts returned per
+    page. When a non-full projection is active and `measure_projection_savings`
+    is enabled on the client, one page is also sampled with the full projection
+    so savings per page can be reported.
+    """
+
+    profile: str
+    per_page: int = 100
+    pages: int = 0
+    scenes: int = 0
+    payload_bytes: int = 0
+    seconds: float = 0.0
+    baseline_scenes: int = 0
+    baseline_bytes: int = 0
+    baseline_seconds: float = 0.0
+
+    def record_page(self, scene_count: int, payload_bytes: int, seconds: float) -> None:
+        self.pages += 1
+        self.scenes += scene_count
+        self.payload_bytes += payload_bytes
+        self.seconds += seconds
+
+    def record_baseline(self, scene_count: int, payload_bytes: int, seconds: float) -> None:
+        self.baseline_scenes += scene_count
+        self.baseline_bytes += payload_bytes
+        self.baseline_seconds += seconds
+
+    @property
+    def bytes_saved_per_page(self) -> Optional[float]:
+        """Estimated payload bytes saved per page versus the full projection."""
+        if not self.scenes or not self.baseline_scenes:
+            return None
+        per_scene = self.payload_bytes / self.scenes
+        baseline_per_scene = self.baseline_bytes / self.baseline_scenes
+        return (baseline_per_scene - per_scene) * self.per_page
+
+    @property
+    def seconds_saved_per_page(self) -> Optional[float]:
+        """Estimated fetch seconds saved per page versus the full projection."""
+        if not self.scenes or not self.baseline_scenes:
+            return None
+        per_scene = self.seconds / self.scenes
+        baseline_per_scene = self.baseline_seconds / self.baseline_scenes
+        return (baseline_per_scene - per_scene) * self.per_page
+
+    def summary(self) -> str:
+        """One-line human-readable summary for plugin logs."""
+        text = (
+            f"projection={self.profile} pages={self.pages} scenes={self.scenes} "
+            f"payload={self.payload_bytes} bytes in {self.seconds:.2f}s"
+        )
+        saved_bytes = self.bytes_saved_per_page
+        saved_seconds = self.seconds_saved_per_page
+        if saved_bytes is not None and saved_seconds is not None:
+            text += f" (saved ~{saved_bytes:.0f} bytes, ~{saved_seconds * 1000:.0f} ms per page vs full)"
+        return text
 
 
 class StashClient:
@@ -95,7 +255,8 @@ class StashClient:
         }
 
         # Initialize StashInterface. StashAPI auto-generates fragments via schema introspection.
-        self.stash = StashInterface(conn)
+        interface = globals().get("StashInterface") or _load_stash_interface()
+        self.stash = interface(conn)
 
         # Legacy properties for backwards compatibility
         self.url = f"{scheme}://{hostname}:{port}/graphql"
@@ -104,33 +265,40 @@ class StashClient:
         self.timeout = 30
 
         # Selection sets used to override the default "...Scene"/"...Studio" fragment in StashAPI.
-        self.scene_fragment = """
-            id
-            title
-            date
-            code
-            organized
-            studio {
-                id
-                name
-            }
-            files {
-                id
-                path
-                basename
-                parent_folder { path }
-            }
-            performers {
-                id
-                name
-            }
-        """
+        self.scene_projection = "full"
+        self.scene_fragment = SCENE_PROJECTIONS["full"]
+        # Keep only the first (primary) file of each scene after parsing.
+        self.primary_file_only = False
+        # Sample one page with the full projection to report savings of a lighter one.
+        # Off by default: it costs one extra full-size request per fetch.
+        self.measure_projection_savings = False
+        self.last_fetch_telemetry: Optional[FetchTelemetry] = None
         self.studio_fragment = """
             id
             name
             aliases
+            updated_at
         """
 
+    def set_scene_projection(self, profile: str, primary_file_only: bool = False) -> None:
+        """
+        Select which scene fields are requested from Stash.
+
+        Args:
+            profile: Name of a profile in SCENE_PROJECTIONS ("full", "report", "update")
+            primary_file_only: Keep only the first (primary) file per scene. Stash's
+                               `files` field cannot be limited server-side, so this
+                               trims the parsed Scene objects instead.
+
+        Raises:
+            ValueError: If the profile is unknown
+        """
+        if profile not in SCENE_PROJECTIONS:
+            raise ValueError(f"Unknown scene projection: {profile}")
+        self.scene_projection = profile
+        self.scene_fragment = SCENE_PROJECTIONS[profile]
+        self.primary_file_only = primary_file_only
+
     def call_graphql(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Call GraphQL API directly (for custom queries not covered by StashInterface).
@@ -152,6 +320,7 @@ class StashClient:
         page: int = 1,
         per_page: int = 50,
         studio_ids: Optional[List[str]] = None,
+        fragment: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Find scenes marked as unorganized.
@@ -160,6 +329,7 @@ class StashClient:
             page: Page number (1-indexed)
             per_page: Items per page
             studio_ids: Optional list of studio IDs to filter by
+            fragment: Optional selection set overriding the active projection
 
         Returns:
             Dict with 'findScenes' key containing scenes and count
@@ -181,7 +351,7 @@ class StashClient:
         count, scenes = self.stash.find_scenes(
             f=scene_filter,
             filter=filter_dict,
-            fragment=self.scene_fragment,
+            fragment=fragment or self.scene_fragment,
             get_count=True,
         )
         return {"findScenes": {"count": count, "scenes": scenes}}
@@ -205,6 +375,7 @@ class StashClient:
         all_scenes: List[Scene] = []
         page = 1
         per_page = 100
+        telemetry = self._start_fetch_telemetry(per_page)
 
         while True:
             if limit is not None and limit > 0 and len(all_scenes) >= limit:
@@ -214,7 +385,15 @@ class StashClient:
             if limit is not None and limit > 0:
                 per_page_effective = min(per_page, limit - len(all_scenes))
 
-            result = self.find_unorganized_scenes(page=page, per_page=per_page_effective, studio_ids=studio_ids)
+            def fetch_page(fragment: Optional[str] = None) -> Dict[str, Any]:
+                return self.find_unorganized_scenes(
+                    page=page,
+                    per_page=per_page_effective,
+                    studio_ids=studio_ids,
+                    fragment=fragment,
+                )
+
+            result = self._fetch_measured_page(fetch_page, telemetry, sample_baseline=page == 1)
             scenes_data = result.get("findScenes", {}) or {}
             scenes = scenes_data.get("scenes", []) or []
             if not scenes:
@@ -240,6 +419,102 @@ class StashClient:
 
         return all_scenes
 
+    def find_scenes_updated_since(
+        self,
+        since: str,
+        page: int = 1,
+        per_page: int = 100,
+        fragment: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Find scenes (organized or not) updated at or after a timestamp.
+
+        Stash timestamps have second granularity and the filter only offers a
+        strict GREATER_THAN, so the query starts one second earlier: a scene
+        updated later in the watermark's second is re-read instead of missed.
+
+        Args:
+            since: Timestamp string accepted by Stash's TimestampCriterionInput
+            page: Page number (1-indexed)
+            per_page: Items per page
+            fragment: Optional selection set overriding the active projection
+
+        Returns:
+            Dict with 'findScenes' key containing scenes and count
+        """
+        scene_filter = {"updated_at": {"value": _second_before(since), "modifier": "GREATER_THAN"}}
+        filter_dict = {"page": page, "per_page": per_page, "sort": "updated_at", "direction": "ASC"}
+
+        count, scenes = self.stash.find_scenes(
+            f=scene_filter,
+            filter=filter_dict,
+            fragment=fragment or self.scene_fragment,
+            get_count=True,
+        )
+        return {"findScenes": {"count": count, "scenes": scenes}}
+
+    def get_all_scenes_updated_since(
+        self,
+        since: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> List[Scene]:
+        """
+        Get every scene updated at or after `since`, including organized scenes.
+
+        Organized scenes are returned too so incremental callers can drop them
+        from previously stored state.
+
+        Args:
+            since: Timestamp string (typically a stored `updated_at` watermark)
+            progress_callback: Optional callback(current, total) for progress updates
+
+        Returns:
+            List of Scene objects
+        """
+        all_scenes: List[Scene] = []
+        page = 1
+        per_page = 100
+        telemetry = self._start_fetch_telemetry(per_page)
+
+        while True:
+            def fetch_page(fragment: Optional[str] = None) -> Dict[str, Any]:
+                return self.find_scenes_updated_since(since, page=page, per_page=per_page, fragment=fragment)
+
+            result = self._fetch_measured_page(fetch_page, telemetry, sample_baseline=page == 1)
+            scenes_data = result.get("findScenes", {}) or {}
+            scenes = scenes_data.get("scenes", []) or []
+            if not scenes:
+                break
+
+            for scene_data in scenes:
+                all_scenes.append(self._parse_scene_data(scene_data))
+
+            total = int(scenes_data.get("count") or 0)
+            if progress_callback:
+                progress_callback(len(all_scenes), total)
+
+            if total and len(all_scenes) >= total:
+                break
+
+            page += 1
+
+        return all_scenes
+
+    def get_unorganized_scene_ids(self) -> Set[str]:
+        """
+        Get the IDs of every unorganized scene in one ids-only request.
+
+        Returns:
+            Set of scene IDs
+        """
+        _, scenes = self.stash.find_scenes(
+            f={"organized": False},
+            filter={"page": 1, "per_page": -1},
+            fragment="id",
+            get_count=True,
+        )
+        return {str(scene["id"]) for scene in scenes or []}
+
     def get_scene_by_id(self, scene_id: str) -> Optional[Scene]:
         """
         Fetch a single scene by ID.
@@ -312,12 +587,7 @@ class StashClient:
         if not studios:
             return None
 
-        studio_data = studios[0]
-        return SceneStudio(
-            id=str(studio_data["id"]),
-            name=studio_data["name"],
-            aliases=studio_data.get("aliases") or [],
-        )
+        return self._parse_studio_data(studios[0])
 
     def get_all_studios(self, progress_callback: Optional[Callable[[int, int], None]] = None) -> List[SceneStudio]:
         """
@@ -344,13 +614,7 @@ class StashClient:
                 break
 
             for studio_data in studios:
-                all_studios.append(
-                    SceneStudio(
-                        id=str(studio_data["id"]),
-                        name=studio_data["name"],
-                        aliases=studio_data.get("aliases") or [],
-                    )
-                )
+                all_studios.append(self._parse_studio_data(studio_data))
 
             if progress_callback:
                 progress_callback(len(all_studios), int(total or 0))
@@ -363,6 +627,68 @@ class StashClient:
 
         return all_studios
 
+    def get_studio_snapshot_key(self) -> Tuple[int, Optional[str]]:
+        """
+        Return a cheap fingerprint of the studio table.
+
+        Returns:
+            Tuple of (studio count, most recent studio `updated_at`)
+        """
+        total, studios = self.stash.find_studios(
+            filter={"page": 1, "per_page": 1, "sort": "updated_at", "direction": "DESC"},
+            fragment="id updated_at",
+            get_count=True,
+        )
+        latest = studios[0].get("updated_at") if studios else None
+        return int(total or 0), latest
+
+    def get_studios_updated_since(
+        self,
+        since: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> List[SceneStudio]:
+        """
+        Fetch only studios created or changed at or after a timestamp.
+
+        Like `find_scenes_updated_since`, the query starts one second before
+        `since`: studios changed later in the watermark's second come back
+        again rather than being missed, and merging them twice is harmless.
+
+        Args:
+            since: Timestamp string (typically a cached `updated_at` watermark)
+            progress_callback: Optional callback(current, total) for progress updates
+
+        Returns:
+            List of SceneStudio objects with id, name, aliases, and updated_at
+        """
+        changed: List[SceneStudio] = []
+        page = 1
+        per_page = 100
+        studio_filter = {"updated_at": {"value": _second_before(since), "modifier": "GREATER_THAN"}}
+
+        while True:
+            total, studios = self.stash.find_studios(
+                f=studio_filter,
+                filter={"page": page, "per_page": per_page},
+                fragment=self.studio_fragment,
+                get_count=True,
+            )
+            if not studios:
+                break
+
+            for studio_data in studios:
+                changed.append(self._parse_studio_data(studio_data))
+
+            total_int = int(total or 0)
+            if progress_callback:
+                progress_callback(len(changed), total_int)
+            if total_int and len(changed) >= total_int:
+                break
+
+            page += 1
+
+        return changed
+
     def update_scene_metadata(
         self,
         scene_id: str,
@@ -436,6 +762,47 @@ class StashClient:
 
         return all_results
 
+    def _start_fetch_telemetry(self, per_page: int) -> FetchTelemetry:
+        telemetry = FetchTelemetry(profile=self.scene_projection, per_page=per_page)
+        self.last_fetch_telemetry = telemetry
+        return telemetry
+
+    def _fetch_measured_page(
+        self,
+        fetch_page: Callable[..., Dict[str, Any]],
+        telemetry: FetchTelemetry,
+        sample_baseline: bool = False,
+    ) -> Dict[str, Any]:
+        """Fetch one page, recording payload size/time (and a full-projection baseline sample)."""
+        started = time.perf_counter()
+        result = fetch_page()
+        elapsed = time.perf_counter() - started
+
+        scenes = (result.get("findScenes", {}) or {}).get("scenes", []) or []
+        telemetry.record_page(len(scenes), self._payload_size(scenes), elapsed)
+
+        if sample_baseline and scenes and self.measure_projection_savings and self.scene_projection != "full":
+            started = time.perf_counter()
+            baseline = fetch_page(SCENE_PROJECTIONS["full"])
+            elapsed = time.perf_counter() - started
+            baseline_scenes = (baseline.get("findScenes", {}) or {}).get("scenes", []) or []
+            telemetry.record_baseline(len(baseline_scenes), self._payload_size(baseline_scenes), elapsed)
+
+        return result
+
+    @staticmethod
+    def _payload_size(scenes: List[Dict[str, Any]]) -> int:
+        return len(json.dumps(scenes, separators=(",", ":"), default=str).encode("utf-8"))
+
+    def _parse_studio_data(self, studio_data: Dict[str, Any]) -> SceneStudio:
+        """Parse studio data from a GraphQL response into a SceneStudio object."""
+        return SceneStudio(
+            id=str(studio_data["id"]),
+            name=studio_data["name"],
+            aliases=studio_data.get("aliases") or [],
+            updated_at=studio_data.get("updated_at"),
+        )
+
     def _parse_scene_data(self, scene_data: Dict[str, Any]) -> Scene:
         """
         Parse scene data from GraphQL response into Scene object.
@@ -451,7 +818,7 @@ class StashClient:
         if studio_data:
             studio = SceneStudio(
                 id=str(studio_data["id"]),
-                name=studio_data["name"],
+                name=studio_data.get("name") or "",
                 aliases=studio_data.get("aliases") or [],
             )
 
@@ -460,13 +827,16 @@ class StashClient:
             parent_folder = file_data.get("parent_folder") or {}
             files.append(
                 SceneFile(
-                    id=str(file_data["id"]),
+                    id=str(file_data.get("id") or ""),
                     path=file_data.get("path") or "",
                     basename=file_data.get("basename") or "",
                     parent_folder_path=parent_folder.get("path"),
                 )
             )
 
+        if self.primary_file_only:
+            files = files[:1]
+
         performers: List[ScenePerformer] = []
         for performer_data in scene_data.get("performers") or []:
             performers.append(
@@ -486,4 +856,18 @@ class StashClient:
             performers=performers,
             tags=scene_data.get("tags") or [],
             organized=bool(scene_data.get("organized") or False),
+            updated_at=scene_data.get("updated_at"),
         )
+
+
+def _second_before(timestamp: str) -> str:
+    """Return `timestamp` one second earlier in the same format (unchanged if it cannot be parsed)."""
+    text = timestamp.strip()
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return timestamp
+    earlier = (parsed - timedelta(seconds=1)).isoformat(sep="T" if "T" in text else " ")
+    if text.endswith("Z"):
+        earlier = earlier.replace("+00:00", "Z")
+    return earlier
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Read-only direct SQLite access to a Stash database.
+
+Report mode only needs a handful of scene columns (id, title, date, code,
+studio, performers, file basename/folder). Serializing the full GraphQL
+`scene_fragment` for very large libraries is slow, so this module offers an
+optional fast path that reads the Stash database file directly and yields the
+same `Scene` dataclasses as `StashClient`.
+
+Safety:
+- The database is opened with `mode=ro` via a SQLite URI, and `query_only` is
+  enabled, so nothing is ever written.
+- WAL-mode databases are supported: the read-only connection reads committed
+  pages from the `-wal` file while Stash keeps running.
+
+The GraphQL client remains the default and fallback backend.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Set, Tuple
+
+from .report_state import max_timestamp
+from .stash_client import Scene, ScenePerformer, SceneFile, SceneStudio
+
+
+class StashDatabaseError(RuntimeError):
+    """Raised when the Stash database cannot be opened or queried."""
+
+
+class StashSQLiteReader:
+    """
+    Stream scenes straight out of a Stash SQLite database.
+
+    All scene data is read through a single joined cursor ordered by scene, so
+    rows are grouped into `Scene` objects on the fly without loading the whole
+    result set into memory.
+    """
+
+    # One row per (scene, file, performer) combination. Files are ordered with
+    # the primary file first to mirror the GraphQL `files` ordering.
+    _SCENES_QUERY = """
+        SELECT
+            s.id,
+            s.title,
+            s.date,
+            s.code,
+            s.organized,
+            s.updated_at,
+            st.id,
+            st.name,
+            f.id,
+            f.basename,
+            fo.path,
+            p.id,
+            p.name,
+            f.updated_at
+        FROM scenes AS s
+        LEFT JOIN studios AS st ON st.id = s.studio_id
+        LEFT JOIN scenes_files AS sf ON sf.scene_id = s.id
+        LEFT JOIN files AS f ON f.id = sf.file_id
+        LEFT JOIN folders AS fo ON fo.id = f.parent_folder_id
+        LEFT JOIN performers_scenes AS ps ON ps.scene_id = s.id
+        LEFT JOIN performers AS p ON p.id = ps.performer_id
+        {where}
+        ORDER BY COALESCE(s.title, '') COLLATE NOCASE, s.id, sf."primary" DESC, f.id, p.id
+    """
+
+    _COUNT_QUERY = "SELECT COUNT(*) FROM scenes AS s {where}"
+
+    # Report rows come from the file name, so a renamed or moved file counts
+    # as an update even when `scenes.updated_at` did not change.
+    _UPDATED_SINCE_FILTER = """
+        WHERE s.updated_at >= ? OR s.id IN (
+            SELECT sf_u.scene_id FROM scenes_files AS sf_u
+            JOIN files AS f_u ON f_u.id = sf_u.file_id
+            WHERE f_u.updated_at >= ?
+        )
+    """
+
+    def __init__(self, database_path: Path | str, timeout: float = 30.0):
+        """
+        Initialize the reader.
+
+        Args:
+            database_path: Path to the Stash SQLite database (e.g. stash-go.sqlite)
+            timeout: Seconds to wait on a locked database before giving up
+        """
+        self.database_path = Path(database_path)
+        self.timeout = timeout
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        Open a read-only connection to the database.
+
+        Returns:
+            sqlite3.Connection in read-only, query-only mode
+
+        Raises:
+            StashDatabaseError: If the file is missing or cannot be opened
+        """
+        if not self.database_path.is_file():
+            raise StashDatabaseError(f"Stash database not found: {self.database_path}")
+
+        uri = f"{self.database_path.resolve().as_uri()}?mode=ro"
+        try:
+            conn = sqlite3.connect(uri, uri=True, timeout=self.timeout)
+            conn.execute("PRAGMA query_only = ON")
+        except sqlite3.Error as exc:
+            raise StashDatabaseError(f"Failed to open Stash database {self.database_path}: {exc}") from exc
+        return conn
+
+    def validate_schema(self) -> None:
+        """
+        Check that the database has the tables and columns this reader needs.
+
+        Prepares the scene query without fetching rows, so an incompatible or
+        unreadable database fails before any scenes are streamed.
+
+        Raises:
+            StashDatabaseError: If the database cannot be opened or queried
+        """
+        where, params = self._unorganized_filter()
+        conn = self.connect()
+        try:
+            conn.execute(self._SCENES_QUERY.format(where=where) + " LIMIT 0", params).fetchall()
+        except sqlite3.Error as exc:
+            raise StashDatabaseError(f"Unsupported Stash database schema: {exc}") from exc
+        finally:
+            conn.close()
+
+    def count_unorganized_scenes(self) -> int:
+        """Return the number of unorganized scenes in the database."""
+        where, params = self._unorganized_filter()
+        conn = self.connect()
+        try:
+            row = conn.execute(self._COUNT_QUERY.format(where=where), params).fetchone()
+        except sqlite3.Error as exc:
+            raise StashDatabaseError(f"Failed to count scenes: {exc}") from exc
+        finally:
+            conn.close()
+        return int(row[0] or 0) if row else 0
+
+    def iter_unorganized_scenes(
+        self,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Scene]:
+        """
+        Stream unorganized scenes from the database.
+
+        Args:
+            progress_callback: Optional callback(current, total) for progress updates
+            limit: Optional maximum number of scenes to yield
+
+        Yields:
+            Scene objects, primary file first
+        """
+        where, params = self._unorganized_filter()
+        yield from self._iter_scenes(where, params, progress_callback=progress_callback, limit=limit)
+
+    def get_unorganized_scene_ids(self) -> Set[str]:
+        """Return the IDs of every unorganized scene (no joins, for reconciling stored state)."""
+        where, params = self._unorganized_filter()
+        conn = self.connect()
+        try:
+            rows = conn.execute(f"SELECT s.id FROM scenes AS s {where}", params).fetchall()
+        except sqlite3.Error as exc:
+            raise StashDatabaseError(f"Failed to list scene IDs: {exc}") from exc
+        finally:
+            conn.close()
+        return {str(row[0]) for row in rows}
+
+    def get_all_unorganized_scenes(
+        self,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Scene]:
+        """List-returning counterpart of `StashClient.get_all_unorganized_scenes`."""
+        return list(self.iter_unorganized_scenes(progress_callback=progress_callback, limit=limit))
+
+    def iter_scenes_updated_since(
+        self,
+        since: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> Iterator[Scene]:
+        """
+        Stream every scene (organized or not) updated at or after `since`.
+
+        A scene counts as updated when its row or one of its files changed.
+        The comparison is inclusive because timestamps have second
+        granularity: a scene updated later in the watermark's second must
+        not be missed, and re-reading the scenes of that second is harmless.
+
+        Args:
+            since: Watermark previously read from `Scene.updated_at`
+            progress_callback: Optional callback(current, total) for progress updates
+
+        Yields:
+            Scene objects, primary file first
+        """
+        yield from self._iter_scenes(self._UPDATED_SINCE_FILTER, (since, since), progress_callback=progress_callback)
+
+    def _unorganized_filter(self) -> Tuple[str, Tuple[Any, ...]]:
+        return "WHERE s.organized = 0", ()
+
+    def _iter_scenes(
+        self,
+        where: str,
+        params: Tuple[Any, ...],
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Scene]:
+        if limit is not None and limit <= 0:
+            limit = None
+
+        conn = self.connect()
+        try:
+            total = 0
+            if progress_callback:
+                count_row = conn.execute(self._COUNT_QUERY.format(where=where), params).fetchone()
+                total = int(count_row[0] or 0) if count_row else 0
+                if limit is not None:
+                    total = min(total, limit)
+
+            try:
+                cursor = conn.execute(self._SCENES_QUERY.format(where=where), params)
+            except sqlite3.Error as exc:
+                raise StashDatabaseError(f"Failed to query scenes: {exc}") from exc
+
+            yielded = 0
+            current: Optional[Scene] = None
+            seen_files: set[str] = set()
+            seen_performers: set[str] = set()
+
+            for row in cursor:
+                scene_id = str(row[0])
+                if current is None or current.id != scene_id:
+                    if current is not None:
+                        yield current
+                        yielded += 1
+                        if progress_callback:
+                            progress_callback(yielded, total)
+                        if limit is not None and yielded >= limit:
+                            return
+                    current = self._scene_from_row(row)
+                    seen_files = set()
+                    seen_performers = set()
+
+                file_id = row[8]
+                if file_id is not None and str(file_id) not in seen_files:
+                    seen_files.add(str(file_id))
+                    current.files.append(self._file_from_row(row))
+                    if row[13] is not None:
+                        current.updated_at = max_timestamp(current.updated_at, str(row[13]))
+
+                performer_id = row[11]
+                if performer_id is not None and str(performer_id) not in seen_performers:
+                    seen_performers.add(str(performer_id))
+                    current.performers.append(ScenePerformer(id=str(performer_id), name=row[12] or ""))
+
+            if current is not None:
+                yield current
+                yielded += 1
+                if progress_callback:
+                    progress_callback(yielded, total)
+        except sqlite3.Error as exc:
+            # Locks, I/O errors or corruption can surface mid-stream, after scenes were yielded.
+            raise StashDatabaseError(f"Failed to read scenes: {exc}") from exc
+        finally:
+            conn.close()
+
+    def _scene_from_row(self, row: Tuple[Any, ...]) -> Scene:
+        studio = None
+        if row[6] is not None:
+            studio = SceneStudio(id=str(row[6]), name=row[7] or "")
+
+        return Scene(
+            id=str(row[0]),
+            title=row[1],
+            date=row[2],
+            code=row[3],
+            studio=studio,
+            files=[],
+            performers=[],
+            tags=[],
+            organized=bool(row[4]),
+            updated_at=str(row[5]) if row[5] is not None else None,
+        )
+
+    def _file_from_row(self, row: Tuple[Any, ...]) -> SceneFile:
+        basename = row[9] or ""
+        folder = row[10]
+        if folder:
+            separator = "\\" if "\\" in folder and "/" not in folder else "/"
+            path = f"{folder.rstrip(separator)}{separator}{basename}"
+        else:
+            path = basename
+
+        return SceneFile(
+            id=str(row[8]),
+            path=path,
+            basename=basename,
+            parent_folder_path=folder,
+        )
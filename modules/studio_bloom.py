@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Bloom filter prefilter for studio candidate checks.
+
+The dash and partial studio fallbacks probe many candidate strings that are
+almost never studio keys. A Bloom filter answers "definitely not a studio"
+from a few bits in a small bytearray, so most candidates are rejected without
+touching the studio dict (or the shared FlatStudioIndex, whose lookups decode
+strings from a buffer). Members always test positive; non-members test
+positive with a small, configurable probability, so every hit is still
+confirmed against the real index.
+
+Bit positions come from two CRC-32s (of the UTF-8 bytes and of the reversed
+bytes) combined by double hashing, not from Python's per-process randomized
+`hash()`, so a filter built once can be persisted with the studio index and
+reused by other processes. CRC-32 is several times cheaper than a
+cryptographic digest and keeps the measured false-positive rate at the
+configured target.
+
+A filter built with `from_items` records a digest of its key set, so a
+persisted filter is only reused for exactly the same keys: a filter built for
+other keys would answer "definitely not" for keys added since.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import math
+import zlib
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+def key_set_digest(items: Iterable[str]) -> str:
+    """Order-independent digest of a set of strings."""
+    hasher = hashlib.blake2b(digest_size=16)
+    for item in sorted(set(items)):
+        hasher.update(item.encode("utf-8"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def _hash_pair(item: str) -> Tuple[int, int]:
+    """Two 32-bit hashes of `item` (start position and odd step) for double hashing."""
+    data = item.encode("utf-8")
+    return zlib.crc32(data), zlib.crc32(data[::-1]) | 1
+
+
+class StudioBloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        num_bits: int,
+        num_hashes: int,
+        bits: Optional[bytearray] = None,
+        count: int = 0,
+        key_digest: Optional[str] = None,
+    ):
+        """
+        Initialize an empty filter (or restore one, see `from_dict`).
+
+        Args:
+            num_bits: Size of the bit array
+            num_hashes: Bit positions set/tested per item
+            bits: Existing bit array of ceil(num_bits / 8) bytes
+            count: Number of items already added to `bits`
+            key_digest: `key_set_digest` of exactly the items in `bits`, if known
+        """
+        if num_bits < 8 or num_hashes < 1:
+            raise ValueError("Bloom filter needs at least 8 bits and 1 hash")
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+        if len(self.bits) != (num_bits + 7) // 8:
+            raise ValueError("Bloom filter bit array does not match num_bits")
+        self.count = count
+        self.key_digest = key_digest
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float = 0.01) -> "StudioBloomFilter":
+        """
+        Size a filter for `capacity` items at the target false-positive rate.
+
+        Uses the optimal m = -n ln p / (ln 2)^2 bits and k = (m / n) ln 2 hashes.
+        """
+        capacity = max(1, capacity)
+        num_bits = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    @classmethod
+    def from_items(cls, items: Iterable[str], false_positive_rate: float = 0.01) -> "StudioBloomFilter":
+        """Build a filter holding the distinct `items`."""
+        unique = set(items)
+        bloom = cls.for_capacity(len(unique), false_positive_rate)
+        bits, num_bits, hash_range = bloom.bits, bloom.num_bits, range(bloom.num_hashes)
+        crc32 = zlib.crc32
+        for item in unique:
+            data = item.encode("utf-8")
+            position, step = crc32(data), crc32(data[::-1]) | 1
+            for _ in hash_range:
+                position %= num_bits
+                bits[position >> 3] |= 1 << (position & 7)
+                position += step
+        bloom.count = len(unique)
+        bloom.key_digest = key_set_digest(unique)
+        return bloom
+
+    def add(self, item: str) -> None:
+        """Add `item` to the filter."""
+        bits, num_bits = self.bits, self.num_bits
+        position, step = _hash_pair(item)
+        for _ in range(self.num_hashes):
+            position %= num_bits
+            bits[position >> 3] |= 1 << (position & 7)
+            position += step
+        self.count += 1
+        self.key_digest = None  # No longer describes the exact key set
+
+    def __contains__(self, item: str) -> bool:
+        bits, num_bits = self.bits, self.num_bits
+        position, step = _hash_pair(item)
+        for _ in range(self.num_hashes):
+            position %= num_bits
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+            position += step
+        return True
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return len(self.bits)
+
+    def fill_ratio(self) -> float:
+        """Fraction of bits set."""
+        return sum(bin(byte).count("1") for byte in self.bits) / self.num_bits
+
+    def false_positive_rate(self) -> float:
+        """Probability that a non-member tests positive, from the actual fill ratio."""
+        return self.fill_ratio() ** self.num_hashes
+
+    def describe(self) -> str:
+        """One-line summary of size and false-positive rate."""
+        return (
+            f"{self.count} keys, {self.nbytes / 1024:.1f} KiB, {self.num_hashes} hashes, "
+            f"{self.false_positive_rate():.2%} false positives"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export as JSON-serializable data (stored in StudioMatcher.to_index())."""
+        return {
+            "version": self.VERSION,
+            "num_bits": self.num_bits,
+            "num_hashes": self.num_hashes,
+            "count": self.count,
+            "key_digest": self.key_digest,
+            "bits": base64.b64encode(bytes(self.bits)).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Optional["StudioBloomFilter"]:
+        """Restore a filter exported with `to_dict`, or None if the data is stale or malformed."""
+        try:
+            if data.get("version") != cls.VERSION:
+                return None
+            bits = bytearray(base64.b64decode(data["bits"], validate=True))
+            return cls(
+                int(data["num_bits"]),
+                int(data["num_hashes"]),
+                bits=bits,
+                count=int(data["count"]),
+                key_digest=data.get("key_digest"),
+            )
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Persistent snapshot of Stash studios and the built StudioMatcher index.
+
+Fetching every studio (with aliases) from Stash and rebuilding the matcher
+lookup dict on every plugin start is slow for large instances. This module
+stores the fetched studio list plus the matcher index on disk, keyed by the
+studio count and the most recent studio `updated_at`:
+
+- unchanged key: the persisted index is reused as-is (no rebuild) unless
+  the studios from the watermark's second on differ from the cached ones
+- newer `updated_at`: only studios updated since the cached watermark are
+  fetched and merged by id, then the index is rebuilt locally
+- studios deleted (merged count does not match): full refetch
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .report_state import max_timestamp
+from .stash_client import SceneStudio, StashClient
+
+
+@dataclass
+class StudioSnapshot:
+    """Studios fetched from one Stash instance plus the matcher index built from them."""
+
+    count: int
+    max_updated_at: Optional[str]
+    studios: List[SceneStudio]
+    index: Dict[str, Any] = field(default_factory=dict)
+    source: str = "cache"  # "cache", "delta" or "full" (how this snapshot was obtained)
+
+
+class StudioSnapshotCache:
+    """Load, refresh and persist a studio snapshot for a single Stash instance."""
+
+    VERSION = 1
+
+    def __init__(self, path: Path | str, instance: str):
+        """
+        Initialize the cache.
+
+        Args:
+            path: JSON file the snapshot is persisted to
+            instance: Identifier of the Stash instance (e.g. its GraphQL URL)
+        """
+        self.path = Path(path)
+        self.instance = instance
+
+    def load(self) -> Optional[StudioSnapshot]:
+        """Return the persisted snapshot, or None if missing, stale-format or for another instance."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return None
+
+        if data.get("version") != self.VERSION or data.get("instance") != self.instance:
+            return None
+
+        try:
+            studios = [SceneStudio(**studio) for studio in data.get("studios") or []]
+        except TypeError:
+            return None
+
+        return StudioSnapshot(
+            count=int(data.get("count") or 0),
+            max_updated_at=data.get("max_updated_at"),
+            studios=studios,
+            index=data.get("index") or {},
+        )
+
+    def save(self, snapshot: StudioSnapshot) -> None:
+        """Atomically write the snapshot to disk."""
+        payload = {
+            "version": self.VERSION,
+            "instance": self.instance,
+            "count": snapshot.count,
+            "max_updated_at": snapshot.max_updated_at,
+            "studios": [asdict(studio) for studio in snapshot.studios],
+            "index": snapshot.index,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def refresh(
+        self,
+        stash_client: StashClient,
+        build_index: Callable[[List[SceneStudio]], Dict[str, Any]],
+    ) -> StudioSnapshot:
+        """
+        Return an up-to-date snapshot, fetching as little as possible.
+
+        Args:
+            stash_client: Client used for the fingerprint, delta and full fetches
+            build_index: Callable turning a studio list into a matcher index
+                         (typically `lambda s: StudioMatcher(stash_studios=s).to_index()`)
+
+        Returns:
+            StudioSnapshot whose `source` records whether it was reused, delta-refreshed or refetched
+        """
+        count, latest = stash_client.get_studio_snapshot_key()
+        cached = self.load()
+
+        studios: Optional[List[SceneStudio]] = None
+        source = "full"
+        if cached is not None and cached.max_updated_at:
+            # The delta includes the watermark's own second, so a studio edited
+            # in that second shows up here even though (count, latest) match.
+            changed = stash_client.get_studios_updated_since(cached.max_updated_at)
+            merged = {studio.id: studio for studio in cached.studios}
+            if (
+                cached.index
+                and cached.count == count
+                and cached.max_updated_at == latest
+                and all(merged.get(studio.id) == studio for studio in changed)
+            ):
+                cached.source = "cache"
+                return cached
+            for studio in changed:
+                merged[studio.id] = studio
+            # Deleted studios never show up in the delta; if the merged set does
+            # not line up with the server count, fall back to a full fetch.
+            if len(merged) == count:
+                studios = list(merged.values())
+                source = "delta"
+
+        if studios is None:
+            studios = stash_client.get_all_studios()
+
+        max_updated_at: Optional[str] = None
+        for studio in studios:
+            max_updated_at = max_timestamp(max_updated_at, studio.updated_at)
+
+        snapshot = StudioSnapshot(
+            count=len(studios),
+            max_updated_at=max_updated_at or latest,
+            studios=studios,
+            index=build_index(studios),
+            source=source,
+        )
+        self.save(snapshot)
+        return snapshot
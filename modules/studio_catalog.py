@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Per-studio scene catalogs for confirming and filling parsed metadata.
+
+`ref/scraped_data.sqlite3` holds scraped scene lists for a few studios, one
+table per studio (`family_creep`, `raw_fuck`, `let_them_watch`,
+`treasure_island_media`, listed in `studios_scraped`). Tables differ in which
+of code, title and date they carry. StudioCatalog reads them once into
+in-memory hashes keyed by studio, then by normalized title and by code, so
+confirming a parsed scene is a couple of dict lookups no matter how large
+the library or the catalogs are.
+
+When a parsed result's studio has a catalog, `process`:
+
+- looks up the parsed studio code among the catalog codes, or a number in
+  the title when the rest of the title agrees (Raw Fuck's "35062 Timothy
+  Nixon Busts It Out Of The Cup")
+- otherwise looks up the normalized title (casing and punctuation ignored)
+- on a match, fills a missing title, date or studio code from the catalog
+  entry and records `sources[field] = "catalog"` for each confirmed or filled
+  field; values already parsed are never overwritten by different ones
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .studio_matcher import fold_studio_key
+from .tokenizer import TokenizationResult
+
+DEFAULT_CATALOG_PATH = Path(__file__).resolve().parent.parent / "ref" / "scraped_data.sqlite3"
+
+# Date formats found in catalog tables ("6-Sep-21" on Let Them Watch).
+_CATALOG_DATE_FORMATS = ("%Y-%m-%d", "%d-%b-%y", "%d-%b-%Y")
+_NUMBER = re.compile(r"\d+")
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogEntry:
+    """One scene in a studio catalog."""
+    studio: str
+    title: str
+    code: Optional[str] = None
+    date: Optional[str] = None  # YYYY-MM-DD
+    url: Optional[str] = None
+
+
+def normalize_title(text: str) -> str:
+    """Fold a title for lookup ("STEPFATHER DEMANDS!" -> "stepfatherdemands")."""
+    return fold_studio_key(text)
+
+
+def parse_catalog_date(value: Optional[str]) -> Optional[str]:
+    """Normalize a catalog date to YYYY-MM-DD, or None if it is missing or unrecognized."""
+    value = (value or "").strip()
+    for date_format in _CATALOG_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+class StudioCatalog:
+    """In-memory title and code index over per-studio scene catalogs."""
+
+    def __init__(self, entries: Iterable[CatalogEntry] = ()):
+        """
+        Index catalog entries.
+
+        Titles shared by several scenes of the same studio only match when
+        the parsed date picks one of them; codes are unique per studio.
+
+        Args:
+            entries: Catalog scenes (any studios, any order)
+        """
+        # folded studio name -> normalized title -> entries with that title
+        self._titles: Dict[str, Dict[str, Tuple[CatalogEntry, ...]]] = {}
+        # folded studio name -> code -> entry
+        self._codes: Dict[str, Dict[str, CatalogEntry]] = {}
+        self._size = 0
+        for entry in entries:
+            self.add(entry)
+
+    @classmethod
+    def from_sqlite(cls, path: Optional[Path | str] = None) -> "StudioCatalog":
+        """
+        Load every catalog table listed in `studios_scraped`.
+
+        Args:
+            path: SQLite file (default: ref/scraped_data.sqlite3)
+
+        Returns:
+            StudioCatalog (empty when the file does not exist)
+        """
+        path = Path(path) if path else DEFAULT_CATALOG_PATH
+        if not path.exists():
+            return cls()
+
+        connection = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            return cls(_read_entries(connection))
+        finally:
+            connection.close()
+
+    def add(self, entry: CatalogEntry) -> None:
+        """Index one entry."""
+        studio_key = fold_studio_key(entry.studio)
+        titles = self._titles.setdefault(studio_key, {})
+        title_key = normalize_title(entry.title)
+        if title_key:
+            titles[title_key] = titles.get(title_key, ()) + (entry,)
+        if entry.code:
+            self._codes.setdefault(studio_key, {})[entry.code] = entry
+        self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def has_studio(self, studio: str) -> bool:
+        """Whether a catalog exists for `studio`."""
+        return fold_studio_key(studio) in self._titles
+
+    def by_code(self, studio: str, code: str) -> Optional[CatalogEntry]:
+        """Catalog entry of `studio` with scene code `code`."""
+        return self._codes.get(fold_studio_key(studio), {}).get(code.strip())
+
+    def by_title(self, studio: str, title: str, date: Optional[str] = None) -> Optional[CatalogEntry]:
+        """
+        Catalog entry of `studio` whose title normalizes like `title`.
+
+        Args:
+            studio: Studio name (any spelling fold_studio_key maps to the catalog's)
+            title: Parsed title
+            date: Parsed YYYY-MM-DD date, used to choose between scenes sharing a title
+
+        Returns:
+            The single matching entry, or None when there is none or the match is ambiguous
+        """
+        entries = self._titles.get(fold_studio_key(studio), {}).get(normalize_title(title), ())
+        if len(entries) > 1 and date:
+            entries = tuple(entry for entry in entries if entry.date == date)
+        return entries[0] if len(entries) == 1 else None
+
+    def process(self, result: TokenizationResult) -> TokenizationResult:
+        """
+        Confirm and fill title, date and studio code from the studio's catalog.
+
+        Args:
+            result: Parsed result (studio and title already extracted)
+
+        Returns:
+            The result with catalog-backed fields filled, or unchanged when
+            the studio has no catalog or no entry matches
+        """
+        if not result.studio or not self.has_studio(result.studio):
+            return result
+
+        tokens = result.tokens or []
+        parsed_code = result.studio_code or next(
+            (token.value for token in tokens if token.type == "studio_code"), None
+        )
+        parsed_date = result.date or next((token.value for token in tokens if token.type == "date"), None)
+        title = result.title or ""
+
+        entry = None
+        if parsed_code:
+            entry = self.by_code(result.studio, parsed_code)
+        else:
+            # A number in the title only counts as the code when the rest of
+            # the title is empty or is that scene's title.
+            title_key = normalize_title(title)
+            for number in _NUMBER.findall(title):
+                candidate = self.by_code(result.studio, number)
+                if candidate is not None and title_key.replace(number, "", 1) in ("", normalize_title(candidate.title)):
+                    entry = candidate
+                    break
+        if entry is None and title:
+            entry = self.by_title(result.studio, title, parsed_date)
+        if entry is None:
+            return result
+
+        confirmed: List[str] = []
+        new_title = result.title
+        title_key = normalize_title(title)
+        entry_title_key = normalize_title(entry.title)
+        if not title_key:
+            new_title = entry.title
+            confirmed.append("title")
+        elif title_key == entry_title_key:
+            confirmed.append("title")
+        elif entry.code and title_key.replace(entry.code, "", 1) == entry_title_key:
+            # The code was left in the title ("35062 Timothy Nixon ...").
+            new_title = entry.title
+            confirmed.append("title")
+
+        new_code = result.studio_code
+        if entry.code and (not parsed_code or parsed_code == entry.code):
+            new_code = entry.code
+            confirmed.append("studio_code")
+
+        new_date = result.date
+        if entry.date and (not parsed_date or parsed_date == entry.date):
+            new_date = entry.date
+            confirmed.append("date")
+
+        sources = dict(result.sources or {})
+        confidences = dict(result.confidences or {})
+        for field_name in confirmed:
+            sources[field_name] = "catalog"
+            confidences[field_name] = 1.0
+        return replace(
+            result,
+            title=new_title,
+            studio_code=new_code,
+            date=new_date,
+            sources=sources,
+            confidences=confidences,
+        )
+
+
+def _read_entries(connection: sqlite3.Connection) -> List[CatalogEntry]:
+    entries: List[CatalogEntry] = []
+    studios = connection.execute("SELECT studio_name FROM studios_scraped ORDER BY id").fetchall()
+    for (studio,) in studios:
+        table = re.sub(r"\W+", "_", studio.strip().lower())
+        columns = {row[1] for row in connection.execute(f'PRAGMA table_info("{table}")')}
+        if "title" not in columns:
+            continue
+        selected = [name if name in columns else "NULL" for name in ("title", "code", "date", "url")]
+        for title, code, date_value, url in connection.execute(f'SELECT {", ".join(selected)} FROM "{table}"'):
+            if not title:
+                continue
+            entries.append(CatalogEntry(
+                studio=studio,
+                title=title.strip(),
+                code=str(code) if code is not None else None,
+                date=parse_catalog_date(date_value),
+                url=url,
+            ))
+    return entries
@@ -7,6 +7,7 @@ the token type is changed to 'studio_code' and the pattern is updated accordingl
 """
 
 import re
+from collections.abc import Mapping, Sequence
 from typing import Any, Dict, List, Optional, Tuple, Pattern
 from .tokenizer import TokenizationResult, Token
 from .dictionary_loader import DictionaryLoader
@@ -23,16 +24,16 @@ class StudioCodeFinder:
     def _load_studio_codes(self) -> None:
         """Load studio-code rules from dedicated JSON file."""
         studio_code_rules = DictionaryLoader.load_dictionary("studio_codes.json")
-        if not studio_code_rules or not isinstance(studio_code_rules, list):
+        if not studio_code_rules or not _is_sequence(studio_code_rules):
             return
 
         for rule in studio_code_rules:
-            if not isinstance(rule, dict):
+            if not isinstance(rule, Mapping):
                 continue
 
             studio = rule.get("studio")
             allow_suffix = bool(rule.get("allow_suffix"))
-            normalize = rule.get("normalize") or {}
+            normalize = dict(rule.get("normalize") or {})
             relationship = str(rule.get("studio_relationship") or "can_set").strip().lower()
             if relationship not in {"requires", "can_set"}:
                 relationship = "can_set"
@@ -40,7 +41,7 @@ class StudioCodeFinder:
             patterns = rule.get("code_patterns") or []
             if isinstance(patterns, str):
                 patterns = [patterns]
-            if not isinstance(patterns, list):
+            if not _is_sequence(patterns):
                 continue
 
             for raw_pattern in patterns:
@@ -372,7 +373,9 @@ class StudioCodeFinder:
             group=result.group,
             studio_code=studio_code_value,
             sources=result.sources,
-            confidences=result.confidences
+            confidences=result.confidences,
+            removed_tokens=result.removed_tokens,
+            pre_tokenization=result.pre_tokenization,
         )
 
     def _extract_suffix_after_code(self, token_value: str, code_span) -> Optional[str]:
@@ -419,6 +422,11 @@ class StudioCodeFinder:
         return re.sub(r"\{token(\d+)\}", replace_placeholder, pattern)
 
 
+def _is_sequence(value: Any) -> bool:
+    """JSON array check that accepts the tuples DictionaryLoader returns."""
+    return isinstance(value, Sequence) and not isinstance(value, (str, bytes))
+
+
 if __name__ == '__main__':
     # Simple test
     finder = StudioCodeFinder()
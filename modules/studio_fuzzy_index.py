@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Trigram index for approximate studio name lookup.
+
+Exact lookups miss misspelled or differently spaced studio names
+("Corbin Fisherr", "ActivDuty"). This index maps every trigram of each
+normalized studio key to the keys containing it. A query collects the keys
+that share enough trigrams with the query (by the q-gram lemma, two strings
+within edit distance k share all but 3k of either one's distinct trigrams),
+drops those whose length differs by more than k, and verifies the rest with
+a banded, bounded Levenshtein distance. Only a handful of candidates reach
+the distance check, so a lookup stays well under a millisecond with tens of
+thousands of studio keys.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .studio_matcher import fold_studio_key
+
+
+def normalize_key(text: str) -> str:
+    """Fold text the way StudioMatcher's folded lookup does ("Sean-Cody" -> "seancody")."""
+    return fold_studio_key(text)
+
+
+def trigrams(text: str) -> List[str]:
+    """Overlapping 3-character substrings of `text` (may repeat)."""
+    return [text[i:i + 3] for i in range(len(text) - 2)]
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """
+    Levenshtein distance between `a` and `b`, or None if it exceeds `limit`.
+
+    Only the diagonal band of width 2 * limit + 1 is computed, and the scan
+    stops as soon as a whole row exceeds the limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    too_far = limit + 1
+    previous = [j if j <= limit else too_far for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        char_a = a[i - 1]
+        low = max(1, i - limit)
+        high = min(len(b), i + limit)
+        current = [too_far] * (len(b) + 1)
+        current[0] = i if i <= limit else too_far
+        row_min = current[0]
+        for j in range(low, high + 1):
+            best = previous[j - 1] + (char_a != b[j - 1])
+            if current[j - 1] + 1 < best:
+                best = current[j - 1] + 1
+            if previous[j] + 1 < best:
+                best = previous[j] + 1
+            if best > too_far:
+                best = too_far
+            current[j] = best
+            if best < row_min:
+                row_min = best
+        if row_min > limit:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+@dataclass(frozen=True, slots=True)
+class FuzzyMatch:
+    """A studio key within the allowed edit distance of a query."""
+    key: str
+    canonical_name: str
+    distance: int
+
+
+class StudioFuzzyIndex:
+    """Trigram inverted index over normalized studio keys."""
+
+    def __init__(self, studios: Mapping[str, str], exclude: Iterable[str] = (), min_length: int = 7):
+        """
+        Build the index.
+
+        Args:
+            studios: Lower-case name/alias -> canonical name (StudioMatcher.studios)
+            exclude: Keys that must only ever match exactly
+            min_length: Shortest normalized key (and query) to index; short
+                        names are too ambiguous to match approximately
+        """
+        self.min_length = min_length
+        excluded = set(exclude)
+        self._keys: List[str] = []
+        self._names: List[str] = []
+        self._gram_counts: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+
+        seen: Dict[str, int] = {}
+        for key, canonical_name in studios.items():
+            if key in excluded:
+                continue
+            normalized = normalize_key(key)
+            if len(normalized) < min_length or normalized in seen:
+                continue
+            key_id = seen[normalized] = len(self._keys)
+            self._keys.append(normalized)
+            self._names.append(canonical_name)
+            grams = set(trigrams(normalized))
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(key_id)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def max_distance(length: int) -> int:
+        """Edit budget for a normalized query of `length` characters."""
+        return 1 if length < 10 else 2
+
+    def lookup(self, text: str) -> Optional[FuzzyMatch]:
+        """
+        Return the closest studio to `text` within the edit budget.
+
+        Ties prefer the smaller distance, then the longer key, then the key
+        indexed first.
+
+        Args:
+            text: Raw candidate text (normalized before lookup)
+
+        Returns:
+            FuzzyMatch, or None when nothing is close enough
+        """
+        query = normalize_key(text)
+        if len(query) < self.min_length:
+            return None
+        limit = self.max_distance(len(query))
+        grams = set(trigrams(query))
+        slack = 3 * limit  # One edit destroys at most three trigrams
+
+        shared: Counter = Counter()
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings:
+                shared.update(postings)
+
+        best: Optional[Tuple[int, int, int]] = None
+        gram_counts = self._gram_counts
+        query_grams = len(grams)
+        for key_id, count in shared.items():
+            if count < max(1, query_grams - slack, gram_counts[key_id] - slack):
+                continue
+            key = self._keys[key_id]
+            distance = bounded_edit_distance(query, key, limit)
+            if distance is None:
+                continue
+            rank = (distance, -len(key), key_id)
+            if best is None or rank < best:
+                best = rank
+        if best is None:
+            return None
+        key_id = best[2]
+        return FuzzyMatch(key=self._keys[key_id], canonical_name=self._names[key_id], distance=best[0])
@@ -9,33 +9,257 @@ the pattern is updated accordingly.
 
 import json
 import re
-from typing import Dict, List, Set, Optional, Tuple, Any, TYPE_CHECKING
+import threading
+import unicodedata
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Mapping, Set, Optional, Tuple, Any, TYPE_CHECKING
 from .tokenizer import TokenizationResult, Token
 from .dictionary_loader import DictionaryLoader
+from .studio_bloom import StudioBloomFilter, key_set_digest
 
 if TYPE_CHECKING:
+    from .flat_studio_index import FlatStudioIndex
     from .stash_client import SceneStudio
+    from .studio_fuzzy_index import StudioFuzzyIndex
+
+# Words considered by the fuzzy fallback, and the longest run of them tried.
+_WORD = re.compile(r"\S+")
+_FUZZY_MAX_WORDS = 3
+
+_NON_ALNUM = re.compile(r"[\W_]+")
+# Folded keys shorter than this are too ambiguous for the folded lookup.
+_MIN_FOLDED_KEY_LENGTH = 3
+
+# Letter/digit runs; the words the word trie matches on.
+_ALNUM_WORD = re.compile(r"[^\W_]+")
+# Marks the end of a studio name in a word-trie node.
+_TRIE_END = ""
+# Single-word names shorter than this are mostly given names ("Dom", "Max")
+# unless written as an acronym ("RFC").
+_MIN_SINGLE_WORD_KEY_LENGTH = 4
+# Marks joining two names into a collaboration ("NakedSword × Disruptive").
+_COLLABORATION_MARKS = frozenset("&×+")
+
+
+def _separates_name(words: List[Tuple[str, int, int]], before: int, after: int, text: str) -> bool:
+    """
+    True when the gap between `words[before]` and `words[after]` can end a
+    studio name: the text edge, or whitespace that is not around a
+    collaboration mark ("&", "×", "+" or a lone "x").
+    """
+    if before < 0 or after >= len(words):
+        return True
+    if words[before][0] == "x" or words[after][0] == "x":
+        return False
+    gap = text[words[before][2]:words[after][1]]
+    return any(char.isspace() for char in gap) and not _COLLABORATION_MARKS.intersection(gap)
+
+
+def _plausible_single_word(key: str, text: str, word: Tuple[str, int, int]) -> bool:
+    """Whether a one-word studio `key` found at `word` is long enough, or an acronym as written."""
+    return len(key) >= _MIN_SINGLE_WORD_KEY_LENGTH or text[word[1]:word[2]].isupper()
+
+
+def fold_studio_key(text: str) -> str:
+    """
+    Canonical folding for studio lookups: strip accents (NFKD), casefold and
+    drop everything but letters and digits ("Séan.Cody" -> "seancody").
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM.sub("", stripped.casefold())
 
 
 class StudioMatcher:
     """Matches tokens against known studios and their aliases."""
 
-    def __init__(self, stash_studios: Optional[List[Any]] = None):
+    # Serializes the lazy fuzzy index build so threads sharing a parser build
+    # it once (class-level, so matchers stay picklable for worker bundles).
+    _fuzzy_index_lock = threading.Lock()
+
+    def __init__(
+        self,
+        stash_studios: Optional[List[Any]] = None,
+        studio_index: Optional[Dict[str, Any]] = None,
+    ):
         """
         Initialize studio matcher with studios from Stash API or static dictionary.
 
         Args:
             stash_studios: Optional list of SceneStudio objects from Stash API.
                           If provided, uses Stash's database instead of static JSON.
+            studio_index: Optional prebuilt index from `to_index()` (e.g. a
+                          persisted studio snapshot). Takes precedence over
+                          `stash_studios` and skips rebuilding the lookup dict.
         """
-        self.studios: Dict[str, str] = {}  # Lower-case name/alias -> canonical name
+        self.studios: Mapping[str, str] = {}  # Lower-case name/alias -> canonical name
         self.canonical_names: Set[str] = set()  # Original canonical names for reference
         self.exact_only_keys: Set[str] = set()  # Studio keys (lowercase) that require exact-only matching
-
-        if stash_studios is not None:
+        self.folded_studios: Mapping[str, str] = {}  # fold_studio_key(name/alias) -> canonical name
+        self._fuzzy_index: Optional["StudioFuzzyIndex"] = None  # Built on first fuzzy lookup
+        self.prefilter: StudioBloomFilter  # Exact and folded keys, for the fallbacks
+        parser_dictionary = DictionaryLoader.load_dictionary('parser-dictionary.json') or {}
+        # Lower-case file extensions, ignored at the end of a token by the word fallback
+        self.extensions: Set[str] = {ext.lower() for ext in parser_dictionary.get('extensions', [])}
+
+        if studio_index is not None:
+            self._load_index(studio_index)
+        elif stash_studios is not None:
             self._load_studios_from_stash(stash_studios)
         else:
             self._load_studios_from_json()
+        self._build_folded_index()
+        self._build_word_trie()
+        self._build_prefilter((studio_index or {}).get("prefilter"))
+
+    def to_index(self) -> Dict[str, Any]:
+        """
+        Export the built lookup structures as JSON-serializable data.
+
+        Returns:
+            Dict with 'studios', 'canonical_names', 'exact_only_keys' and
+            'prefilter' (the Bloom filter, reused when the index is loaded)
+        """
+        return {
+            "studios": dict(self.studios),
+            "canonical_names": sorted(self.canonical_names),
+            "exact_only_keys": sorted(self.exact_only_keys),
+            "prefilter": self.prefilter.to_dict(),
+        }
+
+    @contextmanager
+    def shared_studio_index(self, path: Optional[str] = None) -> Iterator["FlatStudioIndex"]:
+        """
+        Serve lookups from FlatStudioIndexes for the duration of the block.
+
+        The lookup dict and the folded-key dict are each encoded into shared
+        memory (or mmap'd files at `path` and `path + ".folded"`) and swapped
+        in for `self.studios` and `self.folded_studios`. Workers forked inside
+        the block read the shared buffers instead of touching the dicts'
+        objects; pickling the matcher (spawn bundles) re-attaches by name. The
+        dicts are restored and the shared buffers removed on exit.
+
+        Args:
+            path: Optional file to back the lookup index instead of shared memory
+
+        Yields:
+            The FlatStudioIndex now assigned to `self.studios`
+        """
+        from .flat_studio_index import FlatStudioIndex
+
+        original, original_folded = self.studios, self.folded_studios
+        index = FlatStudioIndex.create(original, path=path)
+        try:
+            folded_index = FlatStudioIndex.create(
+                original_folded, path=f"{path}.folded" if path is not None else None
+            )
+        except BaseException:
+            index.close()
+            index.unlink()
+            raise
+        self.studios, self.folded_studios = index, folded_index
+        try:
+            yield index
+        finally:
+            self.studios, self.folded_studios = original, original_folded
+            for shared in (index, folded_index):
+                shared.close()
+                shared.unlink()
+
+    def _build_folded_index(self) -> None:
+        """
+        Build the secondary lookup keyed by `fold_studio_key`.
+
+        Lets "Sean.Cody", "Sean_Cody" and "SEANCODY" find "sean cody" without
+        separate aliases. Exact-only keys are left out, as are folded keys
+        that several different studios share (the exact lookup still
+        distinguishes those).
+        """
+        folded: Dict[str, Optional[str]] = {}
+        for key, canonical_name in self.studios.items():
+            if key in self.exact_only_keys:
+                continue
+            folded_key = fold_studio_key(key)
+            if len(folded_key) < _MIN_FOLDED_KEY_LENGTH:
+                continue
+            if folded.setdefault(folded_key, canonical_name) != canonical_name:
+                folded[folded_key] = None  # Ambiguous
+        self.folded_studios = {key: name for key, name in folded.items() if name is not None}
+
+    def _build_word_trie(self) -> None:
+        """
+        Build a trie keyed by the words of each studio name.
+
+        Nodes are dicts from a lower-case word to the next node; `_TRIE_END`
+        holds the (key, canonical name) of a name ending at that node. Only
+        keys made of plain words separated by single spaces are indexed:
+        punctuation is significant in the others ("men.com", "fucked!"), which
+        the whole-token and partial stages still handle.
+        """
+        trie: Dict[str, Any] = {}
+        for key, canonical_name in self.studios.items():
+            if key in self.exact_only_keys or len(key) < 3:
+                continue
+            words = _ALNUM_WORD.findall(key)
+            if not words or " ".join(words) != key:
+                continue
+            node = trie
+            for word in words:
+                node = node.setdefault(word, {})
+            node.setdefault(_TRIE_END, (key, canonical_name))
+        self.word_trie = trie
+
+    def _build_prefilter(self, persisted: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Build the Bloom filter and substring anchors used by the fallbacks.
+
+        The filter holds every exact and folded key. A persisted filter (from
+        `to_index()`) is reused only when its key-set digest matches the
+        current keys; a filter built for other keys would reject new ones. The
+        partial fallback also needs the lengths and the first and last three
+        characters of the keys it may match, so it only probes substrings
+        that could be one of them.
+
+        Args:
+            persisted: Filter exported with StudioBloomFilter.to_dict(), if any
+        """
+        keys = set(self.studios) | set(self.folded_studios)
+        prefilter = StudioBloomFilter.from_dict(persisted) if persisted else None
+        if prefilter is None or prefilter.key_digest is None or prefilter.key_digest != key_set_digest(keys):
+            prefilter = StudioBloomFilter.from_items(keys)
+        self.prefilter = prefilter
+
+        partial_keys = [key for key in self.studios if len(key) >= 3 and key not in self.exact_only_keys]
+        self._partial_lengths = sorted({len(key) for key in partial_keys}, reverse=True)
+        self._partial_prefixes = {key[:3] for key in partial_keys}
+        self._partial_suffixes = {key[-3:] for key in partial_keys}
+
+    def _prefiltered_lookup(self, text: str) -> Optional[str]:
+        """`lookup`, skipping the index when the prefilter rules both keys out."""
+        lowered = text.lower()
+        folded = fold_studio_key(text)
+        if lowered not in self.prefilter and folded not in self.prefilter:
+            return None
+        canonical_name = self.studios.get(lowered)
+        if canonical_name is None:
+            canonical_name = self.folded_studios.get(folded)
+        return canonical_name
+
+    def lookup(self, text: str) -> Optional[str]:
+        """
+        Canonical studio name for `text`: exact (lowercase) key first, then
+        the folded key. None when neither matches.
+        """
+        canonical_name = self.studios.get(text.lower())
+        if canonical_name is None:
+            canonical_name = self.folded_studios.get(fold_studio_key(text))
+        return canonical_name
+
+    def _load_index(self, studio_index: Dict[str, Any]) -> None:
+        """Restore lookup structures previously exported with `to_index()`."""
+        self.studios = dict(studio_index.get("studios") or {})
+        self.canonical_names = set(studio_index.get("canonical_names") or [])
+        self.exact_only_keys = set(studio_index.get("exact_only_keys") or [])
 
     def _load_studios_from_stash(self, stash_studios: List[Any]) -> None:
         """
@@ -104,7 +328,7 @@ class StudioMatcher:
                 except json.JSONDecodeError:
                     aliases = []
 
-            if isinstance(aliases, list):
+            if isinstance(aliases, (list, tuple)):
                 for alias in aliases:
                     if not alias:
                         continue
@@ -129,14 +353,14 @@ class StudioMatcher:
                 except json.JSONDecodeError:
                     abbrs = []
 
-            if isinstance(abbrs, list):
+            if isinstance(abbrs, (list, tuple)):
                 for abbr in abbrs:
                     if abbr:
                         self.studios[abbr.lower()] = canonical_name
 
         # Apply alias mapping overrides/normalization
         alias_map = DictionaryLoader.load_dictionary('studio_aliases.json') or {}
-        if isinstance(alias_map, dict):
+        if isinstance(alias_map, Mapping):
             for alias, canonical in alias_map.items():
                 if not canonical:
                     continue
@@ -169,10 +393,9 @@ class StudioMatcher:
             if token.type == 'path':
                 continue
 
-            # Check if token matches a studio (case-insensitive)
-            token_lower = token.value.lower()
-            if token_lower in self.studios:
-                canonical_name = self.studios[token_lower]
+            # Check if token matches a studio (case-insensitive, then folded)
+            canonical_name = self.lookup(token.value)
+            if canonical_name is not None:
                 studio_matches[i] = canonical_name
 
         # If we found studio matches, update tokens and pattern
@@ -230,9 +453,8 @@ class StudioMatcher:
                     if len(part_clean) < 2:  # Skip very short parts
                         continue
 
-                    part_lower = part_clean.lower()
-                    if part_lower in self.studios:
-                        canonical_name = self.studios[part_lower]
+                    canonical_name = self._prefiltered_lookup(part_clean)
+                    if canonical_name is not None:
                         tokens_to_split[i] = (canonical_name, part_idx, parts)
                         break  # Found a match, stop checking other parts
 
@@ -242,6 +464,75 @@ class StudioMatcher:
 
         return result
 
+    def process_word_fallback(self, result: TokenizationResult) -> TokenizationResult:
+        """
+        Fallback studio matching for studio names made of whole words inside a token.
+
+        Only runs if no studio has been found yet. Walks each text token's
+        words through `word_trie` and takes the longest studio name that
+        starts and ends on word boundaries, e.g. "Helix Studios" in
+        "Helix Studios Twink Scene" (but never "Bang" in "Bangkok"). Only the
+        first text token holding a name is split, as the partial fallback
+        does; studio names lead filenames far more often than they trail them.
+
+        Args:
+            result: TokenizationResult to process
+
+        Returns:
+            Modified TokenizationResult with studio tokens marked if found
+        """
+        if result.studio:
+            return result
+
+        if not result.tokens or not result.pattern:
+            return result
+
+        for i, token in enumerate(result.tokens):
+            if token.type != 'text':
+                continue
+
+            match = self._longest_word_match(token.value)
+            if match:
+                return self._split_substring_tokens_and_update_pattern(result, {i: match})
+
+        return result
+
+    def _longest_word_match(self, text: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Longest studio name in `text` on word boundaries, as (canonical_name, start, end).
+
+        Words are chained only across plain whitespace, and a name must be
+        separated from its neighbouring words by whitespace: "Brett-Tyler.com"
+        and "Chocolate & Cream" are not names. Names next to a collaboration
+        mark ("NakedSword × Disruptive") are ambiguous and left to later stages.
+        """
+        words = [(match.group().lower(), match.start(), match.end()) for match in _ALNUM_WORD.finditer(text)]
+        if len(words) > 1 and words[-1][0] in self.extensions and text[words[-1][1] - 1] == ".":
+            # A leftover extension ("Crunchboy.mp4") ends the text
+            text = text[:words.pop()[1] - 1]
+        best: Optional[Tuple[str, int, int]] = None
+        best_length = 0
+        for first in range(len(words)):
+            if not _separates_name(words, first - 1, first, text):
+                continue
+            node = self.word_trie
+            for last in range(first, len(words)):
+                if last > first and not text[words[last - 1][2]:words[last][1]].isspace():
+                    break
+                node = node.get(words[last][0])
+                if node is None:
+                    break
+                entry = node.get(_TRIE_END)
+                if (
+                    entry
+                    and len(entry[0]) > best_length
+                    and (last > first or _plausible_single_word(entry[0], text, words[first]))
+                    and _separates_name(words, last, last + 1, text)
+                ):
+                    best = (entry[1], words[first][1], words[last][2])
+                    best_length = len(entry[0])
+        return best
+
     def process_partial_match_fallback(self, result: TokenizationResult) -> TokenizationResult:
         """
         Fallback studio matching for partial/substring matches within tokens.
@@ -272,42 +563,115 @@ class StudioMatcher:
             if token.type == 'path' or token.type != 'text':
                 continue
 
-            token_lower = token.value.lower()
+            match = self._longest_substring_match(token.value.lower())
+            if match:
+                tokens_to_split[i] = match
 
-            # Find the longest matching studio name within this token
-            longest_match = None
-            longest_length = 0
-            match_start = -1
-            match_end = -1
+        # If we found studio matches, split tokens and update pattern
+        if tokens_to_split:
+            result = self._split_substring_tokens_and_update_pattern(result, tokens_to_split)
 
-            for studio_key, canonical_name in self.studios.items():
-                # Skip very short studio names to avoid false positives
-                if len(studio_key) < 3:
-                    continue
+        return result
+
+    def _longest_substring_match(self, token_lower: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Longest studio key occurring in `token_lower`, as (canonical_name, start, end).
 
-                # Skip studios marked as exact-only (ending with ^ in dictionary)
-                if studio_key in self.exact_only_keys:
+        Enumerates the substrings that start and end like some key (of a key's
+        length) and checks each against the prefilter before the index. Keys
+        shorter than 3 characters and exact-only keys never match. Equal-length
+        ties go to the key that comes first in `studios`, at its first
+        occurrence, like a scan over all keys would.
+        """
+        prefixes, suffixes = self._partial_prefixes, self._partial_suffixes
+        prefilter, studios = self.prefilter, self.studios
+        size = len(token_lower)
+        best_length = 0
+        hits: Set[str] = set()
+
+        for start in range(size - 2):
+            if token_lower[start:start + 3] not in prefixes:
+                continue
+            for length in self._partial_lengths:
+                if length < best_length:
+                    break
+                end = start + length
+                if end > size or token_lower[end - 3:end] not in suffixes:
                     continue
+                candidate = token_lower[start:end]
+                if candidate not in prefilter or candidate in self.exact_only_keys:
+                    continue
+                if studios.get(candidate) is None:
+                    continue
+                if length > best_length:
+                    best_length = length
+                    hits = set()
+                hits.add(candidate)
+
+        if not hits:
+            return None
+        key = next(iter(hits)) if len(hits) == 1 else next(key for key in studios if key in hits)
+        start = token_lower.find(key)
+        return studios[key], start, start + len(key)
+
+    def process_fuzzy_fallback(self, result: TokenizationResult) -> TokenizationResult:
+        """
+        Fallback studio matching for misspelled or differently spaced names.
 
-                # Check if this studio name appears as a substring
-                pos = token_lower.find(studio_key)
-                if pos != -1:
-                    # Found a match - check if it's the longest so far
-                    if len(studio_key) > longest_length:
-                        longest_match = canonical_name
-                        longest_length = len(studio_key)
-                        match_start = pos
-                        match_end = pos + len(studio_key)
+        Only runs if no studio has been found yet. Looks up runs of one to
+        three words from each text token in a trigram index over the studio
+        keys (see modules/studio_fuzzy_index.py) and accepts the closest key
+        within a small edit distance, e.g. "Corbin Fisherr" or "ActivDuty".
+        The best match across all tokens is split out as in the partial
+        fallback.
 
-            # If we found a match, record it
-            if longest_match:
-                tokens_to_split[i] = (longest_match, match_start, match_end)
+        Args:
+            result: TokenizationResult to process
 
-        # If we found studio matches, split tokens and update pattern
-        if tokens_to_split:
-            result = self._split_substring_tokens_and_update_pattern(result, tokens_to_split)
+        Returns:
+            Modified TokenizationResult with a studio token marked if found
+        """
+        if result.studio:
+            return result
 
-        return result
+        if not result.tokens or not result.pattern:
+            return result
+
+        index = self.fuzzy_index
+        best = None  # (rank, token_index, canonical_name, start, end)
+        for i, token in enumerate(result.tokens):
+            if token.type != 'text':
+                continue
+
+            words = [match.span() for match in _WORD.finditer(token.value)]
+            for first in range(len(words)):
+                for last in range(first, min(first + _FUZZY_MAX_WORDS, len(words))):
+                    start, end = words[first][0], words[last][1]
+                    match = index.lookup(token.value[start:end])
+                    if match is None:
+                        continue
+                    rank = (match.distance, -(end - start))
+                    if best is None or rank < best[0]:
+                        best = (rank, i, match.canonical_name, start, end)
+
+        if best is None:
+            return result
+        _, token_index, canonical_name, start, end = best
+        return self._split_substring_tokens_and_update_pattern(result, {token_index: (canonical_name, start, end)})
+
+    @property
+    def fuzzy_index(self) -> "StudioFuzzyIndex":
+        """Trigram index over the studio keys, built once on first use (thread-safe)."""
+        index = self._fuzzy_index
+        if index is None:
+            with self._fuzzy_index_lock:
+                index = self._fuzzy_index
+                if index is None:
+                    from .studio_fuzzy_index import StudioFuzzyIndex
+
+                    index = StudioFuzzyIndex(self.studios, exclude=self.exact_only_keys)
+                    self._fuzzy_index = index
+        return index
 
     def _update_tokens_and_pattern(
         self,
@@ -363,7 +727,9 @@ class StudioMatcher:
             group=result.group,
             studio_code=getattr(result, "studio_code", None),
             sources=result.sources,
-            confidences=result.confidences
+            confidences=result.confidences,
+            removed_tokens=result.removed_tokens,
+            pre_tokenization=result.pre_tokenization,
         )
 
     def _rebuild_pattern(
@@ -490,7 +856,9 @@ class StudioMatcher:
             group=result.group,
             studio_code=getattr(result, "studio_code", None),
             sources=result.sources,
-            confidences=result.confidences
+            confidences=result.confidences,
+            removed_tokens=result.removed_tokens,
+            pre_tokenization=result.pre_tokenization,
         )
 
     def _rebuild_pattern_after_split(
@@ -634,7 +1002,9 @@ class StudioMatcher:
             group=result.group,
             studio_code=getattr(result, "studio_code", None),
             sources=result.sources,
-            confidences=result.confidences
+            confidences=result.confidences,
+            removed_tokens=result.removed_tokens,
+            pre_tokenization=result.pre_tokenization,
         )
 
     def _rebuild_pattern_after_substring_split(
@@ -4,25 +4,82 @@ Tokenizer module for extracting structured tokens from filenames.
 Handles path extraction, bracket/parenthesis/curly content, and text
 segments split on the literal " - " delimiter. Path portions are emitted
 as a dedicated path token ahead of other tokens.
+
+Result dataclasses use __slots__ and interned token types so that large
+batches of parse results stay compact; `TokenizationResult.compact_tokens`
+additionally swaps token substrings for spans over the cleaned filename.
 """
 
 import re
 import json
+import sys
 from dataclasses import dataclass
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Union
 from .trimmer import Trimmer
 from .dictionary_loader import DictionaryLoader
+from .pre_tokenizer import PreTokenizationResult, RemovedToken
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     """Represents a single token extracted from a filename."""
     value: str
     type: str  # 'path', 'bracket', 'parenthesis', 'curly', 'text'
     position: int  # Position in the original string
 
+    def __post_init__(self) -> None:
+        # A handful of type names is shared by every token of every result.
+        self.type = sys.intern(self.type)
+
+
+@dataclass(slots=True, frozen=True)
+class SpanToken:
+    """
+    Read-only token stored as `(start, end)` offsets into a source string.
+
+    Holds a reference to the (shared) cleaned filename instead of a copy of
+    the token text; `value` slices it on access.
+    """
+    source: str
+    start: int
+    end: int
+    type: str
+    position: int
 
-@dataclass
+    @property
+    def value(self) -> str:
+        return self.source[self.start:self.end]
+
+    @classmethod
+    def from_token(cls, token: Token, source: str, offset: int = 0) -> Optional["SpanToken"]:
+        """
+        Build a span for `token` within `source`.
+
+        Args:
+            token: Token to convert
+            source: String the token was cut from
+            offset: Index in `source` that token positions are relative to
+
+        Returns:
+            The span, or None when the value does not occur verbatim (e.g. a
+            value rewritten by a later pipeline stage)
+        """
+        value = token.value
+        if not value:
+            return None
+        start = offset + token.position
+        if not source.startswith(value, start):
+            start = source.find(value, offset)
+            if start < 0:
+                return None
+        return cls(source=source, start=start, end=start + len(value), type=token.type, position=token.position)
+
+    def to_token(self) -> Token:
+        """Return an equivalent mutable Token."""
+        return Token(value=self.value, type=self.type, position=self.position)
+
+
+@dataclass(slots=True)
 class TokenizationResult:
     """Result of tokenization processing on a filename."""
     original: str
@@ -36,6 +93,28 @@ class TokenizationResult:
     studio_code: Optional[str] = None  # Parsed studio code value
     sources: Optional[Dict[str, str]] = None  # Telemetry: path vs filename
     confidences: Optional[Dict[str, float]] = None  # Field-level confidence scores
+    removed_tokens: Optional[List[RemovedToken]] = None  # Early-removal tokens from pre-tokenization
+    pre_tokenization: Optional[PreTokenizationResult] = None  # Pre-tokenization this result was built from
+    performers: Optional[str] = None  # Set by PathFilenameResolver
+    date: Optional[str] = None  # Set by PathFilenameResolver
+
+    def compact_tokens(self) -> None:
+        """
+        Replace token substrings with SpanTokens over the cleaned filename.
+
+        Meant for results that are kept around after parsing (reports, batch
+        comparison); compacted tokens are read-only. Tokens whose value is not
+        found verbatim in the cleaned filename are kept as-is.
+        """
+        if not self.tokens:
+            return
+        # Token positions are relative to the filename after any path prefix.
+        offset = max(self.cleaned.rfind('/'), self.cleaned.rfind('\\')) + 1
+        compacted: List[Union[Token, SpanToken]] = []
+        for token in self.tokens:
+            span = None if token.type == 'path' else SpanToken.from_token(token, self.cleaned, offset)
+            compacted.append(span or token)
+        self.tokens = compacted
     
     def to_json(self) -> str:
         """Convert result to JSON format."""
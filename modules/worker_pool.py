@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Process pool that shares one preloaded parser state across workers.
+
+Building a FilenameParser loads every dictionary and compiles the studio,
+pre-tokenizer and studio-code tables. A plain ProcessPoolExecutor whose
+initializer builds its own parser repeats that work (and that memory) in
+every worker. `ParserPool` builds the state once in the parent instead:
+
+- fork: the parent registers the state under the pool's key, moves it into
+  the permanent GC generation with `gc.freeze()` and forks workers that
+  inherit it. Because the collector no longer writes to those objects'
+  headers, their pages stay shared copy-on-write between the parent and all
+  workers. Several pools may be open at once: each worker looks up its own
+  pool's state, and the GC is unfrozen when the last fork pool closes.
+- spawn: for platforms without fork, the parent pickles the built state to a
+  bundle file once and each worker loads it instead of re-reading and
+  re-compiling the dictionaries.
+
+`memory_report()` reads per-worker RSS (and PSS / private memory where the
+kernel exposes it) from /proc so the sharing can be checked. Each worker's
+initializer reports its PID to the parent over a queue, so the report only
+uses public multiprocessing APIs.
+"""
+
+from __future__ import annotations
+
+import gc
+import multiprocessing
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+START_METHODS = ("auto", "fork", "spawn")
+
+# Parent side: the state of each open fork pool, keyed by pool; forked workers inherit it.
+_fork_states: Dict[int, Any] = {}
+# Parent side: open fork pools relying on gc.freeze().
+_frozen_pools = 0
+# Worker side: the state of the one pool this process serves.
+_worker_state: Any = None
+
+
+def save_state(state: Any, path: str | os.PathLike) -> Path:
+    """
+    Write a built parser state to a bundle file.
+
+    Args:
+        state: Picklable object (typically a FilenameParser or ParseCache)
+        path: Destination file
+
+    Returns:
+        Path of the written bundle
+    """
+    path = Path(path)
+    with open(path, "wb") as handle:
+        pickle.dump(state, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def load_state(path: str | os.PathLike) -> Any:
+    """Load a bundle written by `save_state`."""
+    with open(path, "rb") as handle:
+        return pickle.load(handle)
+
+
+def _init_worker(pid_queue: Any, state_key: Optional[int] = None, bundle_path: Optional[str] = None) -> None:
+    global _worker_state
+    pid_queue.put(os.getpid())
+    if bundle_path is not None:
+        _worker_state = load_state(bundle_path)
+    else:
+        _worker_state = _fork_states[state_key]
+
+
+def _invoke(func: Callable[[Any, Any], Any], item: Any) -> Any:
+    return func(_worker_state, item)
+
+
+@dataclass(slots=True)
+class WorkerMemory:
+    """Memory use of one worker process, in KiB (None when unavailable)."""
+    pid: int
+    rss_kb: Optional[int]
+    pss_kb: Optional[int] = None
+    private_kb: Optional[int] = None
+
+    def describe(self) -> str:
+        """Human-readable one-liner for logs."""
+        parts = [f"pid {self.pid}: RSS {_format_kb(self.rss_kb)}"]
+        if self.pss_kb is not None:
+            parts.append(f"PSS {_format_kb(self.pss_kb)}")
+        if self.private_kb is not None:
+            parts.append(f"private {_format_kb(self.private_kb)}")
+        return ", ".join(parts)
+
+
+def read_process_memory(pid: int) -> WorkerMemory:
+    """
+    Read RSS, PSS and private memory for a process from /proc.
+
+    PSS splits shared pages between the processes mapping them, so for forked
+    workers it is much lower than RSS when the inherited state is still shared.
+    Missing files (non-Linux, exited process) leave the fields as None.
+    """
+    memory = WorkerMemory(pid=pid, rss_kb=None)
+    fields = _read_kb_fields(f"/proc/{pid}/status")
+    memory.rss_kb = fields.get("VmRSS")
+    rollup = _read_kb_fields(f"/proc/{pid}/smaps_rollup")
+    if rollup:
+        memory.pss_kb = rollup.get("Pss")
+        private = [rollup[key] for key in ("Private_Clean", "Private_Dirty") if key in rollup]
+        memory.private_kb = sum(private) if private else None
+    return memory
+
+
+class ParserPool:
+    """Ordered `map` over a process pool whose workers share one parser state."""
+
+    def __init__(
+        self,
+        state: Any,
+        workers: int,
+        start_method: str = "auto",
+        state_path: Optional[str | os.PathLike] = None,
+    ):
+        """
+        Initialize the pool. Worker processes start lazily on first use.
+
+        Args:
+            state: Built parser state passed as the first argument to mapped functions
+            workers: Number of worker processes
+            start_method: 'fork', 'spawn', or 'auto' (fork where available)
+            state_path: Bundle file for spawn mode (default: a temporary file)
+        """
+        if start_method not in START_METHODS:
+            raise ValueError(f"Unknown start method {start_method!r}; expected one of {START_METHODS}")
+        if start_method == "auto":
+            start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+
+        self.state = state
+        self.workers = max(1, workers)
+        self.start_method = start_method
+        self.state_path: Optional[Path] = Path(state_path) if state_path else None
+        self._owns_state_file = False
+        self._frozen = False
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pid_queue: Any = None
+        self._worker_pids: Set[int] = set()
+
+    def __enter__(self) -> "ParserPool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Prepare the shared state and create the executor."""
+        if self._executor is not None:
+            return
+
+        global _frozen_pools
+        context = multiprocessing.get_context(self.start_method)
+        # SimpleQueue writes synchronously, so a worker's PID is readable
+        # before that worker returns its first result.
+        self._pid_queue = context.SimpleQueue()
+        self._worker_pids = set()
+        if self.start_method == "fork":
+            _fork_states[id(self)] = self.state
+            # Collect first so garbage is not frozen, then keep the collector
+            # from touching (and un-sharing) the inherited objects.
+            gc.collect()
+            gc.freeze()
+            _frozen_pools += 1
+            self._frozen = True
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self._pid_queue, id(self)),
+            )
+        else:
+            if self.state_path is None:
+                handle, name = tempfile.mkstemp(prefix="yansa-parser-", suffix=".pickle")
+                os.close(handle)
+                self.state_path = Path(name)
+                self._owns_state_file = True
+            save_state(self.state, self.state_path)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self._pid_queue, None, str(self.state_path)),
+            )
+
+    def map(self, func: Callable[[Any, Any], Any], items: Iterable[Any], chunksize: int = 1) -> Iterator[Any]:
+        """
+        Apply `func(state, item)` to each item in worker processes.
+
+        `func` must be a module-level function. Results are yielded in input order.
+        """
+        self.start()
+        return self._executor.map(partial(_invoke, func), items, chunksize=chunksize)
+
+    def worker_pids(self) -> List[int]:
+        """PIDs of the worker processes started so far, in ascending order."""
+        if self._pid_queue is not None:
+            while not self._pid_queue.empty():
+                self._worker_pids.add(self._pid_queue.get())
+        return sorted(self._worker_pids)
+
+    def memory_report(self) -> List[WorkerMemory]:
+        """Memory use of each worker process started so far, ordered by pid."""
+        if self._executor is None:
+            return []
+        return [read_process_memory(pid) for pid in self.worker_pids()]
+
+    def close(self) -> None:
+        """Shut down workers, unfreeze the GC (after the last fork pool) and remove a temporary bundle."""
+        global _frozen_pools
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._pid_queue is not None:
+            self._pid_queue.close()
+            self._pid_queue = None
+        if self._frozen:
+            _fork_states.pop(id(self), None)
+            _frozen_pools -= 1
+            if _frozen_pools == 0:
+                gc.unfreeze()
+            self._frozen = False
+        if self._owns_state_file and self.state_path is not None:
+            self.state_path.unlink(missing_ok=True)
+            self.state_path = None
+            self._owns_state_file = False
+
+
+def _read_kb_fields(path: str) -> Dict[str, int]:
+    fields: Dict[str, int] = {}
+    try:
+        with open(path, "r", encoding="ascii") as handle:
+            for line in handle:
+                key, _, value = line.partition(":")
+                parts = value.split()
+                if len(parts) == 2 and parts[1] == "kB":
+                    fields[key.strip()] = int(parts[0])
+    except OSError:
+        return {}
+    return fields
+
+
+def _format_kb(value: Optional[int]) -> str:
+    return "n/a" if value is None else f"{value / 1024:.1f} MiB"
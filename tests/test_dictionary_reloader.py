@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for hot reloading parser dictionaries.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from modules.dictionary_loader import DictionaryLoader
+from modules.dictionary_reloader import ReloadingParser, fingerprint_dictionaries
+from yansa import FilenameParser
+
+FILENAME = "Zebra Lounge Films - Scene Title.mp4"
+
+
+@pytest.fixture
+def dictionaries(tmp_path):
+    """Point DictionaryLoader at a scratch copy of the dictionaries folder."""
+    source = DictionaryLoader.get_dictionary_path().parent
+    target = tmp_path / "dictionaries"
+    shutil.copytree(source, target)
+    with patch.object(DictionaryLoader, "get_dictionary_path", side_effect=lambda name="parser-dictionary.json": target / name):
+        DictionaryLoader.clear_cache()
+        yield target
+    DictionaryLoader.clear_cache()
+
+
+def _add_studio(directory, name):
+    path = directory / "studios.json"
+    studios = json.loads(path.read_text(encoding="utf-8"))
+    studios.append({"canonical_name": name, "aliases": []})
+    path.write_text(json.dumps(studios), encoding="utf-8")
+    # Make the change visible even on filesystems with coarse mtimes.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_reload_swaps_in_a_generation_with_rebuilt_studios(dictionaries):
+    reloader = ReloadingParser(FilenameParser())
+    old = reloader.generation
+    assert reloader.parse(FILENAME).studio != "Zebra Lounge Films"
+    assert reloader.reload_if_changed() is None
+
+    _add_studio(dictionaries, "Zebra Lounge Films")
+    assert reloader.changed_dictionaries() == ["studios.json"]
+    generation = reloader.reload_if_changed()
+
+    assert generation is not None and generation.number == 1
+    assert generation.changed == ("studios.json",)
+    assert reloader.parse(FILENAME).studio == "Zebra Lounge Films"
+    # Only the affected component is rebuilt; the old generation is untouched.
+    assert generation.parser.studio_matcher is not old.parser.studio_matcher
+    assert generation.parser.tokenizer is old.parser.tokenizer
+    assert old.parser.parse(FILENAME).studio != "Zebra Lounge Films"
+
+
+def test_touch_without_edit_does_not_rebuild(dictionaries):
+    reloader = ReloadingParser(FilenameParser())
+    path = dictionaries / "studios.json"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert reloader.reload_if_changed() is None
+    assert reloader.generation.number == 0
+
+
+def test_invalid_json_keeps_current_generation(dictionaries):
+    reloader = ReloadingParser(FilenameParser())
+    (dictionaries / "studios.json").write_text("[{", encoding="utf-8")
+
+    assert reloader.reload_if_changed() is None
+    assert reloader.generation.number == 0
+    assert "studios.json" in reloader.last_error
+    assert DictionaryLoader.load_dictionary("studios.json")  # previous contents still cached
+
+    (dictionaries / "studios.json").write_text(json.dumps([{"canonical_name": "Zebra Lounge Films"}]), encoding="utf-8")
+    assert reloader.reload_if_changed().number == 1
+    assert reloader.last_error is None
+
+
+def test_stash_studios_are_kept_on_studios_json_change(dictionaries):
+    parser = FilenameParser(studio_index={"studios": {"acme": "Acme"}})
+    reloaded = parser.with_reloaded_dictionaries(["studios.json", "studio_codes.json"])
+    assert reloaded.studio_matcher is parser.studio_matcher
+    assert reloaded.studio_code_finder is not parser.studio_code_finder
+
+
+def test_in_flight_parse_finishes_on_old_generation(dictionaries):
+    reloader = ReloadingParser(FilenameParser())
+    old_parser = reloader.parser
+    started, release = threading.Event(), threading.Event()
+    original_finalize = old_parser.finalize_structure
+    results = []
+
+    def slow_finalize(result):
+        started.set()
+        release.wait(5)
+        return original_finalize(result)
+
+    with patch.object(old_parser, "finalize_structure", side_effect=slow_finalize):
+        worker = threading.Thread(target=lambda: results.append(reloader.parse(FILENAME)))
+        worker.start()
+        assert started.wait(5)
+        _add_studio(dictionaries, "Zebra Lounge Films")
+        assert reloader.reload_if_changed().number == 1
+        release.set()
+        worker.join(5)
+
+    assert results[0].studio != "Zebra Lounge Films"
+    assert reloader.parse(FILENAME).studio == "Zebra Lounge Films"
+
+
+def test_background_watcher_reloads(dictionaries):
+    reloaded = threading.Event()
+    with ReloadingParser(FilenameParser(), interval=0.01, on_reload=lambda generation: reloaded.set()) as reloader:
+        _add_studio(dictionaries, "Zebra Lounge Films")
+        assert reloaded.wait(5)
+    assert reloader.parse(FILENAME).studio == "Zebra Lounge Films"
+    assert set(fingerprint_dictionaries()) >= {"studios.json", "parser-dictionary.json"}
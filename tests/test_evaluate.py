@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for the evaluation harness parsing helpers.
+"""
+
+from __future__ import annotations
+
+import csv
+import sys
+from unittest.mock import patch
+
+from tools import evaluate
+from tools.evaluate import calculate_blind_metrics, parse_filenames
+
+FILENAMES = [
+    "Active Duty - Brent Taylor & AJ Alexander 2024-01-15 1080p.mp4",
+    "[SeanCody] Weekend Trip Part 2 (2023).mkv",
+    "crunchboy.com PART 1/[] FIST no taboo entre pervers HARD ! (movie).mp4",
+    "UKNM-001 Brent Taylor.mp4",
+    "random clip.avi",
+]
+
+
+def test_parallel_parse_preserves_order_and_metrics():
+    serial = parse_filenames(FILENAMES, workers=1)
+    parallel = parse_filenames(FILENAMES, workers=2)
+
+    assert [row.input for row in parallel] == FILENAMES
+    assert [row.to_excel_row() for row in parallel] == [row.to_excel_row() for row in serial]
+
+    serial_metrics = calculate_blind_metrics(serial)
+    parallel_metrics = calculate_blind_metrics(parallel)
+    serial_metrics.pop("timestamp", None)
+    parallel_metrics.pop("timestamp", None)
+    assert parallel_metrics == serial_metrics
+
+
+def test_report_suffix_is_reconciled_with_output_format(tmp_path, capsys):
+    input_path = tmp_path / "filenames.txt"
+    input_path.write_text("\n".join(FILENAMES[:2]) + "\n", encoding="utf-8")
+    argv = ["evaluate.py", "--mode", "blind", "--input", str(input_path), "--output-format", "csv",
+            "--output-excel", str(tmp_path / "report.xlsx"), "--output-json", str(tmp_path / "metrics.json")]
+
+    with patch.object(sys, "argv", argv):
+        evaluate.main()
+
+    assert not (tmp_path / "report.xlsx").exists()
+    with (tmp_path / "report.csv").open(newline="", encoding="utf-8") as handle:
+        assert len(list(csv.reader(handle))) == 3
+    assert "does not match --output-format csv; writing report.csv" in capsys.readouterr().out
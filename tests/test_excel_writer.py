@@ -31,3 +31,42 @@ def test_excel_writer_bolds_passthrough_cells(tmp_path):
     finally:
         wb.close()
 
+
+
+def test_excel_writer_streams_generators_with_widths_highlight_and_table(tmp_path):
+    output_path = tmp_path / "stream.xlsx"
+
+    def rows():
+        for idx in range(200):
+            yield [f"row-{idx}", "MISMATCH" if idx % 50 == 0 else "ok", None]
+        yield ["x" * 80, "ok", "tail"]
+
+    def bold():
+        for idx in range(201):
+            yield [idx == 1, False, False]
+
+    sheet = ExcelSheetData(
+        name="Stream Test",
+        headers=["name", "status", "extra"],
+        rows=rows(),
+        highlight_discrepancies=True,
+        discrepancy_predicate=lambda value: value == "MISMATCH",
+        bold_cells=bold(),
+    )
+
+    write_excel_workbook(output_path, [sheet])
+
+    wb = load_workbook(output_path)
+    try:
+        ws = wb["Stream Test"]
+        assert ws.max_row == 202
+        assert [cell.value for cell in ws[1]] == ["name", "status", "extra"]
+        assert ws.cell(row=3, column=1).font.bold is True
+        assert ws.cell(row=2, column=2).fill.fgColor.rgb.endswith("FFFF00")
+        assert ws.cell(row=3, column=2).fill.fill_type is None
+        assert ws.column_dimensions["A"].width == 50  # capped
+        assert ws.column_dimensions["B"].width == len("MISMATCH") + 2
+        assert ws.column_dimensions["C"].width == len("extra") + 2
+        assert ws.tables["StreamTestTable"].ref == "A1:C202"
+    finally:
+        wb.close()
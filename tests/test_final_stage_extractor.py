@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for FinalStageExtractor's sequence marker scanning.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+
+from modules.final_stage_extractor import FinalStageExtractor
+from modules.tokenizer import Token, TokenizationResult
+
+# One regex per label, as the extractor used to scan them (explicit labels first).
+_PER_LABEL_PATTERNS = [
+    (key, re.compile(expr, re.IGNORECASE))
+    for key, expr in (
+        ("scene", r"\b(?:scene|sc)\b[.\s-]?#?\s*(\d+)\b"),
+        ("part", r"\b(?:part|pt)\b[.\s-]?#?\s*(\d+)\b"),
+        ("episode", r"\b(?:episode|ep)\b[.\s-]?#?\s*(\d+)\b"),
+        ("volume", r"\b(?:volume|vol)\b[.\s-]?#?\s*(\d+)\b"),
+        ("disc", r"\b(?:disc|disk|cd)\b[.\s-]?#?\s*(\d+)\b"),
+        ("scene", r"\bs[.\s-]?#?\s*(\d+)\b"),
+        ("part", r"\bp[.\s-]?#?\s*(\d+)\b"),
+        ("episode", r"\be[.\s-]?#?\s*(\d+)\b"),
+        ("volume", r"\bv[.\s-]?#?\s*(\d+)\b"),
+    )
+]
+
+
+def _scan_per_label(text):
+    found = [
+        (key, int(match.group(1)), match.start(), match.end())
+        for key, pattern in _PER_LABEL_PATTERNS
+        for match in pattern.finditer(text)
+    ]
+    return sorted(found, key=lambda item: (item[2], item[3]))
+
+
+def _found(extractor, text):
+    return [(m.key, m.number, m.start, m.end) for m in extractor._find_labeled_sequences(text)]
+
+
+def test_markers_in_position_order():
+    extractor = FinalStageExtractor()
+    assert _found(extractor, "Vol. 3 Title Scene #12 pt 2") == [
+        ("volume", 3, 0, 6),
+        ("scene", 12, 13, 22),
+        ("part", 2, 23, 27),
+    ]
+    assert _found(extractor, "pt2") == []
+    assert _found(extractor, "S01E02") == []
+    assert _found(extractor, "ep 4 e5") == [("episode", 4, 0, 4), ("episode", 5, 5, 7)]
+
+
+def test_single_scan_matches_scanning_each_label():
+    extractor = FinalStageExtractor()
+    rng = random.Random(3)
+    pieces = ["scene", "sc", "part", "pt", "ep", "vol", "disc", "cd", "s", "p", "e", "v", "S", "E",
+              " ", ".", "-", "#", "_", "1", "23", "x", "Title"]
+    for _ in range(5000):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 10)))
+        assert _found(extractor, text) == _scan_per_label(text), text
+
+
+def test_markers_are_removed_from_prefix():
+    extractor = FinalStageExtractor()
+    token = Token(value="Big Series Vol 2 Scene 3", type="text", position=0)
+    result = TokenizationResult(original=token.value, cleaned=token.value, pattern="{token0}", tokens=[token])
+
+    result = extractor.process(result)
+
+    assert result.sequence == {"volume": 2, "scene": 3}
+    assert result.group == "Big Series"
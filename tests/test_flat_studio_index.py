@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the flat shared-memory studio index.
+"""
+
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from modules.flat_studio_index import FlatStudioIndex, encode_studio_index
+from modules.studio_matcher import StudioMatcher
+from modules.tokenizer import Tokenizer
+from tools.evaluate import parse_filenames
+from yansa import FilenameParser
+
+STUDIOS = {"sean cody": "Sean Cody", "seancody": "Sean Cody", "active duty": "Active Duty", "bel ami": "BelAmi", "é studio": "É Studio"}
+
+
+@pytest.fixture
+def shared_index():
+    index = FlatStudioIndex.create(STUDIOS)
+    yield index
+    index.close()
+    index.unlink()
+
+
+def test_lookups_match_the_dict(shared_index):
+    assert len(shared_index) == len(STUDIOS)
+    assert list(shared_index) == list(STUDIOS)
+    assert shared_index.items() == list(STUDIOS.items())
+    for key, value in STUDIOS.items():
+        assert key in shared_index
+        assert shared_index[key] == value
+    assert "sean" not in shared_index
+    assert shared_index.get("nope", "default") == "default"
+    assert shared_index.get(None) is None
+    with pytest.raises(KeyError):
+        shared_index["nope"]
+
+
+def test_pickle_reattaches_to_the_same_segment(shared_index):
+    payload = pickle.dumps(shared_index)
+    assert len(payload) < 200
+    attached = pickle.loads(payload)
+    assert attached.name == shared_index.name
+    assert dict(attached) == STUDIOS
+    attached.close()
+    attached.unlink()  # not the owner: leaves the segment in place
+    assert shared_index["bel ami"] == "BelAmi"
+
+
+def test_file_backed_index(tmp_path):
+    path = tmp_path / "studios.idx"
+    index = FlatStudioIndex.create(STUDIOS, path=path)
+    assert path.read_bytes() == encode_studio_index(STUDIOS)
+    reopened = pickle.loads(pickle.dumps(index))
+    assert reopened["seancody"] == "Sean Cody"
+    reopened.close()
+    index.close()
+    index.unlink()
+    assert not path.exists()
+
+
+def test_rejects_foreign_buffers():
+    with pytest.raises(ValueError):
+        FlatStudioIndex(b"not an index at all")
+
+
+def test_matcher_exact_and_dash_lookups_use_shared_index():
+    matcher = StudioMatcher()
+    original, original_folded = matcher.studios, matcher.folded_studios
+    tokenizer = Tokenizer()
+    exact = tokenizer.tokenize("Active Duty - Scene Title")
+    dashed = tokenizer.tokenize("SeanCody-Weekend Trip")
+
+    expected_exact = matcher.process(exact)
+    expected_dash = matcher.process_dash_fallback(dashed)
+    with matcher.shared_studio_index() as index:
+        assert matcher.studios is index
+        assert isinstance(matcher.folded_studios, FlatStudioIndex)
+        assert dict(matcher.folded_studios.items()) == original_folded
+        assert matcher.lookup("Sean.Cody") == "Sean Cody"
+        assert matcher.process(exact) == expected_exact
+        assert matcher.process_dash_fallback(dashed) == expected_dash
+        assert dict(matcher.to_index()["studios"]) == original
+    assert matcher.studios is original
+    assert matcher.folded_studios is original_folded
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_evaluate_with_shared_index_matches_serial(start_method):
+    filenames = [
+        "Active Duty - Brent Taylor & AJ Alexander 2024-01-15 1080p.mp4",
+        "SeanCody-Weekend Trip Part 2 (2023).mkv",
+        "random clip.avi",
+    ]
+    serial = parse_filenames(filenames, workers=1, parser=FilenameParser())
+    parallel = parse_filenames(filenames, workers=2, start_method=start_method, shared_studio_index=True)
+    assert [row.to_excel_row() for row in parallel] == [row.to_excel_row() for row in serial]
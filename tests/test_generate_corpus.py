@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Tests for the synthetic filename corpus generator.
+"""
+
+from __future__ import annotations
+
+from tools.generate_corpus import CorpusSources, generate_filenames
+
+
+def test_generator_is_deterministic_per_seed():
+    sources = CorpusSources.load()
+
+    first = generate_filenames(300, seed=42, duplicate_rate=0.1, folder_rate=0.2, sources=sources)
+    second = generate_filenames(300, seed=42, duplicate_rate=0.1, folder_rate=0.2, sources=sources)
+    other = generate_filenames(300, seed=43, duplicate_rate=0.1, folder_rate=0.2, sources=sources)
+
+    assert first == second
+    assert first != other
+    assert len(first) == 300
+
+
+def test_generator_draws_on_dictionaries_and_scraped_data():
+    sources = CorpusSources.load()
+    assert sources.studios and sources.code_patterns and sources.date_types
+    assert sources.performers and sources.titles
+
+    filenames = generate_filenames(500, seed=1, duplicate_rate=0.2, sources=sources)
+    extensions = {name.rsplit(".", 1)[-1] for name in filenames}
+    assert extensions <= set(sources.extensions)
+
+    basenames = [name.rsplit("/", 1)[-1] for name in filenames]
+    assert len(set(basenames)) < len(basenames)  # duplicate_rate re-uses basenames
+    assert any(performer in name for name in filenames for performer in sources.performers[:50])
@@ -5,6 +5,11 @@ Tests for MetadataComparator comparison behaviour.
 
 from __future__ import annotations
 
+from unittest.mock import patch
+
+import pytest
+
+from modules import metadata_comparator
 from modules.metadata_comparator import MetadataComparator
 from modules.scene_transformer import ParsedMetadata
 from modules.stash_client import Scene, SceneStudio
@@ -63,4 +68,115 @@ def test_compare_scene_metadata_conflict_requires_review():
     assert result.requires_review is True
     assert result.auto_approve is False
     assert result.overall_status in {"minor_conflicts", "major_conflicts"}
+    # Conflicts still report their exact similarity.
+    code_comparison = result.field_comparisons["studio_code"]
+    assert code_comparison.status == "conflict"
+    assert code_comparison.similarity == pytest.approx(1 / 7)
+    assert code_comparison.confidence == pytest.approx(1 / 7)
+
+
+def _batch_fixture():
+    parsed_list = [
+        ParsedMetadata(studio="UKNM", title="AJ Alexander", date="2024-01-15", studio_code="UKNM-001"),
+        ParsedMetadata(studio="Studio A", title="Title A", date="2024-01-15", studio_code="AAA-001"),
+        ParsedMetadata(studio="Sean Cody", title="Brent Fucks", date="2024-01-16", studio_code=None),
+        ParsedMetadata(studio=None, title="Weekend Trip Part 2", date="15.01.2024", studio_code="SC 12"),
+        ParsedMetadata(studio="Active Duty", title=None, date="January 2024", studio_code="AD-9"),
+    ]
+    scenes = [
+        Scene(id="1", title=None, date=None, code=None, studio=None, files=[], performers=[], tags=[], organized=False),
+        Scene(
+            id="2",
+            title="Completely different",
+            date="2020-01-01",
+            code="ZZZ-999",
+            studio=SceneStudio(id="10", name="Studio Z"),
+            files=[],
+            performers=[],
+            tags=[],
+            organized=False,
+        ),
+        Scene(
+            id="3",
+            title="Brent fucks!",
+            date="2024-01-15",
+            code=None,
+            studio=SceneStudio(id="11", name="Sean Cody Productions"),
+            files=[],
+            performers=[],
+            tags=[],
+            organized=False,
+        ),
+        Scene(
+            id="4",
+            title="Weekend Trip Part 1",
+            date="2024-01-20",
+            code="SC12",
+            studio=SceneStudio(id="12", name="Sean Cody"),
+            files=[],
+            performers=[],
+            tags=[],
+            organized=False,
+        ),
+        Scene(
+            id="5",
+            title="Something",
+            date="Jan 2024",
+            code="AD-8",
+            studio=SceneStudio(id="13", name="Active Duty"),
+            files=[],
+            performers=[],
+            tags=[],
+            organized=False,
+        ),
+    ]
+    return parsed_list, scenes
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_compare_many_matches_per_scene_comparison(use_numpy):
+    if use_numpy and not metadata_comparator.NUMPY_AVAILABLE:
+        pytest.skip("numpy not installed")
+    parsed_list, scenes = _batch_fixture()
+    comparator = MetadataComparator()
+
+    with patch.object(metadata_comparator, "NUMPY_AVAILABLE", use_numpy):
+        batch = comparator.compare_many(parsed_list, scenes)
+
+    assert len(batch) == len(scenes)
+    for index, (parsed, scene) in enumerate(zip(parsed_list, scenes)):
+        expected = comparator.compare_scene_metadata(parsed, scene)
+        for field_name, comparison in expected.field_comparisons.items():
+            assert batch.status_name(field_name, index) == comparison.status
+            if field_name != "date" and comparison.status == "conflict":
+                # compare_many stops scoring text conflicts early.
+                assert batch.similarity[field_name][index] == 0.0
+            else:
+                assert batch.similarity[field_name][index] == pytest.approx(comparison.similarity)
+        assert batch.overall_status_name(index) == expected.overall_status
+        assert bool(batch.auto_approve[index]) is expected.auto_approve
+        assert bool(batch.requires_review[index]) is expected.requires_review
+
+
+def test_vectorized_iso_dates_match_per_value_parsing():
+    if not metadata_comparator.NUMPY_AVAILABLE:
+        pytest.skip("numpy not installed")
+    comparator = MetadataComparator()
+    values = [
+        "2024-01-15", "2024-02-29", "2023-02-29", "2024-04-31", "2024-13-01", "0000-01-01", "0001-01-01",
+        "1969-12-31", "2024-1-5", "2024/01/15", "2024-01-15T10:00:00", "Jan 2024", "2024", None, "2024-01-15",
+    ]
+
+    vectorized = comparator._date_seconds(values)
+    with patch.object(metadata_comparator, "NUMPY_AVAILABLE", False):
+        per_value = comparator._date_seconds(values)
+
+    assert vectorized == per_value
+    assert vectorized[0] == 1705276800
+    assert vectorized[2] is None and vectorized[3] is None
+
 
+def test_compare_many_rejects_misaligned_inputs():
+    parsed_list, scenes = _batch_fixture()
+    with pytest.raises(ValueError):
+        MetadataComparator().compare_many(parsed_list, scenes[:-1])
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for run-level parse deduplication.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from modules.parse_cache import ParseCache
+from modules.stash_client import Scene, SceneFile, SceneStudio
+from yansa import FilenameParser
+
+
+def test_cache_parses_each_key_once():
+    parser = FilenameParser()
+    cache = ParseCache(parser)
+
+    with patch.object(parser, "parse", wraps=parser.parse) as parse:
+        first = cache.parse("Studio - Scene One.mp4")
+        second = cache.parse("Studio - Scene One.mp4")
+        other_studio = cache.parse("Studio - Scene One.mp4", existing_studio="Other")
+        cache.parse("Studio - Scene Two.mp4")
+
+    assert first is second
+    assert other_studio is not first
+    assert parse.call_count == 3
+    assert (cache.lookups, cache.unique, cache.reused) == (4, 3, 1)
+    assert cache.dedup_ratio == 4 / 3
+    assert "dedup ratio 1.33x" in cache.summary()
+
+
+def test_cache_keys_on_basename():
+    cache = ParseCache(FilenameParser())
+
+    first = cache.parse("Folder A/Studio - Scene Title.mp4")
+    second = cache.parse("Folder B\\Studio - Scene Title.mp4")
+
+    assert cache.unique == 1
+    assert second.original == "Folder B\\Studio - Scene Title.mp4"
+    assert first.original == "Folder A/Studio - Scene Title.mp4"
+    assert second.tokens is first.tokens
+
+
+def test_cached_results_match_direct_parse():
+    parser = FilenameParser()
+    cache = ParseCache(parser)
+    filename = "[Studio] Performer One & Performer Two - Scene Title (2021-05-04) 1080p.mp4"
+
+    direct = parser.parse(filename)
+    cached = cache.parse(filename)
+
+    assert cached.to_json() == direct.to_json()
+    assert [(t.value, t.type) for t in cached.tokens or []] == [(t.value, t.type) for t in direct.tokens or []]
+
+
+def test_cache_does_not_store_failures():
+    parser = MagicMock()
+    parser.parse.side_effect = [ValueError("boom"), MagicMock()]
+    cache = ParseCache(parser, compact_tokens=False)
+
+    try:
+        cache.parse("broken.mp4")
+    except ValueError:
+        pass
+    cache.parse("broken.mp4")
+
+    assert parser.parse.call_count == 2
+    assert cache.unique == 1
+
+
+def test_plugin_report_parses_duplicate_basenames_once(tmp_path):
+    import yansa
+
+    studio = SceneStudio(id="1", name="Active Duty")
+    scenes = [
+        Scene(id="1", title=None, date=None, code=None, studio=None,
+              files=[SceneFile(id="1", path="/a/Scene One.mp4", basename="Scene One.mp4")]),
+        Scene(id="2", title=None, date=None, code=None, studio=None,
+              files=[SceneFile(id="2", path="/b/Scene One.mp4", basename="Scene One.mp4")]),
+        Scene(id="3", title=None, date=None, code=None, studio=studio,
+              files=[SceneFile(id="3", path="/c/Scene One.mp4", basename="Scene One.mp4")]),
+        Scene(id="4", title=None, date=None, code=None, studio=None,
+              files=[SceneFile(id="4", path="/a/Scene Two.mp4", basename="Scene Two.mp4")]),
+    ]
+    fake_client = MagicMock()
+    fake_client.get_all_studios.return_value = None
+    fake_client.url = "http://localhost:9999/graphql"
+    fake_client.get_all_unorganized_scenes.return_value = scenes
+    fake_client.last_fetch_telemetry = None
+
+    args = {
+        "mode": "report",
+        "state_path": str(tmp_path / "state.sqlite3"),
+        "report_dir": str(tmp_path),
+        "studio_cache": False,
+        "report_format": "csv",
+    }
+    with patch.object(yansa, "StashClient", return_value=fake_client), \
+            patch.object(yansa.StashYansaPlugin, "_log") as log:
+        plugin = yansa.StashYansaPlugin({"args": args})
+        with patch.object(plugin.filename_parser, "parse", wraps=plugin.filename_parser.parse) as parse:
+            output = plugin.main()["output"]
+
+    assert output["parsed_rows"] == 4
+    assert parse.call_count == 3
+    assert plugin.parse_cache.lookups == 0  # cleared after the run
+    messages = [call.args[0] for call in log.call_args_list]
+    assert any(m.startswith("Parsed 3 unique basenames for 4 scenes (dedup ratio 1.33x") for m in messages)
@@ -467,3 +467,25 @@ def test_trimming(pre_tokenizer, filename, expected_original, expected_cleaned):
     
     assert parsed["original"] == expected_original
     assert parsed["cleaned"] == expected_cleaned
+
+
+def test_parse_carries_pre_tokenization_result():
+    """Full parse exposes removed tokens so callers need not pre-tokenize again."""
+    from unittest.mock import patch
+
+    from yansa import FilenameParser
+
+    parser = FilenameParser()
+    filename = "Active Duty - Brent Taylor 1080p.mp4"
+    expected = parser.pre_tokenize(filename)
+
+    with patch.object(parser.pre_tokenizer, "process", wraps=parser.pre_tokenizer.process) as process:
+        result = parser.parse(filename)
+
+    assert process.call_count == 1
+    assert result.pre_tokenization is not None
+    assert result.pre_tokenization.cleaned == expected.cleaned
+    assert [(t.value, t.category) for t in result.removed_tokens] == [
+        (t.value, t.category) for t in expected.removed_tokens
+    ]
+    assert result.removed_tokens
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for the CSV/JSONL/Parquet/Excel report sinks.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import sqlite3
+import zipfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+from openpyxl import load_workbook
+
+from modules import report_sinks
+from modules.report_sinks import normalize_report_format, open_report_sink, report_path_for_format
+from tests.test_stash_sqlite import STASH_SCHEMA
+
+HEADERS = ["stem", "studio", "title"]
+ROWS = [["A - One", "A", "One"], ["B - Two", None, "Two, with comma"]]
+
+
+def test_csv_and_jsonl_sinks_stream_rows(tmp_path):
+    with open_report_sink(tmp_path / "out.csv", HEADERS) as sink:
+        for row in ROWS:
+            sink.write_row(row)
+    with open_report_sink(tmp_path / "out.jsonl", HEADERS) as sink:
+        for row in ROWS:
+            sink.write_row(row)
+
+    with (tmp_path / "out.csv").open(encoding="utf-8", newline="") as handle:
+        assert list(csv.reader(handle)) == [HEADERS, ROWS[0], ["B - Two", "", "Two, with comma"]]
+
+    lines = (tmp_path / "out.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [dict(zip(HEADERS, row)) for row in ROWS]
+    assert sink.rows_written == 2
+
+
+def test_excel_sink_spools_rows_and_keeps_bold_cells(tmp_path):
+    with open_report_sink(tmp_path / "out.xlsx", HEADERS, sheet_name="Report") as sink:
+        sink.write_row(ROWS[0], [False, True, False])
+        sink.write_row(ROWS[1])
+        # Rows go to the temp-file spool as they arrive, not to in-memory lists.
+        assert sink._spool.count == 2
+        assert sink._spool.widths == [7, 1, 15]
+
+    wb = load_workbook(tmp_path / "out.xlsx")
+    try:
+        ws = wb["Report"]
+        assert [cell.value for cell in ws[3]] == ROWS[1]
+        assert ws.cell(row=2, column=2).font.bold is True
+        assert ws.cell(row=3, column=2).font.bold is not True
+        assert ws.column_dimensions["C"].width == 17
+    finally:
+        wb.close()
+
+
+def test_parquet_sink_writes_string_columns(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    with open_report_sink(tmp_path / "out.parquet", HEADERS) as sink:
+        sink.batch_size = 1
+        for row in ROWS:
+            sink.write_row(row)
+
+    table = pq.read_table(tmp_path / "out.parquet")
+    assert table.column_names == HEADERS
+    assert table.column("studio").to_pylist() == ["A", None]
+
+
+def test_parquet_sink_requires_pyarrow(tmp_path):
+    with patch.object(report_sinks, "PYARROW_AVAILABLE", False):
+        with pytest.raises(RuntimeError):
+            open_report_sink(tmp_path / "out.parquet", HEADERS)
+
+
+def test_normalize_report_format():
+    assert normalize_report_format(None) == "xlsx"
+    assert normalize_report_format(None, "report.CSV") == "csv"
+    assert normalize_report_format("JSONL", "report.csv") == "jsonl"
+    assert normalize_report_format(None, "report.json") == "jsonl"
+    # Unknown suffixes on an explicit path keep the xlsx default.
+    assert normalize_report_format(None, "report.xlsm") == "xlsx"
+    assert normalize_report_format(None, "report.out") == "xlsx"
+    with pytest.raises(ValueError):
+        normalize_report_format("ods")
+
+
+def test_report_path_for_format():
+    assert report_path_for_format("out/report.xlsx", "csv").as_posix() == "out/report.csv"
+    assert report_path_for_format("report.csv", "CSV").as_posix() == "report.csv"
+    assert report_path_for_format("report.json", "jsonl").as_posix() == "report.json"
+    assert report_path_for_format("report.out", "parquet").as_posix() == "report.out"
+
+
+def _run_report(tmp_path, **report_args):
+    import yansa
+
+    db_path = tmp_path / "stash-go.sqlite"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(STASH_SCHEMA)
+    conn.execute("INSERT INTO folders (id, path) VALUES (1, '/media')")
+    conn.execute("INSERT INTO files (id, basename, parent_folder_id) VALUES (1, 'Active Duty - One.mp4', 1)")
+    conn.execute("INSERT INTO scenes (id, title, organized, updated_at) VALUES (1, NULL, 0, '2024-01-01 00:00:00')")
+    conn.execute('INSERT INTO scenes_files (scene_id, file_id, "primary") VALUES (1, 1, 1)')
+    conn.commit()
+    conn.close()
+
+    fake_client = MagicMock()
+    fake_client.get_all_studios.return_value = None
+    fake_client.url = "http://localhost:9999/graphql"
+    args = {
+        "mode": "report",
+        "database_path": str(db_path),
+        "state_path": str(tmp_path / "state.sqlite3"),
+        "report_dir": str(tmp_path),
+        "studio_cache": False,
+        **report_args,
+    }
+
+    with patch.object(yansa, "StashClient", return_value=fake_client):
+        return yansa.StashYansaPlugin({"args": args}).main()["output"]
+
+
+def test_plugin_writes_report_in_requested_format(tmp_path):
+    import yansa
+
+    output = _run_report(tmp_path, report_format="jsonl")
+
+    assert output["report_format"] == "jsonl"
+    assert output["report_path"].endswith(".jsonl")
+    records = [json.loads(line) for line in open(output["report_path"], encoding="utf-8")]
+    assert len(records) == 1
+    assert list(records[0]) == yansa.SceneReportRow.headers()
+    assert records[0]["title"] == "One"
+
+
+def test_plugin_reconciles_report_path_suffix_with_format(tmp_path):
+    # A suffix naming another format is replaced rather than mislabeling the file.
+    output = _run_report(tmp_path, report_format="csv", report_path=str(tmp_path / "report.xlsx"))
+    assert output["report_path"] == str(tmp_path / "report.csv")
+    assert (tmp_path / "report.csv").read_text(encoding="utf-8").startswith("parent,stem,")
+    assert not (tmp_path / "report.xlsx").exists()
+
+    # Any other suffix is kept and gets the xlsx default, as before.
+    other = tmp_path / "other"
+    other.mkdir()
+    output = _run_report(other, report_path=str(other / "report.out"))
+    assert (output["report_format"], output["report_path"]) == ("xlsx", str(other / "report.out"))
+    with zipfile.ZipFile(other / "report.out") as archive:
+        assert "xl/workbook.xml" in archive.namelist()
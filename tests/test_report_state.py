@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental report state and watermark handling.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from unittest.mock import MagicMock, patch
+
+from modules.report_state import ReportStateStore, StoredReportRow, max_timestamp, state_fingerprint
+from tests.test_stash_sqlite import STASH_SCHEMA
+
+
+def test_store_upserts_deletes_and_orders_rows(tmp_path):
+    with ReportStateStore(tmp_path / "state.sqlite3") as store:
+        store.replace_rows(
+            "a",
+            [
+                StoredReportRow(scene_id="2", sort_key="b", values=["x"], bold_mask=[True]),
+                StoredReportRow(scene_id="1", sort_key="a", values=["y"]),
+            ],
+        )
+        store.upsert_rows("a", [StoredReportRow(scene_id="2", sort_key="0", values=["z"])])
+        store.upsert_rows("b", [StoredReportRow(scene_id="9", sort_key="a", values=["other"])])
+
+        assert [(r.scene_id, r.values) for r in store.iter_rows("a")] == [("2", ["z"]), ("1", ["y"])]
+
+        assert store.scene_ids("a") == {"1", "2"}
+        store.delete_rows("a", ["1"])
+        assert store.count_rows("a") == 1
+        assert store.count_rows("b") == 1
+
+
+def test_store_persists_watermarks_per_instance(tmp_path):
+    path = tmp_path / "state.sqlite3"
+    with ReportStateStore(path) as store:
+        assert store.get_watermark("a") is None
+        store.set_watermark("a", "2024-01-01T00:00:00Z", "abc")
+
+    with ReportStateStore(path) as store:
+        assert store.get_watermark("a") == "2024-01-01T00:00:00Z"
+        assert store.get_fingerprint("a") == "abc"
+        assert store.get_watermark("b") is None
+
+
+def test_store_upgrades_state_without_fingerprints(tmp_path):
+    path = tmp_path / "state.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE watermarks (instance TEXT PRIMARY KEY, updated_at TEXT NOT NULL, refreshed_at TEXT NOT NULL)")
+    conn.execute("INSERT INTO watermarks VALUES ('a', '2024-01-01 00:00:00', '2024-01-02T00:00:00')")
+    conn.commit()
+    conn.close()
+
+    with ReportStateStore(path) as store:
+        assert store.get_watermark("a") == "2024-01-01 00:00:00"
+        assert store.get_fingerprint("a") is None
+
+
+def test_max_timestamp_compares_parsed_values():
+    assert max_timestamp(None, "2024-01-01T00:00:00Z") == "2024-01-01T00:00:00Z"
+    assert max_timestamp("2024-01-02T00:00:00+00:00", "2024-01-01T23:00:00-05:00") == "2024-01-01T23:00:00-05:00"
+    assert max_timestamp("2024-01-02 00:00:00", None) == "2024-01-02 00:00:00"
+
+
+def _stash_db(path, updated_at):
+    """A Stash database with one unorganized 'Active Duty - <title>.mp4' scene per `updated_at` entry."""
+    conn = sqlite3.connect(path)
+    conn.executescript(STASH_SCHEMA)
+    conn.execute("INSERT INTO folders (id, path) VALUES (1, '/media')")
+    names = ["One", "Two", "Three"]
+    for scene_id, timestamp in enumerate(updated_at, start=1):
+        conn.execute(
+            "INSERT INTO files (id, basename, parent_folder_id, updated_at) VALUES (?, ?, 1, ?)",
+            (scene_id, f"Active Duty - {names[scene_id - 1]}.mp4", timestamp),
+        )
+        conn.execute("INSERT INTO scenes (id, organized, updated_at) VALUES (?, 0, ?)", (scene_id, timestamp))
+        conn.execute('INSERT INTO scenes_files (scene_id, file_id, "primary") VALUES (?, ?, 1)', (scene_id, scene_id))
+    conn.commit()
+    return conn
+
+
+def _plugin_args(tmp_path, db_path):
+    return {
+        "database_path": str(db_path),
+        "state_path": str(tmp_path / "state.sqlite3"),
+        "report_dir": str(tmp_path),
+        "studio_cache": False,
+    }
+
+
+def _fake_client():
+    fake_client = MagicMock()
+    fake_client.get_all_studios.return_value = None
+    fake_client.url = "http://localhost:9999/graphql"
+    return fake_client
+
+
+def _stored_titles(tmp_path, db_path):
+    with ReportStateStore(tmp_path / "state.sqlite3") as store:
+        return {row.scene_id: row.values[6] for row in store.iter_rows(f"sqlite:{db_path.resolve()}")}
+
+
+def test_incremental_run_reparses_only_updated_scenes(tmp_path):
+    import yansa
+
+    db_path = tmp_path / "stash-go.sqlite"
+    conn = _stash_db(db_path, ["2023-12-01 00:00:00", "2023-12-01 00:00:00", "2024-01-01 00:00:00"])
+    args = _plugin_args(tmp_path, db_path)
+
+    with patch.object(yansa, "StashClient", return_value=_fake_client()):
+        full = yansa.StashYansaPlugin({"args": {**args, "mode": "report"}}).main()
+        assert full["output"]["mode"] == "report"
+        assert full["output"]["parsed_rows"] == 3
+
+        conn.execute("UPDATE scenes SET title = 'Renamed', updated_at = '2024-02-01 00:00:00' WHERE id = 2")
+        conn.execute("UPDATE scenes SET organized = 1, updated_at = '2024-02-01 00:00:00' WHERE id = 3")
+        conn.commit()
+
+        plugin = yansa.StashYansaPlugin({"args": {**args, "mode": "incremental"}})
+        with patch.object(plugin, "_build_report_row", wraps=plugin._build_report_row) as build_row:
+            incremental = plugin.main()
+
+    conn.close()
+    output = incremental["output"]
+    assert output["mode"] == "incremental"
+    assert output["total_scenes"] == 2
+    assert output["removed"] == 1
+    assert output["parsed_rows"] == 2
+    assert [call.args[0].id for call in build_row.call_args_list] == ["2"]
+
+    with ReportStateStore(tmp_path / "state.sqlite3") as store:
+        assert store.get_watermark(f"sqlite:{db_path.resolve()}") == "2024-02-01 00:00:00"
+    assert _stored_titles(tmp_path, db_path) == {"1": "One", "2": "Renamed"}
+
+
+def test_incremental_run_catches_boundary_updates_renames_and_deletions(tmp_path):
+    import yansa
+
+    db_path = tmp_path / "stash-go.sqlite"
+    conn = _stash_db(db_path, ["2023-12-01 00:00:00", "2023-12-01 00:00:00", "2024-01-01 00:00:00"])
+    args = _plugin_args(tmp_path, db_path)
+
+    with patch.object(yansa, "StashClient", return_value=_fake_client()):
+        yansa.StashYansaPlugin({"args": {**args, "mode": "report"}}).main()
+
+        # Updated in the watermark's own second, after the full run read it.
+        conn.execute("UPDATE files SET basename = 'Active Duty - Three Again.mp4' WHERE id = 3")
+        # File renamed without touching scenes.updated_at.
+        conn.execute(
+            "UPDATE files SET basename = 'Active Duty - Second.mp4', updated_at = '2024-03-01 00:00:00' WHERE id = 2"
+        )
+        # Scene deleted from Stash.
+        conn.execute("DELETE FROM scenes WHERE id = 1")
+        conn.execute("DELETE FROM scenes_files WHERE scene_id = 1")
+        conn.commit()
+
+        output = yansa.StashYansaPlugin({"args": {**args, "mode": "incremental"}}).main()["output"]
+
+    conn.close()
+    assert output["mode"] == "incremental"
+    assert output["removed"] == 1
+    assert _stored_titles(tmp_path, db_path) == {"2": "Second", "3": "Three Again"}
+    with ReportStateStore(tmp_path / "state.sqlite3") as store:
+        assert store.get_watermark(f"sqlite:{db_path.resolve()}") == "2024-03-01 00:00:00"
+
+
+def test_changed_parser_fingerprint_forces_full_run(tmp_path):
+    import yansa
+
+    db_path = tmp_path / "stash-go.sqlite"
+    _stash_db(db_path, ["2024-01-01 00:00:00"]).close()
+    args = _plugin_args(tmp_path, db_path)
+
+    with patch.object(yansa, "StashClient", return_value=_fake_client()):
+        yansa.StashYansaPlugin({"args": {**args, "mode": "report"}}).main()
+        unchanged = yansa.StashYansaPlugin({"args": {**args, "mode": "incremental"}}).main()
+        reconfigured = yansa.StashYansaPlugin(
+            {"args": {**args, "mode": "incremental", "config": {"pipeline": {"disabled_stages": ["studios"]}}}}
+        ).main()
+
+    assert unchanged["output"]["mode"] == "incremental"
+    assert reconfigured["output"]["mode"] == "report"
+
+
+def test_state_fingerprint_tracks_files_and_settings(tmp_path):
+    dictionary = tmp_path / "studios.json"
+    dictionary.write_text("{}", encoding="utf-8")
+    base = state_fingerprint([dictionary], {"pipeline": {}})
+
+    assert state_fingerprint([dictionary], {"pipeline": {}}) == base
+    assert state_fingerprint([dictionary], {"pipeline": {"profile": True}}) != base
+    dictionary.write_text('{"a": 1}', encoding="utf-8")
+    assert state_fingerprint([dictionary], {"pipeline": {}}) != base
+
+
+def test_plugin_rejects_projections_without_report_fields(tmp_path):
+    import yansa
+
+    fake_client = _fake_client()
+    args = {"studio_cache": False, "state_path": str(tmp_path / "state.sqlite3"), "report_dir": str(tmp_path)}
+
+    with patch.object(yansa, "StashClient", return_value=fake_client), \
+            patch.object(yansa.StashYansaPlugin, "_log_error") as log_error:
+        yansa.StashYansaPlugin({"args": {**args, "config": {"processing": {"scene_projection": "update"}}}})
+        assert fake_client.set_scene_projection.call_args.args == ("report",)
+        assert "lacks fields the report needs" in log_error.call_args.args[0]
+
+        log_error.reset_mock()
+        yansa.StashYansaPlugin({"args": {**args, "config": {"processing": {"scene_projection": "full"}}}})
+        assert fake_client.set_scene_projection.call_args.args == ("full",)
+        log_error.assert_not_called()
+
+
+def test_database_error_mid_stream_falls_back_to_graphql_once(tmp_path):
+    import yansa
+    from modules.stash_sqlite import StashSQLiteReader
+
+    db_path = tmp_path / "stash-go.sqlite"
+    conn = _stash_db(db_path, ["2023-12-01 00:00:00", "2023-12-01 00:00:00", "2024-01-01 00:00:00"])
+    conn.close()
+    args = _plugin_args(tmp_path, db_path)
+    scenes = list(StashSQLiteReader(str(db_path)).iter_unorganized_scenes())
+    fake_client = _fake_client()
+    fake_client.get_all_unorganized_scenes.return_value = scenes
+    fake_client.get_all_scenes_updated_since.return_value = scenes[2:]
+    fake_client.get_unorganized_scene_ids.return_value = {"1", "2", "3"}
+
+    original_from_row = StashSQLiteReader._scene_from_row
+
+    def fail_after_first_scene(reader, row):
+        if str(row[0]) != "1":
+            raise sqlite3.OperationalError("disk I/O error")
+        return original_from_row(reader, row)
+
+    with patch.object(yansa, "StashClient", return_value=fake_client), \
+            patch.object(StashSQLiteReader, "_scene_from_row", fail_after_first_scene), \
+            patch.object(yansa.StashYansaPlugin, "_log_warning") as warn:
+        full = yansa.StashYansaPlugin({"args": {**args, "mode": "report"}}).main()["output"]
+        incremental = yansa.StashYansaPlugin({"args": {**args, "mode": "incremental"}}).main()["output"]
+
+    assert (full["total_scenes"], full["parsed_rows"]) == (3, 3)
+    assert (incremental["mode"], incremental["total_scenes"], incremental["parsed_rows"]) == ("incremental", 1, 3)
+    messages = [call.args[0] for call in warn.call_args_list]
+    assert sum("Failed to read scenes: disk I/O error" in message for message in messages) == 2
+    assert all("Falling back to GraphQL" in message for message in messages)
+    assert _stored_titles(tmp_path, db_path) == {"1": "One", "2": "Two", "3": "Three"}
@@ -94,3 +94,26 @@ def test_metadata_to_update_never_overwrites_when_original_provided():
     assert "code" not in update
     assert "organized" not in update
 
+
+
+def test_compare_metadata_scores_diffs_and_zeroes_conflicts():
+    transformer = SceneTransformer()
+    original = Scene(
+        id="1",
+        title="Weekend Trip Part 1",
+        date=None,
+        code="AD-1234",
+        studio=None,
+        files=[],
+        performers=[],
+        tags=[],
+        organized=False,
+    )
+    parsed = ParsedMetadata(title="Weekend Trip Part 2", studio_code="SC-0099")
+
+    comparison = transformer.compare_metadata(parsed, original)
+
+    assert comparison["title"]["status"] == "minor_diff"
+    assert comparison["title"]["similarity"] == 1 - 1 / 19
+    assert comparison["studio_code"]["status"] == "conflict"
+    assert comparison["studio_code"]["similarity"] == 0.0
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared bit-parallel similarity helpers.
+"""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from modules.similarity import levenshtein_distance, normalized_similarity
+from tools.benchmark_similarity import make_title_pairs, matrix_similarity, run_benchmark
+
+
+@pytest.mark.parametrize(
+    ("str1", "str2", "expected"),
+    [
+        ("", "", 0),
+        ("", "abc", 3),
+        ("kitten", "sitting", 3),
+        ("flaw", "lawn", 2),
+        ("sean cody", "seancody", 1),
+        ("ünïcödé", "unicode", 4),
+    ],
+)
+def test_levenshtein_distance_known_values(str1, str2, expected):
+    assert levenshtein_distance(str1, str2) == expected
+    assert levenshtein_distance(str2, str1) == expected
+
+
+def test_similarity_matches_matrix_reference_on_random_strings():
+    rng = random.Random(7)
+    for _ in range(2000):
+        str1 = "".join(rng.choice("ab c") for _ in range(rng.randint(0, 80)))
+        str2 = "".join(rng.choice("ab c") for _ in range(rng.randint(0, 80)))
+        assert normalized_similarity(str1, str2) == pytest.approx(matrix_similarity(str1, str2))
+
+
+def test_score_cutoff_returns_exact_score_or_zero():
+    rng = random.Random(11)
+    for _ in range(2000):
+        str1 = "".join(rng.choice("abc") for _ in range(rng.randint(1, 30)))
+        str2 = "".join(rng.choice("abc") for _ in range(rng.randint(1, 30)))
+        exact = matrix_similarity(str1, str2)
+        for cutoff in (0.5, 0.8, 0.9):
+            expected = exact if exact >= cutoff else 0.0
+            assert normalized_similarity(str1, str2, score_cutoff=cutoff) == pytest.approx(expected)
+
+    # Early exit on an obvious length mismatch.
+    assert levenshtein_distance("a", "a" * 50, max_distance=3) == 4
+
+
+def test_benchmark_times_every_implementation():
+    # Speed comparisons live in tools/benchmark_similarity.py; wall-clock
+    # ordering is not asserted here because it is unreliable on loaded machines.
+    pairs = make_title_pairs(3, length=200)
+    results = run_benchmark(pairs, cutoff=0.9)
+
+    assert set(results) == {"matrix", "bit_parallel", "bit_parallel_cutoff"}
+    assert all(seconds > 0 for seconds in results.values())
+    assert all(normalized_similarity(a, b) == pytest.approx(matrix_similarity(a, b)) for a, b in pairs)
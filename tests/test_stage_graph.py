@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Tests for the configurable parser stage graph.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from modules.stage_graph import DEFAULT_STAGES, EarlyExit, Stage, StageGraph, StageProfiler, result_has_field
+from yansa import FilenameParser
+
+FILENAMES = [
+    "[Active Duty] Performer One & Performer Two - Scene Title (2021-05-04) 1080p.mp4",
+    "Studio Name - Scene Title Part 2.mp4",
+    "2020-01-01 Some Title.mp4",
+]
+
+
+def _performer_tokens(result):
+    return [token.value for token in result.tokens or [] if token.type == "performers"]
+
+
+def test_default_graph_runs_every_stage_in_order():
+    parser = FilenameParser()
+    assert parser.stage_graph.stage_names == [stage.name for stage in DEFAULT_STAGES]
+    assert parser.stage_graph.enabled_stages == [stage for stage in DEFAULT_STAGES if not stage.optional]
+
+    calls = []
+    for method in (
+        "extract_dates",
+        "match_studios",
+        "match_studios_dash_fallback",
+        "match_studios_partial_fallback",
+        "apply_existing_studio",
+        "find_studio_codes",
+        "match_performers",
+        "finalize_structure",
+    ):
+        original = getattr(parser, method)
+        setattr(parser, method, lambda *args, _m=method, _o=original: calls.append(_m) or _o(*args))
+
+    parser.parse(FILENAMES[0])
+    assert calls == [
+        "extract_dates",
+        "match_studios",
+        "match_studios_dash_fallback",
+        "match_studios_partial_fallback",
+        "apply_existing_studio",
+        "find_studio_codes",
+        "match_performers",
+        "finalize_structure",
+    ]
+
+
+def test_disabled_stage_is_skipped():
+    default = FilenameParser()
+    parser = FilenameParser(pipeline={"disabled_stages": ["performers"]})
+
+    assert _performer_tokens(default.parse(FILENAMES[0]))
+    with patch.object(parser, "match_performers") as match_performers:
+        result = parser.parse(FILENAMES[0])
+    match_performers.assert_not_called()
+    assert not _performer_tokens(result)
+
+
+def test_early_exit_stops_once_fields_are_known():
+    parser = FilenameParser(
+        pipeline={"early_exit": [{"after": "studios", "when": ["studio", "date"]}]},
+    )
+    with patch.object(parser, "finalize_structure") as finalize:
+        result = parser.parse(FILENAMES[0])
+        finalize.assert_not_called()
+        assert result.studio
+        assert result_has_field(result, "date")
+
+        # No studio in this name, so the rule does not fire and every stage runs.
+        parser.parse(FILENAMES[2])
+        finalize.assert_called_once()
+
+
+def test_existing_studio_stage_uses_context():
+    parser = FilenameParser()
+    assert parser.parse("Some Title.mp4", existing_studio="Known Studio").studio == "Known Studio"
+
+    parser.configure_pipeline({"disabled_stages": ["existing_studio"]})
+    assert parser.parse("Some Title.mp4", existing_studio="Known Studio").studio != "Known Studio"
+
+
+def test_profiler_reports_time_saved_by_skipped_stages():
+    parser = FilenameParser(
+        pipeline={
+            "disabled_stages": ["studios_partial_fallback"],
+            "early_exit": [{"after": "studio_codes", "when": "studio"}],
+            "profile": True,
+            "profile_sample_every": 1,
+        },
+    )
+    exited = sum(1 for filename in FILENAMES if parser.parse(filename).studio)
+
+    profiler = parser.stage_graph.profiler
+    assert isinstance(profiler, StageProfiler)
+    assert profiler.parses == 3
+    assert profiler.runs["dates"] == 3
+    assert "studios_partial_fallback" not in profiler.runs
+    assert profiler.skips["studios_partial_fallback"] == 3
+    assert exited >= 1
+    assert profiler.skips["performers"] == profiler.skips["final_structure"] == exited
+    saved = profiler.saved_seconds()
+    assert saved["studios_partial_fallback"] is not None and saved["studios_partial_fallback"] > 0
+    summary = profiler.summary()
+    assert "studios_partial_fallback: 0 runs" in summary
+    assert "estimated time saved by skipped stages" in summary
+
+
+def test_profiled_run_matches_unprofiled_output():
+    plain = FilenameParser(pipeline={"disabled_stages": ["performers"]})
+    profiled = FilenameParser(
+        pipeline={"disabled_stages": ["performers"], "profile": True, "profile_sample_every": 1},
+    )
+    for filename in FILENAMES:
+        assert profiled.parse(filename).to_json() == plain.parse(filename).to_json()
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {"disabled_stages": ["no_such_stage"]},
+        {"enabled_stages": ["no_such_stage"]},
+        {"early_exit": [{"after": "studios_fuzzy_fallback", "when": ["studio"]}]},
+        {"early_exit": [{"after": "no_such_stage", "when": ["studio"]}]},
+        {"early_exit": [{"after": "studios", "when": ["no_such_field"]}]},
+        {"early_exit": [{"after": "dates", "when": ["title"]}]},
+        {"early_exit": [{"after": "performers", "when": ["studio"]}], "disabled_stages": ["performers"]},
+        {"early_exit": [{"when": ["studio"]}]},
+    ],
+)
+def test_invalid_config_is_rejected(config):
+    with pytest.raises(ValueError):
+        StageGraph.from_config(config)
+
+
+def test_stage_inputs_must_be_produced_upstream():
+    needs_title = Stage(
+        name="title_user",
+        run=lambda parser, result, context: result,
+        inputs=("title",),
+        outputs=(),
+    )
+    StageGraph(stages=[*DEFAULT_STAGES, needs_title])
+    with pytest.raises(ValueError, match="title_user"):
+        StageGraph(stages=[*DEFAULT_STAGES, needs_title], disabled=["final_structure"])
+    with pytest.raises(ValueError):
+        StageGraph(stages=[needs_title, *DEFAULT_STAGES])
+
+    assert EarlyExit(after="studios", when=("studio",)).after == "studios"
+
+
+def test_plugin_applies_pipeline_config(tmp_path):
+    import yansa
+
+    fake_client = MagicMock()
+    fake_client.get_all_studios.return_value = None
+    fake_client.url = "http://localhost:9999/graphql"
+    base_args = {"studio_cache": False, "state_path": str(tmp_path / "state.sqlite3"), "report_dir": str(tmp_path)}
+
+    with patch.object(yansa, "StashClient", return_value=fake_client):
+        plugin = yansa.StashYansaPlugin(
+            {"args": {**base_args, "config": {"pipeline": {"disabled_stages": ["performers"], "profile": True}}}}
+        )
+        assert plugin.filename_parser.stage_graph.disabled == {"performers"}
+        assert plugin.filename_parser.stage_graph.profiler is not None
+
+        with patch.object(yansa.StashYansaPlugin, "_log_warning") as warn:
+            plugin = yansa.StashYansaPlugin(
+                {"args": {**base_args, "config": {"pipeline": {"disabled_stages": ["bogus"]}}}}
+            )
+        assert not plugin.filename_parser.stage_graph.disabled
+        assert "Invalid pipeline config" in warn.call_args.args[0]
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for import-time (cold start) behavior of yansa and the modules package.
+
+Each check runs in a fresh interpreter so modules imported by other tests do
+not hide eager imports.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("openpyxl", "stashapi.stashapp", "requests", "pyarrow", "numpy")
+
+
+def _run(code: str) -> str:
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return completed.stdout.strip()
+
+
+def _loaded_after(statement: str) -> list:
+    code = (
+        "import json, sys\n"
+        f"{statement}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    return json.loads(_run(code))
+
+
+def test_library_import_skips_heavy_dependencies():
+    assert _loaded_after("from yansa import FilenameParser") == []
+    assert _loaded_after("from yansa import FilenameParser; FilenameParser().parse('Studio - Title.mp4')") == []
+
+
+def test_modules_package_loads_submodules_on_demand():
+    code = (
+        "import sys\n"
+        "import modules.report_sinks\n"
+        "print('modules.tokenizer' in sys.modules, 'modules.studio_matcher' in sys.modules)\n"
+        "from modules import StudioMatcher\n"
+        "print('modules.studio_matcher' in sys.modules, StudioMatcher.__module__)"
+    )
+    assert _run(code).splitlines() == ["False False", "True modules.studio_matcher"]
+
+
+def test_plugin_names_resolve_lazily():
+    code = (
+        "import sys, yansa\n"
+        "print('modules.stash_client' in sys.modules)\n"
+        "print(yansa.StashClient.__module__, yansa.STASH_MODULES_AVAILABLE)\n"
+        "import modules.stash_client as stash_client\n"
+        "print('stashapi.stashapp' in sys.modules, stash_client.StashInterface.__module__)"
+    )
+    assert _run(code).splitlines() == [
+        "False",
+        "modules.stash_client True",
+        "False stashapi.stashapp",
+    ]
+
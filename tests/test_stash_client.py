@@ -7,6 +7,8 @@ from __future__ import annotations
 
 from unittest.mock import patch
 
+import pytest
+
 from modules.stash_client import StashClient
 
 
@@ -49,3 +51,109 @@ def test_call_graphql_delegates_to_stash_interface():
         data = client.call_graphql("query { ping }")
         assert data == {"findScenes": {"count": 0}}
         assert client.stash.calls == [("query { ping }", {})]
+
+
+def test_report_projection_trims_fields_and_records_telemetry():
+    full_scene = {
+        "id": "1",
+        "title": "Scene",
+        "updated_at": "2024-01-01T00:00:00Z",
+        "studio": {"id": "5", "name": "Studio"},
+        "files": [
+            {"id": "10", "path": "/media/a/one.mp4", "basename": "one.mp4", "parent_folder": {"path": "/media/a"}},
+            {"id": "11", "path": "/media/b/two.mp4", "basename": "two.mp4", "parent_folder": {"path": "/media/b"}},
+        ],
+        "performers": [],
+    }
+    report_scene = {
+        **full_scene,
+        "files": [{k: v for k, v in f.items() if k != "parent_folder"} for f in full_scene["files"]],
+    }
+
+    class FakeStashInterface:
+        def __init__(self, conn):
+            self.conn = conn
+            self.fragments = []
+
+        def find_scenes(self, f=None, filter=None, fragment=None, get_count=False):
+            self.fragments.append(fragment)
+            scenes = [full_scene if "parent_folder" in fragment else report_scene]
+            if filter["page"] > 1:
+                scenes = []
+            return 1, scenes
+
+    with patch("modules.stash_client.StashInterface", FakeStashInterface):
+        client = StashClient({"Scheme": "http", "Port": 9999})
+        client.set_scene_projection("report", primary_file_only=True)
+        client.get_all_unorganized_scenes()
+        # The full-projection baseline sample is opt-in.
+        assert len(client.stash.fragments) == 1
+        assert client.last_fetch_telemetry.baseline_scenes == 0
+
+        client.stash.fragments.clear()
+        client.measure_projection_savings = True
+        scenes = client.get_all_unorganized_scenes()
+
+    assert [f.basename for f in scenes[0].files] == ["one.mp4"]
+    assert "parent_folder" not in client.stash.fragments[0]
+    # Page 1 is sampled once more with the full projection for the savings estimate.
+    assert "parent_folder" in client.stash.fragments[1]
+
+    telemetry = client.last_fetch_telemetry
+    assert telemetry.profile == "report"
+    assert telemetry.scenes == 1
+    assert 0 < telemetry.payload_bytes < telemetry.baseline_bytes
+    assert telemetry.bytes_saved_per_page > 0
+    assert "projection=report" in telemetry.summary()
+
+
+def test_set_scene_projection_rejects_unknown_profile():
+    class FakeStashInterface:
+        def __init__(self, conn):
+            self.conn = conn
+
+    with patch("modules.stash_client.StashInterface", FakeStashInterface):
+        client = StashClient({"Scheme": "http", "Port": 9999})
+
+    with pytest.raises(ValueError):
+        client.set_scene_projection("everything")
+    assert client.scene_projection == "full"
+
+
+def test_updated_since_query_includes_the_watermark_second():
+    class FakeStashInterface:
+        def __init__(self, conn):
+            self.filters = []
+
+        def find_scenes(self, f=None, filter=None, fragment=None, get_count=False):
+            self.filters.append(f)
+            return 0, []
+
+    with patch("modules.stash_client.StashInterface", FakeStashInterface):
+        client = StashClient({"Scheme": "http", "Port": 9999})
+        for since in ("2024-01-01T00:00:00Z", "2024-03-01T12:00:00+02:00", "2024-01-01 00:00:00", "yesterday"):
+            client.find_scenes_updated_since(since)
+
+    assert [f["updated_at"]["value"] for f in client.stash.filters] == [
+        "2023-12-31T23:59:59Z",
+        "2024-03-01T11:59:59+02:00",
+        "2023-12-31 23:59:59",
+        "yesterday",
+    ]
+    assert {f["updated_at"]["modifier"] for f in client.stash.filters} == {"GREATER_THAN"}
+
+
+def test_studios_updated_since_query_includes_the_watermark_second():
+    class FakeStashInterface:
+        def __init__(self, conn):
+            self.filters = []
+
+        def find_studios(self, f=None, filter=None, fragment=None, get_count=False):
+            self.filters.append(f)
+            return 0, []
+
+    with patch("modules.stash_client.StashInterface", FakeStashInterface):
+        client = StashClient({"Scheme": "http", "Port": 9999})
+        client.get_studios_updated_since("2024-01-01T00:00:00Z")
+
+    assert client.stash.filters == [{"updated_at": {"value": "2023-12-31T23:59:59Z", "modifier": "GREATER_THAN"}}]
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for the read-only Stash SQLite reader.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from modules.stash_sqlite import StashDatabaseError, StashSQLiteReader
+
+
+# Minimal subset of the Stash schema used by the reader.
+STASH_SCHEMA = """
+CREATE TABLE studios (id INTEGER PRIMARY KEY, name TEXT NOT NULL, updated_at DATETIME);
+CREATE TABLE performers (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE folders (id INTEGER PRIMARY KEY, path TEXT NOT NULL);
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    basename TEXT NOT NULL,
+    parent_folder_id INTEGER NOT NULL REFERENCES folders(id),
+    updated_at DATETIME
+);
+CREATE TABLE scenes (
+    id INTEGER PRIMARY KEY,
+    title TEXT,
+    code TEXT,
+    date DATE,
+    studio_id INTEGER REFERENCES studios(id),
+    organized BOOLEAN NOT NULL DEFAULT 0,
+    updated_at DATETIME
+);
+CREATE TABLE scenes_files (
+    scene_id INTEGER NOT NULL,
+    file_id INTEGER NOT NULL,
+    "primary" BOOLEAN NOT NULL,
+    PRIMARY KEY (scene_id, file_id)
+);
+CREATE TABLE performers_scenes (performer_id INTEGER NOT NULL, scene_id INTEGER NOT NULL);
+"""
+
+
+@pytest.fixture
+def stash_db(tmp_path):
+    """Create a small WAL-mode Stash database fixture."""
+    path = tmp_path / "stash-go.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(STASH_SCHEMA)
+    conn.executemany("INSERT INTO studios (id, name) VALUES (?, ?)", [(1, "Active Duty"), (2, "Sean Cody")])
+    conn.executemany("INSERT INTO performers (id, name) VALUES (?, ?)", [(1, "Alpha"), (2, "Bravo")])
+    conn.executemany("INSERT INTO folders (id, path) VALUES (?, ?)", [(1, "/media/a"), (2, "/media/b")])
+    conn.executemany(
+        "INSERT INTO files (id, basename, parent_folder_id) VALUES (?, ?, ?)",
+        [
+            (1, "Active Duty - First.mp4", 1),
+            (2, "First (copy).mp4", 2),
+            (3, "Second.mp4", 1),
+            (4, "Organized.mp4", 1),
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO scenes (id, title, code, date, studio_id, organized) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (10, "A Scene", "AD-1", "2024-01-15", 1, 0),
+            (11, None, None, None, None, 0),
+            (12, "Done", None, None, 2, 1),
+        ],
+    )
+    conn.executemany(
+        'INSERT INTO scenes_files (scene_id, file_id, "primary") VALUES (?, ?, ?)',
+        [(10, 2, 0), (10, 1, 1), (11, 3, 1), (12, 4, 1)],
+    )
+    conn.executemany(
+        "INSERT INTO performers_scenes (performer_id, scene_id) VALUES (?, ?)",
+        [(1, 10), (2, 10), (1, 12)],
+    )
+    conn.commit()
+    yield path
+    conn.close()
+
+
+def test_reader_streams_unorganized_scenes_grouped_by_scene(stash_db):
+    reader = StashSQLiteReader(stash_db)
+
+    scenes = reader.get_all_unorganized_scenes()
+
+    assert [scene.id for scene in scenes] == ["11", "10"]
+    scene = scenes[1]
+    assert scene.title == "A Scene"
+    assert scene.code == "AD-1"
+    assert scene.date == "2024-01-15"
+    assert scene.studio is not None and scene.studio.name == "Active Duty"
+    assert scene.organized is False
+    # Primary file first, no duplicates from the performer join.
+    assert [f.basename for f in scene.files] == ["Active Duty - First.mp4", "First (copy).mp4"]
+    assert scene.files[0].path == "/media/a/Active Duty - First.mp4"
+    assert scene.files[0].parent_folder_path == "/media/a"
+    assert [p.name for p in scene.performers] == ["Alpha", "Bravo"]
+
+    assert scenes[0].studio is None
+    assert scenes[0].performers == []
+
+
+def test_reader_respects_limit_and_reports_progress(stash_db):
+    reader = StashSQLiteReader(stash_db)
+    progress = []
+
+    scenes = list(reader.iter_unorganized_scenes(progress_callback=lambda c, t: progress.append((c, t)), limit=1))
+
+    assert len(scenes) == 1
+    assert progress == [(1, 1)]
+    assert reader.count_unorganized_scenes() == 2
+
+
+def test_reader_connection_is_read_only(stash_db):
+    reader = StashSQLiteReader(stash_db)
+    conn = reader.connect()
+    try:
+        with pytest.raises(sqlite3.Error):
+            conn.execute("UPDATE scenes SET title = 'x'")
+    finally:
+        conn.close()
+
+
+def test_reader_rejects_missing_or_incompatible_database(tmp_path):
+    with pytest.raises(StashDatabaseError):
+        StashSQLiteReader(tmp_path / "missing.sqlite").validate_schema()
+
+    other = tmp_path / "other.sqlite"
+    sqlite3.connect(other).close()
+    with pytest.raises(StashDatabaseError):
+        StashSQLiteReader(other).validate_schema()
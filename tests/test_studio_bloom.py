@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the studio Bloom filter and the prefiltered studio fallbacks.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import string
+
+from modules import StudioMatcher
+from modules.studio_bloom import StudioBloomFilter, key_set_digest
+
+
+def _random_words(rng, count):
+    return {"".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 12))) for _ in range(count)}
+
+
+def test_members_always_test_positive_and_false_positives_stay_near_target():
+    rng = random.Random(5)
+    members = _random_words(rng, 5000)
+    bloom = StudioBloomFilter.from_items(members, false_positive_rate=0.01)
+
+    assert len(bloom) == len(members)
+    assert all(member in bloom for member in members)
+    others = _random_words(rng, 20000) - members
+    measured = sum(1 for other in others if other in bloom) / len(others)
+    assert measured < 0.02
+    assert abs(bloom.false_positive_rate() - 0.01) < 0.005
+    assert bloom.nbytes < 8 * 1024
+
+
+def test_round_trip_through_json():
+    bloom = StudioBloomFilter.from_items(["helix studios", "sean cody"])
+    restored = StudioBloomFilter.from_dict(json.loads(json.dumps(bloom.to_dict())))
+
+    assert restored.bits == bloom.bits
+    assert restored.key_digest == bloom.key_digest == key_set_digest(["sean cody", "helix studios"])
+    assert (restored.num_bits, restored.num_hashes, len(restored)) == (bloom.num_bits, bloom.num_hashes, 2)
+    assert "sean cody" in restored
+    assert StudioBloomFilter.from_dict({"version": 0}) is None
+    assert StudioBloomFilter.from_dict({**bloom.to_dict(), "bits": "not base64!"}) is None
+    assert StudioBloomFilter.from_dict({**bloom.to_dict(), "num_bits": 8}) is None
+
+
+def test_matcher_index_persists_the_prefilter():
+    matcher = StudioMatcher(studio_index={"studios": {"sean cody": "Sean Cody", "bang bros": "Bang Bros"}})
+    index = json.loads(json.dumps(matcher.to_index()))
+    restored = StudioMatcher(studio_index=index)
+    assert restored.prefilter.bits == matcher.prefilter.bits
+    assert restored.prefilter.key_digest == matcher.prefilter.key_digest
+
+    # A filter built for other keys is not reused, even with the same key count.
+    del index["studios"]["bang bros"]
+    index["studios"]["helix studios"] = "Helix Studios"
+    rebuilt = StudioMatcher(studio_index=index)
+    assert "helix studios" in rebuilt.prefilter
+    assert rebuilt._prefiltered_lookup("Helix Studios") == rebuilt.lookup("Helix Studios") == "Helix Studios"
+
+    # Filters persisted without a key digest are rebuilt too.
+    del index["prefilter"]["key_digest"]
+    assert StudioMatcher(studio_index=index).prefilter.key_digest is not None
+
+
+def _scan_all_keys(matcher, token_lower):
+    """The partial fallback's original scan over every studio key."""
+    longest = None
+    for key, canonical_name in matcher.studios.items():
+        if len(key) < 3 or key in matcher.exact_only_keys:
+            continue
+        pos = token_lower.find(key)
+        if pos != -1 and (longest is None or len(key) > longest[2] - longest[1]):
+            longest = (canonical_name, pos, pos + len(key))
+    return longest
+
+
+def test_substring_enumeration_matches_scanning_every_key():
+    rng = random.Random(11)
+    keys = ["".join(rng.choice("abcd ") for _ in range(rng.randint(2, 7))).strip() for _ in range(400)]
+    studios = {key: key.upper() for key in keys if key}
+    matcher = StudioMatcher(studio_index={
+        "studios": studios,
+        "exact_only_keys": rng.sample(sorted(studios), 20),
+    })
+
+    for _ in range(2000):
+        token = "".join(rng.choice("abcd x") for _ in range(rng.randint(0, 25)))
+        assert matcher._longest_substring_match(token) == _scan_all_keys(matcher, token)
+
+
+def test_prefiltered_lookup_agrees_with_lookup():
+    matcher = StudioMatcher(studio_index={"studios": {"sean cody": "Sean Cody", "bang": "Bang"}})
+    for text in ["Sean Cody", "Sean.Cody", "SEANCODY", "Bang", "Bangkok", "Scene", ""]:
+        assert matcher._prefiltered_lookup(text) == matcher.lookup(text)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the persisted Stash studio snapshot.
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+from modules.stash_client import SceneStudio
+from modules.studio_cache import StudioSnapshotCache
+from modules.studio_matcher import StudioMatcher
+
+
+class FakeStudioClient:
+    """Minimal StashClient stand-in recording which studio fetches happen."""
+
+    def __init__(self, studios: List[SceneStudio]):
+        self.studios = list(studios)
+        self.calls: List[str] = []
+
+    def get_studio_snapshot_key(self):
+        self.calls.append("key")
+        latest = max((s.updated_at for s in self.studios if s.updated_at), default=None)
+        return len(self.studios), latest
+
+    def get_studios_updated_since(self, since):
+        self.calls.append(f"delta:{since}")
+        return [s for s in self.studios if s.updated_at and s.updated_at >= since]
+
+    def get_all_studios(self):
+        self.calls.append("full")
+        return list(self.studios)
+
+
+def _build_index(studios):
+    return StudioMatcher(stash_studios=studios).to_index()
+
+
+def test_snapshot_is_reused_when_studios_unchanged(tmp_path):
+    client = FakeStudioClient(
+        [
+            SceneStudio(id="1", name="Active Duty", aliases=["AD"], updated_at="2024-01-01T00:00:00Z"),
+            SceneStudio(id="2", name="Sean Cody", updated_at="2024-01-02T00:00:00Z"),
+        ]
+    )
+    cache = StudioSnapshotCache(tmp_path / "studios.json", instance="http://stash")
+
+    first = cache.refresh(client, _build_index)
+    second = cache.refresh(client, _build_index)
+
+    assert first.source == "full"
+    assert second.source == "cache"
+    assert client.calls == ["key", "full", "key", "delta:2024-01-02T00:00:00Z"]
+    assert second.index["studios"]["ad"] == "Active Duty"
+
+    matcher = StudioMatcher(studio_index=second.index)
+    assert matcher.studios == StudioMatcher(stash_studios=client.studios).studios
+
+
+def test_snapshot_refreshes_only_the_delta(tmp_path):
+    client = FakeStudioClient([SceneStudio(id="1", name="Active Duty", updated_at="2024-01-01T00:00:00Z")])
+    cache = StudioSnapshotCache(tmp_path / "studios.json", instance="http://stash")
+    cache.refresh(client, _build_index)
+
+    client.studios[0] = SceneStudio(id="1", name="Active Duty", aliases=["ADX"], updated_at="2024-02-01T00:00:00Z")
+    client.studios.append(SceneStudio(id="2", name="Helix Studios", updated_at="2024-02-02T00:00:00Z"))
+    client.calls.clear()
+
+    snapshot = cache.refresh(client, _build_index)
+
+    assert snapshot.source == "delta"
+    assert client.calls == ["key", "delta:2024-01-01T00:00:00Z"]
+    assert snapshot.max_updated_at == "2024-02-02T00:00:00Z"
+    assert snapshot.index["studios"]["adx"] == "Active Duty"
+    assert snapshot.index["studios"]["helix studios"] == "Helix Studios"
+
+
+def test_snapshot_picks_up_edits_in_the_watermark_second(tmp_path):
+    client = FakeStudioClient(
+        [
+            SceneStudio(id="1", name="Active Duty", updated_at="2024-01-01T00:00:00Z"),
+            SceneStudio(id="2", name="Sean Cody", updated_at="2024-01-02T00:00:00Z"),
+        ]
+    )
+    cache = StudioSnapshotCache(tmp_path / "studios.json", instance="http://stash")
+    cache.refresh(client, _build_index)
+
+    # Same second as the watermark: count and latest updated_at are unchanged.
+    client.studios[1] = SceneStudio(id="2", name="Sean Cody", aliases=["SC"], updated_at="2024-01-02T00:00:00Z")
+
+    snapshot = cache.refresh(client, _build_index)
+
+    assert snapshot.source == "delta"
+    assert snapshot.index["studios"]["sc"] == "Sean Cody"
+    assert cache.refresh(client, _build_index).source == "cache"
+
+
+def test_snapshot_refetches_everything_after_deletions(tmp_path):
+    client = FakeStudioClient(
+        [
+            SceneStudio(id="1", name="Active Duty", updated_at="2024-01-01T00:00:00Z"),
+            SceneStudio(id="2", name="Sean Cody", updated_at="2024-01-01T00:00:00Z"),
+        ]
+    )
+    cache = StudioSnapshotCache(tmp_path / "studios.json", instance="http://stash")
+    cache.refresh(client, _build_index)
+
+    client.studios.pop()
+    client.studios.append(SceneStudio(id="3", name="Helix Studios", updated_at="2024-03-01T00:00:00Z"))
+    client.studios.append(SceneStudio(id="4", name="Bel Ami", updated_at="2024-03-01T00:00:00Z"))
+    client.studios.pop(0)
+
+    snapshot = cache.refresh(client, _build_index)
+
+    assert snapshot.source == "full"
+    assert "sean cody" not in snapshot.index["studios"]
+    assert {s.id for s in snapshot.studios} == {"3", "4"}
+
+
+def test_snapshot_for_other_instance_is_ignored(tmp_path):
+    client = FakeStudioClient([SceneStudio(id="1", name="Active Duty", updated_at="2024-01-01T00:00:00Z")])
+    StudioSnapshotCache(tmp_path / "studios.json", instance="http://a").refresh(client, _build_index)
+
+    assert StudioSnapshotCache(tmp_path / "studios.json", instance="http://b").load() is None
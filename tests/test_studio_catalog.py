@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the scraped studio catalogs and the optional catalog stage.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from modules.studio_catalog import DEFAULT_CATALOG_PATH, CatalogEntry, StudioCatalog, parse_catalog_date
+from yansa import FilenameParser
+
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    """A small catalog database with the same layout as ref/scraped_data.sqlite3."""
+    path = tmp_path / "scraped.sqlite3"
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE studios_scraped (id INTEGER PRIMARY KEY, studio_name TEXT, website TEXT, scrape_date TEXT);
+        INSERT INTO studios_scraped VALUES (1, 'Family Creep', 'familycreep.com', '2025-10-19'),
+                                           (2, 'Let Them Watch', 'letthemwatch.com', '2025-10-15'),
+                                           (3, 'Raw Fuck', 'rawfuck.com', '2025-10-18');
+        CREATE TABLE family_creep (code INTEGER PRIMARY KEY, title TEXT, url TEXT, performer_array TEXT);
+        INSERT INTO family_creep VALUES (182088, 'STEPFATHER DEMANDS!', 'https://example.com/182088', '[]'),
+                                        (196763, 'Hey Cous, I Need A Job', 'https://example.com/196763', '[]');
+        CREATE TABLE let_them_watch (id INTEGER PRIMARY KEY, title TEXT, url TEXT, date TEXT);
+        INSERT INTO let_them_watch VALUES (1, 'Muscle Bubble Tag Team', 'https://example.com/1', '11-Jul-22'),
+                                          (2, 'Muscle Bubble Tag Team', 'https://example.com/2', '10-May-21'),
+                                          (3, 'Champ Returns', 'https://example.com/3', '28-Dec-24');
+        CREATE TABLE raw_fuck (code INTEGER PRIMARY KEY, title TEXT, url TEXT);
+        INSERT INTO raw_fuck VALUES (35062, 'Timothy Nixon Busts It Out Of The Cup', 'https://example.com/35062');
+    """)
+    connection.commit()
+    connection.close()
+    return path
+
+
+def _parser(catalog_path):
+    return FilenameParser(pipeline={"enabled_stages": ["catalog"], "catalog_path": str(catalog_path)})
+
+
+def test_parse_catalog_date():
+    assert parse_catalog_date("6-Sep-21") == "2021-09-06"
+    assert parse_catalog_date("2024-12-28") == "2024-12-28"
+    assert parse_catalog_date("someday") is None
+    assert parse_catalog_date(None) is None
+
+
+def test_load_indexes_titles_and_codes(catalog_path):
+    catalog = StudioCatalog.from_sqlite(catalog_path)
+
+    assert len(catalog) == 6
+    assert catalog.by_title("FamilyCreep", "Stepfather Demands") == CatalogEntry(
+        studio="Family Creep", title="STEPFATHER DEMANDS!", code="182088", url="https://example.com/182088"
+    )
+    assert catalog.by_code("Family Creep", "196763").title == "Hey Cous, I Need A Job"
+    assert catalog.by_title("Let Them Watch", "Champ Returns").date == "2024-12-28"
+    # Shared titles need the date to pick a scene.
+    assert catalog.by_title("Let Them Watch", "Muscle Bubble Tag Team") is None
+    assert catalog.by_title("Let Them Watch", "Muscle Bubble Tag Team", "2021-05-10").url == "https://example.com/2"
+    assert len(StudioCatalog.from_sqlite(catalog_path.parent / "missing.sqlite3")) == 0
+
+
+def test_catalog_stage_is_opt_in(catalog_path):
+    filename = "[Family Creep] Stepfather Demands! - Dale Savage & Jay Seabrook (1080p).mp4"
+    assert FilenameParser().studio_catalog is None
+    assert FilenameParser().parse(filename).studio_code is None
+
+    result = _parser(catalog_path).parse(filename)
+    assert (result.title, result.studio_code) == ("Stepfather Demands!", "182088")
+    assert result.sources == {"title": "catalog", "studio_code": "catalog"}
+    assert result.confidences["studio_code"] == 1.0
+
+
+def test_catalog_fills_date_and_keeps_conflicting_values(catalog_path):
+    parser = _parser(catalog_path)
+
+    result = parser.parse("Let Them Watch - Champ Returns.mp4")
+    assert (result.title, result.date) == ("Champ Returns", "2024-12-28")
+
+    result = parser.parse("Let Them Watch - Champ Returns 2020-01-01.mp4")
+    assert result.date is None  # Parsed date token disagrees; nothing is filled
+    assert result.sources == {"title": "catalog"}
+
+
+def test_code_in_title_is_split_off(catalog_path):
+    result = _parser(catalog_path).parse("RawFuck 35062 Timothy Nixon Busts It Out Of The Cup.mp4")
+    assert (result.title, result.studio_code) == ("Timothy Nixon Busts It Out Of The Cup", "35062")
+
+    # A number that is some other scene's code is not taken as this scene's code.
+    result = _parser(catalog_path).parse("RawFuck 35062 Something Else.mp4")
+    assert result.studio_code is None and not result.sources
+
+
+def test_unknown_studio_is_left_alone(catalog_path):
+    filename = "Helix Studios - Champ Returns.mp4"
+    assert _parser(catalog_path).parse(filename).to_json() == FilenameParser().parse(filename).to_json()
+
+
+@pytest.mark.skipif(not DEFAULT_CATALOG_PATH.exists(), reason="reference catalog not available")
+def test_reference_catalog_loads_every_studio():
+    catalog = StudioCatalog.from_sqlite()
+    for studio in ("Family Creep", "Raw Fuck", "Let Them Watch", "Treasure Island Media"):
+        assert catalog.has_studio(studio)
+    assert catalog.by_code("RawFuck", "35062").title == "Timothy Nixon Busts It Out Of The Cup"
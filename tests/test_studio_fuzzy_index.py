@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the trigram fuzzy studio index and the optional fuzzy fallback stage.
+"""
+
+from __future__ import annotations
+
+import random
+import string
+
+import pytest
+
+from modules.studio_fuzzy_index import StudioFuzzyIndex, bounded_edit_distance, normalize_key
+from yansa import FilenameParser
+
+FUZZY = {"enabled_stages": ["studios_fuzzy_fallback"]}
+
+
+def _levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j - 1] + (char_a != char_b), current[j - 1] + 1, previous[j] + 1))
+        previous = current
+    return previous[-1]
+
+
+def test_bounded_edit_distance_matches_full_levenshtein():
+    rng = random.Random(7)
+    for _ in range(3000):
+        a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 8)))
+        b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 8)))
+        limit = rng.randint(0, 3)
+        distance = _levenshtein(a, b)
+        assert bounded_edit_distance(a, b, limit) == (distance if distance <= limit else None)
+
+
+def test_lookup_finds_misspelled_and_concatenated_names():
+    index = StudioFuzzyIndex({"corbin fisher": "Corbin Fisher", "active duty": "Active Duty", "bang": "Bang"})
+
+    assert normalize_key("Corbin-Fisher") == "corbinfisher"
+    assert index.lookup("Corbin-Fisher").distance == 0
+    match = index.lookup("Corbin Fisherr")
+    assert (match.canonical_name, match.distance) == ("Corbin Fisher", 1)
+    assert index.lookup("ActivDuty").canonical_name == "Active Duty"
+    assert index.lookup("Bangs") is None  # "bang" is below min_length
+    assert index.lookup("Completely Different") is None
+    assert len(index) == 2
+
+
+def test_exact_only_keys_are_not_indexed():
+    index = StudioFuzzyIndex({"helix studios": "Helix Studios"}, exclude={"helix studios"})
+    assert index.lookup("Helix Studois") is None
+
+
+def test_large_index_keeps_candidate_checks_exact():
+    rng = random.Random(1)
+    words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9))) for _ in range(3000)]
+    studios = {}
+    while len(studios) < 10000:
+        key = " ".join(rng.choice(words) for _ in range(rng.randint(1, 3)))
+        studios[key] = key.title()
+    index = StudioFuzzyIndex(studios)
+
+    long_keys = sorted(key for key in studios if len(normalize_key(key)) > index.min_length + 1)
+    for key in rng.sample(long_keys, 50):
+        typo = key[:2] + key[3:]
+        match = index.lookup(typo)
+        assert match is not None
+        assert match.distance <= StudioFuzzyIndex.max_distance(len(normalize_key(typo)))
+
+
+def test_fuzzy_stage_is_opt_in():
+    filename = "ActivDuty Brent Taylor 2024-01-15.mp4"
+    assert FilenameParser().parse(filename).studio is None
+    assert "studios_fuzzy_fallback" in FilenameParser().stage_graph.inactive
+
+    result = FilenameParser(pipeline=FUZZY).parse(filename)
+    assert result.studio == "Active Duty"
+    assert [t.value for t in result.tokens if t.type == "studio"] == ["Active Duty"]
+
+
+@pytest.mark.parametrize(
+    "filename",
+    ["Active Theory - Scene Name.mp4", "Weekend Trip Part 2.mp4", "random clip.avi"],
+)
+def test_fuzzy_stage_leaves_unrelated_names_alone(filename):
+    assert FilenameParser(pipeline=FUZZY).parse(filename).to_json() == FilenameParser().parse(filename).to_json()
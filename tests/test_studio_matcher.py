@@ -209,5 +209,138 @@ def test_multiple_studios_first_only(parser):
         pass
 
 
+def test_fold_studio_key():
+    """Folding strips punctuation, spacing, case and accents."""
+    from modules.studio_matcher import fold_studio_key
+
+    assert fold_studio_key("Sean.Cody") == "seancody"
+    assert fold_studio_key("SEAN_CODY") == "seancody"
+    assert fold_studio_key("Jérôme") == "jerome"
+
+
+@pytest.mark.parametrize("value", ["SeanCody", "Sean.Cody", "Sean_Cody", "SEAN-CODY"])
+def test_folded_key_matches_spelling_variants(value):
+    """Variants of a studio name match through the folded index without aliases."""
+    matcher = StudioMatcher(studio_index={"studios": {"sean cody": "Sean Cody"}})
+    result = TokenizationResult(
+        original=value,
+        cleaned=value,
+        pattern="{token0}",
+        tokens=[Token(value=value, type="text", position=0)],
+    )
+
+    assert matcher.process(result).studio == "Sean Cody"
+
+
+def test_folded_index_skips_exact_only_and_ambiguous_keys():
+    """Exact-only keys and folded collisions between studios are not folded."""
+    matcher = StudioMatcher(studio_index={
+        "studios": {"bang": "Bang", "a.b.c": "ABC Studio", "abc": "Another ABC"},
+        "exact_only_keys": ["bang"],
+    })
+
+    assert matcher.lookup("Bang") == "Bang"
+    assert matcher.lookup("B.A.N.G") is None
+    assert matcher.lookup("abc") == "Another ABC"  # exact probe wins
+    assert matcher.lookup("a_b_c") is None  # folded key is ambiguous
+    assert "abc" not in matcher.folded_studios
+
+
+def test_dash_fallback_uses_folded_index():
+    """Dashed parts are also probed with the folded key."""
+    matcher = StudioMatcher(studio_index={"studios": {"sean cody": "Sean Cody"}})
+    result = TokenizationResult(
+        original="Sean.Cody-Weekend",
+        cleaned="Sean.Cody-Weekend",
+        pattern="{token0}",
+        tokens=[Token(value="Sean.Cody-Weekend", type="text", position=0)],
+    )
+
+    processed = matcher.process_dash_fallback(result)
+    assert processed.studio == "Sean Cody"
+    assert processed.pattern == "{studio}-{token1}"
+
+
+def _single_token(value):
+    return TokenizationResult(
+        original=value,
+        cleaned=value,
+        pattern="{token0}",
+        tokens=[Token(value=value, type="text", position=0)],
+    )
+
+
+def test_word_fallback_finds_longest_name_on_word_boundaries():
+    """The word trie prefers the longest studio name made of whole words."""
+    matcher = StudioMatcher(studio_index={"studios": {
+        "helix": "Helix", "helix studios": "Helix Studios", "bang": "Bang",
+    }})
+
+    processed = matcher.process_word_fallback(_single_token("Helix Studios Twink Scene"))
+    assert processed.studio == "Helix Studios"
+    assert [t.value for t in processed.tokens] == ["Helix Studios", "Twink Scene"]
+    assert matcher.process_word_fallback(_single_token("Helix Studios, Twink")).studio == "Helix Studios"
+    assert matcher.process_word_fallback(_single_token("Helix_Studios_Twink")).studio is None
+
+
+def test_word_fallback_does_not_cut_through_words():
+    """Studio names inside a longer word are left to the partial fallback."""
+    matcher = StudioMatcher(studio_index={"studios": {"bang": "Bang", "fucked!": "Fucked!"}})
+
+    assert matcher.process_word_fallback(_single_token("Trip to Bangkok")).studio is None
+    assert matcher.process_word_fallback(_single_token("Got fucked hard")).studio is None
+    assert matcher.process_word_fallback(_single_token("Bang Bangkok")).studio == "Bang"
+
+
+def test_word_fallback_chains_words_across_whitespace_only():
+    """Names never span or touch "&", "×", "-" or "." joins."""
+    matcher = StudioMatcher(studio_index={"studios": {
+        "chocolate cream": "Chocolate Cream", "brett tyler": "Brett Tyler", "tyler": "Tyler",
+        "nakedsword": "NakedSword", "crunchboy": "CrunchBoy",
+    }})
+
+    for text in ("Chocolate & Cream And The Fucking Machine", "Brett-Tyler.com", "NakedSword × Disruptive",
+                 "NakedSword x Disruptive", "jess royan-WEB"):
+        assert matcher.process_word_fallback(_single_token(text)).studio is None, text
+    assert matcher.process_word_fallback(_single_token("Crunchboy.mp4")).studio == "CrunchBoy"
+
+
+def test_word_fallback_splits_only_the_first_match():
+    """One studio per result: later tokens with a name are left alone."""
+    matcher = StudioMatcher(studio_index={"studios": {"helix": "Helix Studios", "twinks": "Twinks", "dom": "DOM"}})
+    tokens = [Token(value="Helix Studio", type="text", position=0),
+              Token(value="Bareback Twinks", type="text", position=15)]
+    result = TokenizationResult(original="Helix Studio - Bareback Twinks", cleaned="Helix Studio - Bareback Twinks",
+                                pattern="{token0} - {token1}", tokens=tokens)
+
+    processed = matcher.process_word_fallback(result)
+
+    assert processed.studio == "Helix Studios"
+    assert [t.value for t in processed.tokens] == ["Helix Studios", "Studio", "Bareback Twinks"]
+    assert matcher.process_word_fallback(_single_token("Fabio Malvadao, Dom Pablo")).studio is None
+    assert matcher.process_word_fallback(_single_token("DOM Pablo")).studio == "DOM"
+
+
+@pytest.mark.parametrize("filename, studio", [
+    ("NakedSword × Disruptive – Wild Game | Scene 1.mp4", "Disruptive Films"),
+    ("Helix Studio - Bareback Twinks.avi", "Helix Studios"),
+    ("crunchboy.com PART 2/2875 guillem ramos viktor rom720_2-WEB - Crunchboy.mp4.mp4", "CrunchBoy"),
+])
+def test_word_fallback_corpus_regressions(parser, filename, studio):
+    """Filenames the word fallback once misread keep the studio of the other stages."""
+    assert parser.parse(filename).studio == studio
+
+
+@pytest.mark.parametrize("filename", [
+    "Brett-Tyler.com - Cummy Hole (1080p).mp4",
+    "Chocolate & Cream And The Fucking Machine.mpg",
+    "Maxence-Angel.com - Daddy Pete Masters - Pete Masters & Maxence Angel [1080p].mp4",
+])
+def test_word_fallback_does_not_invent_studios(parser, filename):
+    """Hyphen/dot compounds and "&" joins do not become studio names."""
+    baseline = FilenameParser(pipeline={"disabled_stages": ["studios_word_fallback"]})
+    assert parser.parse(filename).studio == baseline.parse(filename).studio
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
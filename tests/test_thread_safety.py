@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for read-only dictionaries and sharing one parser between threads.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import MappingProxyType
+from unittest.mock import patch
+
+import pytest
+
+from modules.dictionary_loader import DictionaryLoader, freeze
+from yansa import FilenameParser
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def fresh_cache():
+    DictionaryLoader.clear_cache()
+    yield
+    DictionaryLoader.clear_cache()
+
+
+def _corpus():
+    lines = (ROOT / "ref" / "current.txt").read_text(encoding="utf-8").splitlines()
+    return [line for line in lines if line.strip()]
+
+
+def test_freeze_is_deep():
+    frozen = freeze({"a": [1, {"b": [2]}], "c": "text"})
+    assert isinstance(frozen, MappingProxyType)
+    assert frozen["a"] == (1, {"b": (2,)})
+    with pytest.raises(TypeError):
+        frozen["c"] = "changed"
+    with pytest.raises(TypeError):
+        frozen["a"][1]["b"] = ()
+
+
+def test_loaded_dictionaries_are_read_only(fresh_cache):
+    config = DictionaryLoader.load_dictionary("parser-dictionary.json")
+    assert isinstance(config, MappingProxyType)
+    assert isinstance(DictionaryLoader.get_section("junk_tokens"), tuple)
+    assert isinstance(DictionaryLoader.load_dictionary("studios.json"), tuple)
+    with pytest.raises(TypeError):
+        config["junk_tokens"] = []
+    assert DictionaryLoader.load_dictionary("parser-dictionary.json") is config
+
+
+def test_concurrent_loads_read_each_file_once(fresh_cache):
+    barrier = threading.Barrier(8)
+
+    def load(_):
+        barrier.wait()
+        return DictionaryLoader.load_dictionary("studios.json")
+
+    with patch.object(DictionaryLoader, "_read", wraps=DictionaryLoader._read) as read:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(load, range(8)))
+
+    assert read.call_count == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_concurrent_parser_construction(fresh_cache):
+    reference = FilenameParser()
+    DictionaryLoader.clear_cache()
+    names = _corpus()[:20]
+
+    def build_and_parse(_):
+        parser = FilenameParser()
+        return [parser.parse(name).to_json() for name in names]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(build_and_parse, range(4)))
+
+    expected = [reference.parse(name).to_json() for name in names]
+    assert all(result == expected for result in results)
+
+
+def test_shared_parser_is_reentrant():
+    parser = FilenameParser(pipeline={"profile": True, "profile_sample_every": 1})
+    names = _corpus()
+    expected = [FilenameParser().parse(name).to_json() for name in names]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda name: parser.parse(name).to_json(), names * 3))
+
+    assert results == expected * 3
+    assert parser.stage_graph.profiler.parses == len(names) * 3
+
+
+def test_fuzzy_index_is_built_once_under_concurrent_first_use():
+    import modules.studio_fuzzy_index as fuzzy_module
+
+    parser = FilenameParser(pipeline={"enabled_stages": ["studios_fuzzy_fallback"]})
+    barrier = threading.Barrier(8)
+
+    def first_parse(_):
+        barrier.wait()
+        return parser.parse("ActivDuty Brent Taylor 2024-01-15.mp4").to_json()
+
+    with patch.object(fuzzy_module, "StudioFuzzyIndex", wraps=fuzzy_module.StudioFuzzyIndex) as build:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(first_parse, range(8)))
+
+    assert build.call_count == 1
+    assert all(result == results[0] for result in results)
+    assert '"studio": "Active Duty"' in results[0]
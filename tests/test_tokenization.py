@@ -4,9 +4,11 @@ Pytest tests for tokenization functionality.
 These tests verify the tokenization process that follows pre-tokenization.
 """
 
+import sys
+
 import pytest
 from yansa import FilenameParser
-from modules import Token, PreTokenizationResult
+from modules import Token, SpanToken, PreTokenizationResult
 
 
 @pytest.fixture
@@ -202,3 +204,43 @@ def test_path_parser_isolates_basename(parser):
     assert path_token is None
     assert final_result.cleaned == pre_result.cleaned
     assert final_result.group is None
+
+
+def test_result_dataclasses_use_slots(parser):
+    """Parse results carry no per-instance __dict__ and share interned token types."""
+    result = parser.parse("[Studio] Some Scene Title - Other Part (2020-01-01).mp4")
+
+    assert not hasattr(result, "__dict__")
+    assert result.tokens
+    for token in result.tokens:
+        assert not hasattr(token, "__dict__")
+        assert token.type is sys.intern(token.type)
+
+    with pytest.raises(AttributeError):
+        result.unexpected_field = "x"
+
+
+def test_compact_tokens_keeps_values(parser):
+    """Span tokens reproduce the original values without copying substrings."""
+    filename = "collection/Studio Name - Performer One - A Long Scene Title (2020-01-01).mp4"
+    result = parser.parse(filename)
+    expected = [(token.value, token.type, token.position) for token in result.tokens or []]
+    json_before = result.to_json()
+
+    result.compact_tokens()
+
+    assert [(token.value, token.type, token.position) for token in result.tokens or []] == expected
+    assert any(isinstance(token, SpanToken) for token in result.tokens or [])
+    assert result.to_json() == json_before
+    for token in result.tokens or []:
+        if isinstance(token, SpanToken):
+            assert token.source is result.cleaned
+            assert token.to_token() == Token(token.value, token.type, token.position)
+
+
+def test_span_token_from_token_falls_back_to_search():
+    source = "Alpha - Beta"
+    span = SpanToken.from_token(Token(value="Beta", type="text", position=0), source)
+    assert span is not None
+    assert (span.start, span.end, span.value) == (8, 12, "Beta")
+    assert SpanToken.from_token(Token(value="Gamma", type="text", position=0), source) is None
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared-state parser worker pool.
+"""
+
+from __future__ import annotations
+
+import gc
+import multiprocessing
+import os
+
+import pytest
+
+from modules import worker_pool
+from modules.worker_pool import ParserPool, WorkerMemory, load_state, read_process_memory, save_state
+from tools.evaluate import parse_filenames
+from yansa import FilenameParser
+
+FILENAMES = [
+    "Active Duty - Brent Taylor & AJ Alexander 2024-01-15 1080p.mp4",
+    "[SeanCody] Weekend Trip Part 2 (2023).mkv",
+    "UKNM-001 Brent Taylor.mp4",
+    "random clip.avi",
+]
+
+needs_fork = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="fork start method unavailable"
+)
+
+
+def _studio_and_pid(parser, filename):
+    return parser.parse(filename).studio, os.getpid(), id(parser)
+
+
+@needs_fork
+def test_fork_workers_inherit_the_parent_parser():
+    parser = FilenameParser()
+    expected = [parser.parse(name).studio for name in FILENAMES]
+
+    with ParserPool(parser, workers=2, start_method="fork") as pool:
+        assert gc.get_freeze_count() > 0
+        results = list(pool.map(_studio_and_pid, FILENAMES))
+        memory = pool.memory_report()
+
+    assert [studio for studio, _, _ in results] == expected
+    assert all(pid != os.getpid() for _, pid, _ in results)
+    # Workers see the very object the parent built, not a rebuilt copy.
+    assert {parser_id for _, _, parser_id in results} == {id(parser)}
+    assert memory and all(isinstance(entry, WorkerMemory) for entry in memory)
+    # Worker PIDs come from the initializer, not executor internals.
+    assert {entry.pid for entry in memory} >= {pid for _, pid, _ in results}
+    assert len(memory) <= 2
+    assert gc.get_freeze_count() == 0
+    assert worker_pool._fork_states == {}
+
+
+def _state_and_pid(state, item):
+    return state, os.getpid()
+
+
+@needs_fork
+def test_concurrent_fork_pools_keep_their_own_state():
+    first = ParserPool("first", workers=1, start_method="fork")
+    second = ParserPool("second", workers=1, start_method="fork")
+    with first, second:
+        assert [state for state, _ in first.map(_state_and_pid, [1])] == ["first"]
+        assert [state for state, _ in second.map(_state_and_pid, [1])] == ["second"]
+
+        first.close()
+        # The other pool's workers and shared pages are unaffected.
+        assert gc.get_freeze_count() > 0
+        assert [state for state, _ in second.map(_state_and_pid, [1, 2])] == ["second", "second"]
+        late = ParserPool("late", workers=1, start_method="fork")
+        with late:
+            assert [state for state, _ in late.map(_state_and_pid, [1])] == ["late"]
+
+    assert gc.get_freeze_count() == 0
+    assert worker_pool._fork_states == {}
+
+
+def test_spawn_workers_load_the_bundle(tmp_path):
+    parser = FilenameParser()
+    bundle = tmp_path / "parser.pickle"
+
+    with ParserPool(parser, workers=1, start_method="spawn", state_path=bundle) as pool:
+        results = list(pool.map(_studio_and_pid, FILENAMES))
+        assert pool.worker_pids() == sorted({pid for _, pid, _ in results})
+
+    assert [studio for studio, _, _ in results] == [parser.parse(name).studio for name in FILENAMES]
+    assert bundle.exists()
+    assert load_state(bundle).parse(FILENAMES[0]).to_json() == parser.parse(FILENAMES[0]).to_json()
+
+
+def test_temporary_bundle_is_removed_on_close():
+    pool = ParserPool(FilenameParser(), workers=1, start_method="spawn")
+    pool.start()
+    bundle = pool.state_path
+    assert bundle is not None and bundle.exists()
+    pool.close()
+    assert not bundle.exists()
+
+
+def test_unknown_start_method_is_rejected():
+    with pytest.raises(ValueError):
+        ParserPool(FilenameParser(), workers=2, start_method="forkserver")
+
+
+def test_save_state_round_trips(tmp_path):
+    path = save_state({"answer": 42}, tmp_path / "state.pickle")
+    assert load_state(path) == {"answer": 42}
+
+
+def test_read_process_memory():
+    memory = read_process_memory(os.getpid())
+    if os.path.exists("/proc/self/status"):
+        assert memory.rss_kb and memory.rss_kb > 0
+        assert "RSS" in memory.describe()
+    assert read_process_memory(-1).rss_kb is None
+
+
+@pytest.mark.parametrize("start_method", ["spawn", pytest.param("fork", marks=needs_fork)])
+def test_evaluate_output_is_independent_of_start_method(start_method):
+    serial = parse_filenames(FILENAMES, workers=1)
+    parallel = parse_filenames(FILENAMES, workers=2, start_method=start_method)
+
+    assert [row.to_excel_row() for row in parallel] == [row.to_excel_row() for row in serial]
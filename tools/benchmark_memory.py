@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Peak-memory benchmark for a large in-memory report.
+
+Models what a GraphQL report / batch comparison run keeps alive at once:
+
+- the fetched Scene objects (with files, studio and performers)
+- one TokenizationResult per scene
+- one ParsedMetadata per scene
+
+Filenames come from tools/generate_corpus.py so runs are reproducible. Memory
+is measured with tracemalloc, so numbers cover Python allocations only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from modules.scene_transformer import SceneTransformer
+from modules.stash_client import Scene, SceneFile, ScenePerformer, SceneStudio
+from tools.generate_corpus import generate_filenames
+from yansa import FilenameParser
+
+
+def build_scenes(filenames: List[str]) -> List[Scene]:
+    """Wrap filenames in Scene objects shaped like the report projection returns."""
+    studios = [SceneStudio(id=str(index), name=f"Studio {index}") for index in range(50)]
+    scenes: List[Scene] = []
+    for index, filename in enumerate(filenames):
+        folder, _, basename = filename.rpartition("/")
+        scene_id = str(index + 1)
+        scenes.append(
+            Scene(
+                id=scene_id,
+                title=None,
+                date=None,
+                code=None,
+                studio=studios[index % len(studios)] if index % 3 == 0 else None,
+                files=[
+                    SceneFile(
+                        id=scene_id,
+                        path=f"/library/{folder or 'unsorted'}/{basename}",
+                        basename=basename,
+                    )
+                ],
+                performers=[ScenePerformer(id=str(index % 500), name=f"Performer {index % 500}")],
+                updated_at="2026-01-01T00:00:00Z",
+            )
+        )
+    return scenes
+
+
+def measure(count: int, seed: int = 0, compact_tokens: bool = False) -> Dict[str, float]:
+    """
+    Build the in-memory report for `count` synthetic scenes and record memory.
+
+    Args:
+        count: Number of scenes
+        seed: Corpus seed
+        compact_tokens: Store tokens as spans over the cleaned string
+
+    Returns:
+        Retained MiB after each phase, overall peak MiB and elapsed seconds
+    """
+    filenames = generate_filenames(count, seed=seed, duplicate_rate=0.05, folder_rate=0.3)
+    parser = FilenameParser()
+    transformer = SceneTransformer()
+    mib = 1024 * 1024
+
+    started = time.perf_counter()
+    tracemalloc.start()
+    try:
+        scenes = build_scenes(filenames)
+        del filenames
+        scenes_mib = tracemalloc.get_traced_memory()[0] / mib
+
+        results = []
+        for scene in scenes:
+            result = parser.parse(
+                scene.files[0].basename,
+                existing_studio=scene.studio.name if scene.studio else None,
+            )
+            if compact_tokens:
+                result.compact_tokens()
+            results.append(result)
+        results_mib = tracemalloc.get_traced_memory()[0] / mib - scenes_mib
+
+        parsed = [transformer.parse_result_to_metadata(result) for result in results]
+        current, peak = tracemalloc.get_traced_memory()
+        metadata_mib = current / mib - scenes_mib - results_mib
+    finally:
+        tracemalloc.stop()
+
+    del scenes, results, parsed
+    return {
+        "scenes_mib": scenes_mib,
+        "results_mib": results_mib,
+        "metadata_mib": metadata_mib,
+        "peak_mib": peak / mib,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100000, help="Number of scenes (default: 100000)")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed (default: 0)")
+    parser.add_argument(
+        "--compact-tokens",
+        action="store_true",
+        help="Store parsed tokens as spans over the cleaned filename",
+    )
+    args = parser.parse_args()
+
+    results = measure(args.count, seed=args.seed, compact_tokens=args.compact_tokens)
+    print(f"scenes:            {args.count}")
+    print(f"Scene objects:     {results['scenes_mib']:8.1f} MiB")
+    print(f"parse results:     {results['results_mib']:8.1f} MiB")
+    print(f"parsed metadata:   {results['metadata_mib']:8.1f} MiB")
+    print(f"peak (tracemalloc):{results['peak_mib']:8.1f} MiB")
+    print(f"elapsed:           {results['seconds']:8.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
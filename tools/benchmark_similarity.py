@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: bit-parallel Levenshtein vs. the previous matrix implementation."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from modules.similarity import normalized_similarity
+
+
+def matrix_similarity(str1: str, str2: str) -> float:
+    """Reference (n+1)x(m+1) matrix implementation the comparators used to carry."""
+    if str1 == str2:
+        return 1.0
+    len1, len2 = len(str1), len(str2)
+    if len1 == 0:
+        return 0.0 if len2 > 0 else 1.0
+    if len2 == 0:
+        return 0.0
+
+    matrix = [[0] * (len2 + 1) for _ in range(len1 + 1)]
+    for i in range(len1 + 1):
+        matrix[i][0] = i
+    for j in range(len2 + 1):
+        matrix[0][j] = j
+
+    for i in range(1, len1 + 1):
+        for j in range(1, len2 + 1):
+            cost = 0 if str1[i - 1] == str2[j - 1] else 1
+            matrix[i][j] = min(
+                matrix[i - 1][j] + 1,
+                matrix[i][j - 1] + 1,
+                matrix[i - 1][j - 1] + cost,
+            )
+
+    return 1.0 - (matrix[len1][len2] / max(len1, len2))
+
+
+def make_title_pairs(count: int, length: int = 200, seed: int = 0) -> List[Tuple[str, str]]:
+    """Build title pairs: half near-duplicates (a few edits), half unrelated."""
+    rng = random.Random(seed)
+    alphabet = string.ascii_lowercase + "     "
+    pairs: List[Tuple[str, str]] = []
+    for index in range(count):
+        title = "".join(rng.choice(alphabet) for _ in range(length))
+        if index % 2 == 0:
+            chars = list(title)
+            for _ in range(rng.randint(1, 10)):
+                chars[rng.randrange(length)] = rng.choice(alphabet)
+            other = "".join(chars)
+        else:
+            other = "".join(rng.choice(alphabet) for _ in range(length))
+        pairs.append((title, other))
+    return pairs
+
+
+def run_benchmark(pairs: List[Tuple[str, str]], cutoff: float = 0.5) -> Dict[str, float]:
+    """Return seconds per pair for each implementation."""
+    candidates: Dict[str, Callable[[str, str], float]] = {
+        "matrix": matrix_similarity,
+        "bit_parallel": normalized_similarity,
+        "bit_parallel_cutoff": lambda a, b: normalized_similarity(a, b, score_cutoff=cutoff),
+    }
+    results: Dict[str, float] = {}
+    for name, func in candidates.items():
+        started = time.perf_counter()
+        for str1, str2 in pairs:
+            func(str1, str2)
+        results[name] = (time.perf_counter() - started) / len(pairs)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=200, help="Number of title pairs (default: 200)")
+    parser.add_argument("--length", type=int, default=200, help="Title length in characters (default: 200)")
+    parser.add_argument("--cutoff", type=float, default=0.5, help="score_cutoff for the early-exit run (default: 0.5)")
+    args = parser.parse_args()
+
+    results = run_benchmark(make_title_pairs(args.pairs, args.length), cutoff=args.cutoff)
+    baseline = results["matrix"]
+    for name, seconds in results.items():
+        print(f"{name:>20}: {seconds * 1e6:10.1f} us/pair  ({baseline / seconds:6.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
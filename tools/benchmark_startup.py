@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: `import yansa` vs. the libraries it used to import eagerly.
+
+Each import runs in a fresh interpreter, so modules already loaded by this
+process do not hide import costs. The best of several runs is reported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Statements timed by default: the library entry points and the heavy
+# dependencies (Excel writer and Stash client) they no longer load up front.
+STATEMENTS = {
+    "yansa": "import yansa",
+    "FilenameParser": "from yansa import FilenameParser",
+    "eager dependencies": "import openpyxl, stashapi.stashapp",
+}
+
+
+def best_import_seconds(statement: str, repeats: int = 3) -> float:
+    """Return the fastest of `repeats` cold runs of `statement`, in seconds."""
+    code = (
+        "import time\n"
+        "started = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - started)"
+    )
+    timings = []
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings.append(float(completed.stdout.strip()))
+    return min(timings)
+
+
+def run_benchmark(repeats: int = 3) -> Dict[str, float]:
+    """Return best cold import seconds for each statement in STATEMENTS."""
+    return {name: best_import_seconds(statement, repeats) for name, statement in STATEMENTS.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=5, help="Cold runs per statement (default: 5)")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.repeats)
+    for name, seconds in results.items():
+        print(f"{name:>20}: {seconds * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,11 +15,14 @@ import sys
 import argparse
 import json
 import ast
+import math
+import os
 from datetime import datetime
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Union
 from collections import Counter
+from contextlib import ExitStack
 
 # Add parent directory to path to import parser modules
 ROOT = Path(__file__).resolve().parent.parent
@@ -30,6 +33,14 @@ from modules import PreTokenizer
 from openpyxl import load_workbook
 
 from modules.excel_writer import ExcelSheetData, write_excel_workbook
+from modules.parse_cache import ParseCache
+from modules.report_sinks import REPORT_FORMATS, open_report_sink, report_path_for_format, report_suffix
+from modules.worker_pool import START_METHODS, ParserPool
+
+
+def _format_token_set(tokens: Set[str]) -> str:
+    """Render a token set as a set literal in sorted order (str(set) depends on per-process hash seeds)."""
+    return "{" + ", ".join(repr(token) for token in sorted(tokens)) + "}"
 
 
 @dataclass
@@ -69,7 +80,7 @@ class ParsedRow:
             json.dumps(self.sequence) if self.sequence else "",
             self.group if self.group else "",
             # str(self.unlabeled_path_tokens) if self.unlabeled_path_tokens else "",  # Disabled - not working on paths yet
-            str(self.unlabeled_filename_tokens) if self.unlabeled_filename_tokens else "",
+            _format_token_set(self.unlabeled_filename_tokens) if self.unlabeled_filename_tokens else "",
             json.dumps(self.match_stats),
         ]
 
@@ -118,7 +129,13 @@ def parse_arguments():
     )
     parser.add_argument(
         '--output-excel',
-        help='Output Excel file path (default: metrics/MODE-YYYYMMDD-HHMMSS.xlsx)'
+        help='Output report file path (default: metrics/MODE-YYYYMMDD-HHMMSS.<format suffix>)'
+    )
+    parser.add_argument(
+        '--output-format',
+        choices=REPORT_FORMATS,
+        default='xlsx',
+        help='Report format: xlsx (default), csv, jsonl or parquet (requires pyarrow)'
     )
     parser.add_argument(
         '--output-json',
@@ -140,10 +157,28 @@ def parse_arguments():
         action='store_true',
         help='Dry-run mode: skip writing output files'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Parse with N worker processes (default: 1 = serial, 0 = one per CPU)'
+    )
+    parser.add_argument(
+        '--start-method',
+        choices=START_METHODS,
+        default='auto',
+        help='How --workers get the parser: fork (shared copy-on-write), '
+             'spawn (load a pickled bundle) or auto (fork where available)'
+    )
+    parser.add_argument(
+        '--shared-studio-index',
+        action='store_true',
+        help='With --workers, serve studio lookups from shared-memory tables'
+    )
     parser.add_argument(
         '--skip-excel',
         action='store_true',
-        help='Skip Excel output for faster CI runs'
+        help='Skip report output (any format) for faster CI runs'
     )
 
     return parser.parse_args()
@@ -207,20 +242,18 @@ def read_input_file(filepath: Union[str, Path], limit: Optional[int] = None,
     return filenames
 
 
-def parse_filename(parser: FilenameParser, filename: str) -> ParsedRow:
+def parse_filename(parser: Union[FilenameParser, ParseCache], filename: str) -> ParsedRow:
     """
     Parse a single filename and return a ParsedRow.
 
     This transforms the parser's output into the 13-column schema (path columns disabled).
     The parser now handles all extraction logic (title, sequence, group, etc.).
     """
-    # Run full parsing pipeline
+    # Run full parsing pipeline (carries the pre-tokenization removed tokens)
     result = parser.parse(filename)
     tokens = result.tokens or []
 
-    # Get pre-tokenization result for removed tokens
-    pre_result = parser.pre_tokenize(filename)
-    removed_str = ' | '.join([f"{t.value}({t.category})" for t in pre_result.removed_tokens])
+    removed_str = ' | '.join([f"{t.value}({t.category})" for t in result.removed_tokens or []])
 
     # PATH PROCESSING DISABLED - Not working on paths yet
     # # Extract path and non-path tokens
@@ -263,6 +296,9 @@ def parse_filename(parser: FilenameParser, filename: str) -> ParsedRow:
             date = token.value
         elif token.type == 'studio_code':
             studio_code = token.value
+    # Filled from a studio catalog (optional `catalog` stage) when not parsed.
+    date = date or result.date
+    studio_code = studio_code or result.studio_code
 
     # PATH PROCESSING DISABLED - Not working on paths yet
     # # Calculate unlabeled tokens
@@ -313,6 +349,59 @@ def parse_filename(parser: FilenameParser, filename: str) -> ParsedRow:
     )
 
 
+def _parse_with_cache(cache: ParseCache, filename: str) -> ParsedRow:
+    return parse_filename(cache, filename)
+
+
+def parse_filenames(filenames: List[str], workers: int = 1,
+                    parser: Optional[FilenameParser] = None,
+                    start_method: str = "auto",
+                    shared_studio_index: bool = False) -> List[ParsedRow]:
+    """
+    Parse filenames serially or across a process pool.
+
+    The parser is built once here. With workers > 1 it is shared with the
+    workers through ParserPool (inherited copy-on-write when forking, loaded
+    from a pickled bundle when spawning) instead of being rebuilt per worker.
+    Filenames are sent to the pool in chunks and results are collected with
+    Executor.map, so rows come back in input order and metrics match a serial
+    run. Repeated filenames are parsed once (per worker). With
+    shared_studio_index the workers look studios up in one flat shared-memory
+    table instead of their (gradually un-shared) copies of the studio dict.
+    """
+    total = len(filenames)
+    rows: List[ParsedRow] = []
+    cache = ParseCache(parser or FilenameParser())
+    print(f"  Studio prefilter: {cache.parser.studio_matcher.prefilter.describe()}")
+
+    if workers <= 1 or total < 2:
+        for idx, filename in enumerate(filenames, 1):
+            if idx % 100 == 0:
+                print(f"  Processed {idx}/{total}...")
+            rows.append(parse_filename(cache, filename))
+        print(f"  {cache.summary('inputs')}")
+        return rows
+
+    workers = min(workers, total)
+    chunksize = max(1, min(500, math.ceil(total / (workers * 4))))
+    with ExitStack() as stack:
+        if shared_studio_index:
+            matcher = cache.parser.studio_matcher
+            index = stack.enter_context(matcher.shared_studio_index())
+            folded = matcher.folded_studios
+            print(f"  Shared studio index: {len(index) + len(folded)} keys, "
+                  f"{(index.nbytes + folded.nbytes) / 1024:.1f} KiB")
+        pool = stack.enter_context(ParserPool(cache, workers, start_method=start_method))
+        for idx, row in enumerate(pool.map(_parse_with_cache, filenames, chunksize=chunksize), 1):
+            if idx % 100 == 0:
+                print(f"  Processed {idx}/{total}...")
+            rows.append(row)
+        print(f"  Worker memory ({pool.start_method}):")
+        for memory in pool.memory_report():
+            print(f"    {memory.describe()}")
+    return rows
+
+
 def calculate_blind_metrics(rows: List[ParsedRow]) -> Dict[str, Any]:
     """
     Calculate coverage metrics for blind mode.
@@ -694,6 +783,39 @@ def write_excel_output(rows: List[ParsedRow], output_path: Union[str, Path], mod
     write_excel_workbook(output_path, sheets)
 
 
+def write_report_output(rows: List[ParsedRow], output_path: Union[str, Path], mode: str,
+                        output_format: str = 'xlsx',
+                        reference_rows: Optional[List[ParsedRow]] = None,
+                        diff_rows: Optional[List[ParsedRow]] = None) -> List[Path]:
+    """
+    Write parsed results in the requested format.
+
+    Excel keeps the multi-sheet workbook from write_excel_output. Flat formats
+    (csv, jsonl, parquet) write one file per sheet: the results go to
+    output_path, and in reference mode the Reference and Diff sheets go to
+    sibling files suffixed "-reference" and "-diff".
+    """
+    output_path = Path(output_path)
+    if output_format == 'xlsx':
+        write_excel_output(rows, output_path, mode, reference_rows=reference_rows, diff_rows=diff_rows)
+        return [output_path]
+
+    outputs = [(output_path, rows)]
+    if mode == 'reference' and reference_rows and diff_rows:
+        suffix = report_suffix(output_format)
+        outputs.append((output_path.with_name(f"{output_path.stem}-reference{suffix}"), reference_rows))
+        outputs.append((output_path.with_name(f"{output_path.stem}-diff{suffix}"), diff_rows))
+
+    headers = ParsedRow.get_headers()
+    written: List[Path] = []
+    for path, sheet_rows in outputs:
+        with open_report_sink(path, headers, report_format=output_format) as sink:
+            for row in sheet_rows:
+                sink.write_record(row)
+        written.append(path)
+    return written
+
+
 def write_json_metrics(metrics: Dict[str, Any], output_path: Union[str, Path]):
     """Write metrics to JSON file."""
     output_path = Path(output_path)
@@ -708,7 +830,13 @@ def main():
     # Normalize paths and generate defaults
     input_path = Path(args.input)
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    output_excel = Path(args.output_excel) if args.output_excel else Path("metrics") / f"{args.mode}-{timestamp}.xlsx"
+    if args.output_excel:
+        output_excel = report_path_for_format(args.output_excel, args.output_format)
+        if output_excel != Path(args.output_excel):
+            print(f"Warning: --output-excel {Path(args.output_excel).name} does not match "
+                  f"--output-format {args.output_format}; writing {output_excel.name}")
+    else:
+        output_excel = Path("metrics") / f"{args.mode}-{timestamp}{report_suffix(args.output_format)}"
     output_json = Path(args.output_json) if args.output_json else Path("metrics") / f"{args.mode}-{timestamp}.json"
 
     args.input = input_path
@@ -719,7 +847,7 @@ def main():
     print(f"Input: {args.input}")
     if not args.no_write:
         if not args.skip_excel:
-            print(f"Excel output: {args.output_excel}")
+            print(f"Report output ({args.output_format}): {args.output_excel}")
         print(f"JSON output: {args.output_json}")
 
     # Read input filenames
@@ -728,18 +856,11 @@ def main():
     filenames = read_input_file(args.input, args.limit, sheet_name=reference_sheet_name)
     print(f"Found {len(filenames)} filenames to process")
 
-    # Initialize parser
-    parser = FilenameParser()
-
     # Parse all filenames
-    print("\nParsing filenames...")
-    rows = []
-    for idx, filename in enumerate(filenames, 1):
-        if idx % 100 == 0:
-            print(f"  Processed {idx}/{len(filenames)}...")
-
-        row = parse_filename(parser, filename)
-        rows.append(row)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    print(f"\nParsing filenames{f' with {workers} workers' if workers > 1 else ''}...")
+    rows = parse_filenames(filenames, workers=workers, start_method=args.start_method,
+                           shared_studio_index=args.shared_studio_index)
 
     print(f"Completed parsing {len(rows)} filenames")
 
@@ -821,10 +942,11 @@ def main():
     # Write outputs
     if not args.no_write:
         if not args.skip_excel:
-            print(f"\nWriting Excel output to {args.output_excel}...")
-            write_excel_output(rows, args.output_excel, args.mode,
-                             reference_rows=reference_rows,
-                             diff_rows=diff_rows)
+            print(f"\nWriting {args.output_format} output to {args.output_excel}...")
+            write_report_output(rows, args.output_excel, args.mode,
+                                output_format=args.output_format,
+                                reference_rows=reference_rows,
+                                diff_rows=diff_rows)
 
         print(f"Writing JSON metrics to {args.output_json}...")
         write_json_metrics(metrics, args.output_json)
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Generate large synthetic filename corpora for load testing.
+
+Filenames are assembled from the parser's own vocabulary so every stage has
+realistic work to do:
+
+- studio names and aliases from dictionaries/studios.json
+- studio codes expanded from dictionaries/studio_codes.json patterns
+- dates rendered in every pattern family of dictionaries/date_formats.json
+- resolution/quality/source/format markers and extensions from
+  dictionaries/parser-dictionary.json
+- performer names and scene titles from ref/scraped_data.sqlite3
+
+Output is fully determined by --seed and --count, so benchmark numbers are
+comparable across runs. The result is a text file with one filename per line,
+which tools/evaluate.py accepts as --input.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+DICTIONARY_DIR = ROOT / "dictionaries"
+SCRAPED_DB = ROOT / "ref" / "scraped_data.sqlite3"
+
+TITLE_TABLES = ("family_creep", "raw_fuck", "let_them_watch", "treasure_island_media")
+
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+
+
+def _ordinal(day: int) -> str:
+    if 11 <= day % 100 <= 13:
+        return f"{day}th"
+    suffix = {1: "st", 2: "nd", 3: "rd"}.get(day % 10, "th")
+    return f"{day}{suffix}"
+
+
+def _month_name(rng: random.Random, value: date) -> str:
+    name = MONTHS[value.month - 1]
+    return name if rng.random() < 0.5 else name[:3]
+
+
+def _iso(rng: random.Random, value: date) -> str:
+    sep = rng.choice("-._ ")
+    return f"{value.year}{sep}{value.month:02d}{sep}{value.day:02d}"
+
+
+def _us_date(rng: random.Random, value: date) -> str:
+    sep = rng.choice("./-")
+    return f"{value.month:02d}{sep}{value.day:02d}{sep}{value.year}"
+
+
+# One renderer per date pattern type in date_formats.json.
+DATE_RENDERERS: Dict[str, Callable[[random.Random, date], str]] = {
+    "iso": _iso,
+    "day_month_year": lambda rng, d: f"{_ordinal(d.day) if rng.random() < 0.5 else d.day} {_month_name(rng, d)} {d.year}",
+    "parenthesized_month_day_year": lambda rng, d: f"({_month_name(rng, d)} {_ordinal(d.day)}, {d.year})",
+    "month_day_year": lambda rng, d: f"{_month_name(rng, d)} {d.day}, {d.year}",
+    "compact": lambda rng, d: d.strftime("%Y%m%d"),
+    "compact_month_name": lambda rng, d: f"{d.day}{_month_name(rng, d)}{d.year}",
+    "us_date": _us_date,
+    "year": lambda rng, d: str(d.year),
+}
+
+
+@dataclass
+class CorpusSources:
+    """Vocabulary the generator draws from."""
+
+    studios: List[Tuple[str, List[str]]]
+    code_patterns: List[Tuple[Optional[str], str]]
+    date_types: List[str]
+    extensions: List[str]
+    markers: List[str]
+    performers: List[str]
+    titles: List[str]
+
+    @classmethod
+    def load(cls, dictionary_dir: Path = DICTIONARY_DIR, scraped_db: Path = SCRAPED_DB) -> "CorpusSources":
+        studios_data = _load_json(dictionary_dir / "studios.json")
+        studios = sorted(
+            (entry["canonical_name"], sorted(entry.get("aliases") or []))
+            for entry in studios_data
+            if entry.get("canonical_name")
+        )
+
+        code_patterns: List[Tuple[Optional[str], str]] = []
+        for entry in _load_json(dictionary_dir / "studio_codes.json"):
+            for pattern in entry.get("code_patterns") or []:
+                # Regex patterns have no fixed shape to expand; placeholder patterns do.
+                if not pattern.startswith("re:"):
+                    code_patterns.append((entry.get("studio"), pattern))
+
+        date_data = _load_json(dictionary_dir / "date_formats.json")
+        date_types = [p["type"] for p in date_data.get("patterns") or [] if p.get("type") in DATE_RENDERERS]
+
+        parser_data = _load_json(dictionary_dir / "parser-dictionary.json")
+        extensions = sorted({ext.lower() for ext in parser_data.get("extensions") or []})
+        markers: List[str] = []
+        for section in ("resolution_markers", "quality_markers", "source_markers", "format_markers"):
+            markers.extend(parser_data.get(section) or [])
+
+        performers: List[str] = []
+        titles: List[str] = []
+        if scraped_db.exists():
+            conn = sqlite3.connect(f"{scraped_db.resolve().as_uri()}?mode=ro", uri=True)
+            try:
+                performers = [row[0] for row in conn.execute("SELECT name FROM performers ORDER BY id") if row[0]]
+                for table in TITLE_TABLES:
+                    titles.extend(
+                        # Path separators would turn part of a title into a folder.
+                        " ".join(row[0].replace("/", " ").replace("\\", " ").split())
+                        for row in conn.execute(f"SELECT title FROM {table} ORDER BY rowid")
+                        if row[0] and row[0].strip()
+                    )
+            finally:
+                conn.close()
+
+        return cls(
+            studios=studios,
+            code_patterns=code_patterns,
+            date_types=date_types,
+            extensions=extensions or ["mp4"],
+            markers=markers,
+            performers=performers or ["Alex", "Sam"],
+            titles=titles or ["Untitled"],
+        )
+
+
+class CorpusGenerator:
+    """Seeded filename generator over a CorpusSources vocabulary."""
+
+    TEMPLATES = (
+        "{studio} - {performers} - {title}{markers}.{ext}",
+        "[{studio}] {title} ({date}){markers}.{ext}",
+        "({studio}) {performers}.{ext}",
+        "{code} {performers} {date}.{ext}",
+        "{studio} - {title} Part {part}.{ext}",
+        "{date} {studio} - {title}{markers}.{ext}",
+        "{performers} - {title} [{marker}].{ext}",
+        "{studio} {code} - {performers}{markers}.{ext}",
+        "{title}.{ext}",
+    )
+
+    def __init__(self, sources: CorpusSources, seed: int = 0, duplicate_rate: float = 0.0, folder_rate: float = 0.0):
+        """
+        Initialize the generator.
+
+        Args:
+            sources: Vocabulary to draw from
+            seed: Random seed; identical seeds produce identical corpora
+            duplicate_rate: Fraction of filenames that repeat an earlier basename
+                            (re-encodes / copies), placed under a different folder
+            folder_rate: Fraction of filenames prefixed with a collection folder
+        """
+        self.sources = sources
+        self.rng = random.Random(seed)
+        self.duplicate_rate = duplicate_rate
+        self.folder_rate = folder_rate
+        self._generated: List[str] = []
+
+    def generate(self, count: int) -> Iterator[str]:
+        """Yield `count` filenames."""
+        for _ in range(count):
+            if self._generated and self.rng.random() < self.duplicate_rate:
+                basename = self.rng.choice(self._generated)
+                yield f"{self._folder()}/{basename}"
+                continue
+
+            basename = self._basename()
+            self._generated.append(basename)
+            if self.rng.random() < self.folder_rate:
+                yield f"{self._folder()}/{basename}"
+            else:
+                yield basename
+
+    def _basename(self) -> str:
+        template = self.rng.choice(self.TEMPLATES)
+        studio, code = self._studio_and_code()
+        return template.format(
+            studio=studio,
+            code=code,
+            performers=self._performers(),
+            title=self.rng.choice(self.sources.titles),
+            date=self._date(),
+            markers=self._markers(),
+            marker=self.rng.choice(self.sources.markers) if self.sources.markers else "HD",
+            part=self.rng.randint(1, 6),
+            ext=self.rng.choice(self.sources.extensions),
+        )
+
+    def _studio_and_code(self) -> Tuple[str, str]:
+        code_studio: Optional[str] = None
+        code = ""
+        if self.sources.code_patterns:
+            code_studio, pattern = self.rng.choice(self.sources.code_patterns)
+            code = self._expand_code(pattern)
+
+        if code_studio and self.rng.random() < 0.7:
+            return code_studio, code
+
+        name, aliases = self.rng.choice(self.sources.studios) if self.sources.studios else ("Studio", [])
+        if aliases and self.rng.random() < 0.3:
+            name = self.rng.choice(aliases)
+        return name, code
+
+    def _expand_code(self, pattern: str) -> str:
+        chars: List[str] = []
+        escaped = False
+        for char in pattern:
+            if escaped:
+                chars.append(char)
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == "#":
+                chars.append(str(self.rng.randint(0, 9)))
+            else:
+                chars.append(char)
+        return "".join(chars)
+
+    def _performers(self) -> str:
+        names = self.rng.sample(self.sources.performers, k=min(len(self.sources.performers), self.rng.randint(1, 3)))
+        if len(names) == 1:
+            return names[0]
+        joiner = self.rng.choice([" & ", " and ", ", "])
+        if joiner == ", ":
+            return ", ".join(names[:-1]) + " & " + names[-1]
+        return joiner.join(names)
+
+    def _date(self) -> str:
+        value = date(2000, 1, 1) + timedelta(days=self.rng.randint(0, 9000))
+        if not self.sources.date_types:
+            return value.isoformat()
+        return DATE_RENDERERS[self.rng.choice(self.sources.date_types)](self.rng, value)
+
+    def _markers(self) -> str:
+        if not self.sources.markers:
+            return ""
+        count = self.rng.choice([0, 0, 1, 1, 2])
+        if not count:
+            return ""
+        picked = self.rng.sample(self.sources.markers, k=count)
+        style = self.rng.random()
+        if style < 0.3:
+            return " [" + " ".join(picked) + "]"
+        if style < 0.5:
+            return " (" + " ".join(picked) + ")"
+        return " " + " ".join(picked)
+
+    def _folder(self) -> str:
+        studio = self.rng.choice(self.sources.studios)[0] if self.sources.studios else "Library"
+        return f"{studio} Part {self.rng.randint(1, 20)}"
+
+
+def generate_filenames(
+    count: int,
+    seed: int = 0,
+    duplicate_rate: float = 0.0,
+    folder_rate: float = 0.0,
+    sources: Optional[CorpusSources] = None,
+) -> List[str]:
+    """Convenience wrapper returning a list of `count` synthetic filenames."""
+    generator = CorpusGenerator(
+        sources or CorpusSources.load(),
+        seed=seed,
+        duplicate_rate=duplicate_rate,
+        folder_rate=folder_rate,
+    )
+    return list(generator.generate(count))
+
+
+def _load_json(path: Path):
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic filename corpus.")
+    parser.add_argument("--count", type=int, default=10000, help="Number of filenames (default: 10000)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument(
+        "--duplicate-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of entries repeating an earlier basename in another folder (default: 0)",
+    )
+    parser.add_argument(
+        "--folder-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of entries prefixed with a collection folder (default: 0)",
+    )
+    parser.add_argument("--output", help="Output text file (default: stdout)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    generator = CorpusGenerator(
+        CorpusSources.load(),
+        seed=args.seed,
+        duplicate_rate=args.duplicate_rate,
+        folder_rate=args.folder_rate,
+    )
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with output_path.open("w", encoding="utf-8") as handle:
+            for filename in generator.generate(args.count):
+                handle.write(filename + "\n")
+        print(f"Wrote {args.count} filenames to {output_path}", file=sys.stderr)
+    else:
+        for filename in generator.generate(args.count):
+            sys.stdout.write(filename + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
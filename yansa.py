@@ -24,12 +24,14 @@ Usage as Stash plugin:
 
 from __future__ import annotations
 
+import copy
+import importlib
 import json
 import sys
 from dataclasses import dataclass
 from datetime import datetime
-from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from pathlib import Path, PureWindowsPath
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
 
 try:
     import stashapi.log as stash_log
@@ -55,6 +57,9 @@ try:
         Tokenizer,
     )
     from .modules.dictionary_loader import DictionaryLoader
+    from .modules.parse_cache import ParseCache
+    from .modules.stage_graph import StageContext, StageGraph
+    from .modules.studio_catalog import StudioCatalog
 except ImportError:
     # Fall back to direct import (when executed as script)
     from modules import (
@@ -70,24 +75,72 @@ except ImportError:
         Tokenizer,
     )
     from modules.dictionary_loader import DictionaryLoader
+    from modules.parse_cache import ParseCache
+    from modules.stage_graph import StageContext, StageGraph
+    from modules.studio_catalog import StudioCatalog
 
 # ============================================================================
-# STASH PLUGIN - Module Imports (conditional for library usage)
+# STASH PLUGIN - Module Imports (deferred until the plugin is constructed)
 # ============================================================================
 
 if TYPE_CHECKING:
     from modules.scene_transformer import SceneTransformer
     from modules.stash_client import Scene, StashClient
+    from modules.stash_sqlite import StashSQLiteReader
+    from modules.report_state import ReportStateStore, StoredReportRow
+    from modules.studio_cache import StudioSnapshot
+
+# Plugin-only names and their modules. Library callers that only need
+# FilenameParser never import these; StashYansaPlugin loads them on creation.
+_PLUGIN_IMPORTS = {
+    "SceneTransformer": "modules.scene_transformer",
+    "REPORT_PROJECTIONS": "modules.stash_client",
+    "SCENE_PROJECTIONS": "modules.stash_client",
+    "Scene": "modules.stash_client",
+    "StashClient": "modules.stash_client",
+    "StashDatabaseError": "modules.stash_sqlite",
+    "StashSQLiteReader": "modules.stash_sqlite",
+    "ReportStateStore": "modules.report_state",
+    "StoredReportRow": "modules.report_state",
+    "max_timestamp": "modules.report_state",
+    "state_fingerprint": "modules.report_state",
+    "StudioSnapshot": "modules.studio_cache",
+    "StudioSnapshotCache": "modules.studio_cache",
+    "normalize_report_format": "modules.report_sinks",
+    "open_report_sink": "modules.report_sinks",
+    "report_path_for_format": "modules.report_sinks",
+    "report_suffix": "modules.report_sinks",
+}
+
+
+def _load_plugin_modules() -> bool:
+    """
+    Import the Stash plugin dependencies into this module's globals.
+
+    Names already present (e.g. test doubles) are left alone.
+
+    Returns:
+        True when every plugin module could be imported
+    """
+    namespace = globals()
+    for name, module_name in _PLUGIN_IMPORTS.items():
+        if name in namespace:
+            continue
+        try:
+            namespace[name] = getattr(importlib.import_module(module_name), name)
+        except ImportError:
+            # Allow library usage without Stash dependencies
+            return False
+    return True
 
-try:
-    from modules.scene_transformer import SceneTransformer
-    from modules.stash_client import Scene, StashClient
-    STASH_MODULES_AVAILABLE = True
-except ImportError:
-    # Allow library usage without Stash dependencies
-    STASH_MODULES_AVAILABLE = False
 
-from modules.excel_writer import ExcelSheetData, write_excel_workbook
+def __getattr__(name: str) -> Any:
+    # PEP 562: `yansa.StashClient` and friends resolve on first access.
+    if name in _PLUGIN_IMPORTS and _load_plugin_modules():
+        return globals()[name]
+    if name == "STASH_MODULES_AVAILABLE":
+        return _load_plugin_modules()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ============================================================================
@@ -95,15 +148,39 @@ from modules.excel_writer import ExcelSheetData, write_excel_workbook
 # ============================================================================
 
 class FilenameParser:
-    """Parser for extracting metadata from adult film filenames."""
+    """
+    Parser for extracting metadata from adult film filenames.
+
+    `parse` is reentrant: all lookup tables are built in `__init__` from
+    read-only dictionaries and each call works on its own result objects, so
+    one instance can be shared by the threads of a ThreadPoolExecutor
+    (including on free-threaded builds). Swapping components or calling
+    `configure_pipeline` while other threads parse is not supported.
+    """
 
-    def __init__(self, stash_studios=None):
+    # Dictionary file -> components whose lookup tables are built from it
+    # (see `with_reloaded_dictionaries`).
+    DICTIONARY_COMPONENTS: Dict[str, Tuple[str, ...]] = {
+        "parser-dictionary.json": ("pre_tokenizer", "tokenizer", "performer_matcher", "final_stage_extractor"),
+        "date_formats.json": ("date_extractor",),
+        "studios.json": ("studio_matcher",),
+        "studio_aliases.json": ("studio_matcher",),
+        "studio_codes.json": ("studio_code_finder",),
+    }
+
+    def __init__(self, stash_studios=None, studio_index=None, pipeline=None):
         """
         Initialize the filename parser.
 
         Args:
             stash_studios: Optional list of SceneStudio objects from Stash API.
                           If provided, uses Stash's database for studio matching instead of static JSON.
+            studio_index: Optional prebuilt StudioMatcher index (see StudioMatcher.to_index()),
+                          reused instead of rebuilding the studio lookup from `stash_studios`.
+            pipeline: Optional `pipeline` config section (see modules/stage_graph.py) to
+                      disable stages or add early exits. None runs every stage.
+                      `catalog_path` points the optional `catalog` stage at a
+                      scraped catalog database (default: ref/scraped_data.sqlite3).
         """
         # Preload all dictionaries into cache to avoid redundant file I/O
         # across multiple modules. Modules will use cached versions.
@@ -113,11 +190,67 @@ class FilenameParser:
         # self.path_parser = PathParser()  # Disabled - not working on paths yet
         self.tokenizer = Tokenizer()
         self.date_extractor = DateExtractor()
-        self.studio_matcher = StudioMatcher(stash_studios=stash_studios)
+        self.studio_matcher = StudioMatcher(stash_studios=stash_studios, studio_index=studio_index)
         self.studio_code_finder = StudioCodeFinder()
         self.performer_matcher = PerformerMatcher()
         self.final_stage_extractor = FinalStageExtractor()
         # self.resolver = PathFilenameResolver()  # Disabled - not working on paths yet
+        self.stage_graph = StageGraph.from_config(pipeline)
+        self.studio_catalog = self._load_catalog(pipeline)
+        # Studios from Stash or a snapshot do not change when studios.json does.
+        self._studios_from_json = stash_studios is None and studio_index is None
+
+    def with_reloaded_dictionaries(self, dictionary_names: Iterable[str]) -> "FilenameParser":
+        """
+        Return a copy of this parser with the components built from the given
+        dictionaries rebuilt from the (already reloaded) DictionaryLoader cache.
+
+        Unaffected components are shared with this parser, which keeps working
+        on its own tables, so parses in flight can finish on the old state.
+
+        Args:
+            dictionary_names: Dictionary file names that changed (e.g. 'studios.json')
+
+        Returns:
+            New FilenameParser
+        """
+        factories = {
+            "pre_tokenizer": PreTokenizer,
+            "tokenizer": Tokenizer,
+            "date_extractor": DateExtractor,
+            "studio_matcher": StudioMatcher,
+            "studio_code_finder": StudioCodeFinder,
+            "performer_matcher": PerformerMatcher,
+            "final_stage_extractor": FinalStageExtractor,
+        }
+        components = {
+            component
+            for name in dictionary_names
+            for component in self.DICTIONARY_COMPONENTS.get(name, ())
+        }
+        if not self._studios_from_json:
+            components.discard("studio_matcher")
+
+        clone = copy.copy(self)
+        for component in sorted(components):
+            setattr(clone, component, factories[component]())
+        return clone
+
+    def configure_pipeline(self, pipeline: Optional[Dict[str, Any]]) -> None:
+        """
+        Replace the stage graph from a `pipeline` config section.
+
+        Raises:
+            ValueError: If the configuration names unknown stages or fields
+        """
+        self.stage_graph = StageGraph.from_config(pipeline)
+        self.studio_catalog = self._load_catalog(pipeline)
+
+    def _load_catalog(self, pipeline: Optional[Dict[str, Any]]) -> Optional[StudioCatalog]:
+        """Load the scene catalog once when the `catalog` stage is enabled."""
+        if "catalog" in self.stage_graph.inactive | self.stage_graph.disabled:
+            return None
+        return StudioCatalog.from_sqlite((pipeline or {}).get("catalog_path"))
 
     def pre_tokenize(self, filename: Union[str, Path]) -> PreTokenizationResult:
         """Process basename (stem) before tokenization by removing early removal tokens."""
@@ -143,10 +276,24 @@ class FilenameParser:
         """Fallback studio matching for tokens with internal dashes."""
         return self.studio_matcher.process_dash_fallback(token_result)
 
+    def match_catalog(self, token_result: TokenizationResult) -> TokenizationResult:
+        """Confirm and fill title, date and studio code from the studio's scene catalog."""
+        if self.studio_catalog is None:
+            return token_result
+        return self.studio_catalog.process(token_result)
+
+    def match_studios_word_fallback(self, token_result: TokenizationResult) -> TokenizationResult:
+        """Fallback studio matching for whole-word studio names inside tokens."""
+        return self.studio_matcher.process_word_fallback(token_result)
+
     def match_studios_partial_fallback(self, token_result: TokenizationResult) -> TokenizationResult:
         """Fallback studio matching for partial/substring matches within tokens."""
         return self.studio_matcher.process_partial_match_fallback(token_result)
 
+    def match_studios_fuzzy_fallback(self, token_result: TokenizationResult) -> TokenizationResult:
+        """Fallback studio matching for misspelled names (optional `studios_fuzzy_fallback` stage)."""
+        return self.studio_matcher.process_fuzzy_fallback(token_result)
+
     def find_studio_codes(self, token_result: TokenizationResult) -> TokenizationResult:
         """Find and mark studio codes in tokens."""
         return self.studio_code_finder.process(token_result)
@@ -159,6 +306,18 @@ class FilenameParser:
         """Final stage: extract sequences, group, and title together."""
         return self.final_stage_extractor.process(token_result)
 
+    def apply_existing_studio(
+        self, token_result: TokenizationResult, existing_studio: Optional[str]
+    ) -> TokenizationResult:
+        """Use an externally-provided studio when none (or "unknown") was parsed."""
+        # Treat placeholder "unknown" as unset for this purpose.
+        existing_value = (str(existing_studio).strip() if existing_studio is not None else "")
+        if existing_value:
+            current_studio = (token_result.studio or "").strip()
+            if not current_studio or current_studio.lower() == "unknown":
+                token_result.studio = existing_value
+        return token_result
+
     def parse(self, filename: Union[str, Path], *, existing_studio: Optional[str] = None) -> TokenizationResult:
         """
         Full parsing pipeline.
@@ -169,10 +328,16 @@ class FilenameParser:
         3. Extract dates
         4. Match studios
         4.5. Match studios (dash fallback) - only if no studio found yet
+        4.6. Match studios (word-trie fallback) - only if no studio found yet
         4.75. Match studios (partial fallback) - only if no studio found yet
+        4.9. Fall back to `existing_studio` when no studio was parsed
         5. Find studio codes
         6. Match performers
         7. Final stage: extract sequence, group, and title
+        8. Confirm/fill title, date and code from the studio catalog (optional stage)
+
+        Steps 3-8 are stages of `self.stage_graph`; a `pipeline` config can
+        disable them or stop early (see modules/stage_graph.py).
 
         Args:
             filename: Filename or path-like string; directories are ignored (directory-agnostic parsing).
@@ -183,12 +348,30 @@ class FilenameParser:
         Returns:
             TokenizationResult with all fields extracted
         """
-        filename_str = str(filename)
-
         # Step 1: Pre-tokenization (remove quality markers, extensions, etc.).
         # Directory-agnostic: PreTokenizer strips any parent folders before processing.
-        pre_result = self.pre_tokenize(filename_str)
+        pre_result = self.pre_tokenize(str(filename))
+        return self.parse_pre_tokenized(pre_result, existing_studio=existing_studio)
+
+    def parse_pre_tokenized(
+        self,
+        pre_result: PreTokenizationResult,
+        *,
+        existing_studio: Optional[str] = None,
+    ) -> TokenizationResult:
+        """
+        Run pipeline steps 2-7 on an existing pre-tokenization result.
+
+        Useful when a PreTokenizationResult is already at hand; the returned
+        result carries it as `pre_tokenization` (and its `removed_tokens`).
 
+        Args:
+            pre_result: Result of `pre_tokenize(filename)`
+            existing_studio: See `parse`
+
+        Returns:
+            TokenizationResult with all fields extracted
+        """
         # Step 2: Tokenization (extract tokens and pattern)
         token_result = self.tokenize(pre_result)
 
@@ -198,37 +381,16 @@ class FilenameParser:
         #     path_token = Token(value=path_result.path, type='path', position=0)
         #     token_result.tokens = [path_token] + (token_result.tokens or [])
 
-        # Preserve original input for traceability
+        # Preserve original input and pre-tokenization output for traceability;
+        # callers read removed tokens from the result instead of pre-tokenizing again.
         token_result.original = pre_result.original
+        token_result.removed_tokens = pre_result.removed_tokens
+        token_result.pre_tokenization = pre_result
 
-        # Step 3: Date extraction (extract dates and renumber tokens)
-        final_result = self.extract_dates(token_result)
-
-        # Step 4: Studio matching (identify and mark studio tokens)
-        final_result = self.match_studios(final_result)
-
-        # Step 4.5: Studio matching with dash fallback (only if no studio found yet)
-        final_result = self.match_studios_dash_fallback(final_result)
-
-        # Step 4.75: Studio matching with partial fallback (only if no studio found yet)
-        final_result = self.match_studios_partial_fallback(final_result)
-
-        # Optional externally-provided studio value (used for studio_code parsing only).
-        # Treat placeholder "unknown" as unset for this purpose.
-        existing_value = (str(existing_studio).strip() if existing_studio is not None else "")
-        if existing_value:
-            current_studio = (final_result.studio or "").strip()
-            if not current_studio or current_studio.lower() == "unknown":
-                final_result.studio = existing_value
-
-        # Step 5: Studio code finding (identify and mark studio code tokens)
-        final_result = self.find_studio_codes(final_result)
-
-        # Step 6: Performer matching (identify and mark performer tokens)
-        final_result = self.match_performers(final_result)
-
-        # Step 7: Final stage (sequence, group, title)
-        final_result = self.finalize_structure(final_result)
+        # Steps 3-8 run through the stage graph (dates, studios and fallbacks,
+        # existing studio, studio codes, performers, final structure, catalog);
+        # the default graph runs all but the optional ones in order.
+        final_result = self.stage_graph.run(self, token_result, StageContext(existing_studio=existing_studio))
 
         # PATH PROCESSING DISABLED - Not working on paths yet
         # # Step 9: Resolve path vs filename signals (telemetry + fallback)
@@ -239,7 +401,7 @@ class FilenameParser:
 
 @dataclass
 class SceneReportRow:
-    """Single row for the Excel report."""
+    """Single row for the plugin report."""
 
     parent: Optional[str]
     stem: str
@@ -305,7 +467,7 @@ class StashYansaPlugin:
     """
 
     def __init__(self, input_data: Dict[str, Any]):
-        if not STASH_MODULES_AVAILABLE:
+        if not _load_plugin_modules():
             raise RuntimeError(
                 "Stash plugin modules not available. "
                 "Ensure all required modules (batch_processor, scene_transformer, "
@@ -320,8 +482,18 @@ class StashYansaPlugin:
         self.scene_transformer = SceneTransformer()
 
         # Fetch studios from Stash database for matching (preferred over static JSON)
-        self.stash_studios = self._fetch_stash_studios()
-        self.filename_parser = FilenameParser(stash_studios=self.stash_studios)
+        studio_snapshot = self._load_studio_snapshot()
+        if studio_snapshot is not None:
+            self.stash_studios = studio_snapshot.studios
+            self.filename_parser = FilenameParser(
+                stash_studios=self.stash_studios,
+                studio_index=studio_snapshot.index,
+            )
+        else:
+            self.stash_studios = self._fetch_stash_studios()
+            self.filename_parser = FilenameParser(stash_studios=self.stash_studios)
+        # Scenes sharing a basename (re-encodes, copies) are parsed once per run.
+        self.parse_cache = ParseCache(self.filename_parser)
 
         self.config = self._load_config()
         self._apply_config()
@@ -333,11 +505,36 @@ class StashYansaPlugin:
 
         try:
             if mode in {"run", "report", "list"}:
-                return self._generate_excel_report()
+                return self._generate_excel_report(incremental=bool(self.args.get("incremental", False)))
+            if mode == "incremental":
+                return self._generate_excel_report(incremental=True)
             return self._error_response(f"Unknown mode for filename report plugin: {mode}")
         except Exception as exc:  # noqa: BLE001
             return self._error_response(f"Plugin error: {exc}")
 
+    def _load_studio_snapshot(self) -> Optional[StudioSnapshot]:
+        """
+        Load studios and the matcher index from the on-disk snapshot, refreshing only what changed.
+
+        Returns:
+            StudioSnapshot, or None when caching is disabled or the snapshot cannot be refreshed
+        """
+        if not self.args.get("studio_cache", True):
+            return None
+
+        cache = StudioSnapshotCache(self._state_dir() / "studio-snapshot.json", instance=self.stash_client.url)
+        try:
+            snapshot = cache.refresh(
+                self.stash_client,
+                build_index=lambda studios: StudioMatcher(stash_studios=studios).to_index(),
+            )
+        except Exception as e:  # noqa: BLE001
+            self._log_warning(f"Studio snapshot unavailable ({e}). Fetching studios directly.")
+            return None
+
+        self._log(f"Loaded {snapshot.count} studios ({snapshot.source} snapshot)")
+        return snapshot
+
     def _fetch_stash_studios(self) -> Optional[List[Any]]:
         """
         Fetch all studios from Stash database.
@@ -360,6 +557,33 @@ class StashYansaPlugin:
         self.scene_transformer.include_path_in_filename = bool(processing.get("include_path_in_filename", False))
         self.scene_transformer.mark_organized = bool(conflicts.get("mark_organized", False))
 
+        try:
+            self.filename_parser.configure_pipeline(self.config.get("pipeline"))
+        except ValueError as exc:
+            self._log_warning(f"Invalid pipeline config ({exc}); running every parser stage")
+            self.filename_parser.configure_pipeline(None)
+
+        projection = processing.get("scene_projection") or "report"
+        if projection in SCENE_PROJECTIONS and projection not in REPORT_PROJECTIONS:
+            # Every plugin mode builds a report: rows need performers, incremental runs updated_at.
+            self._log_error(
+                f"scene_projection '{projection}' lacks fields the report needs (updated_at, performers); "
+                "using 'report'"
+            )
+            projection = "report"
+        try:
+            self.stash_client.set_scene_projection(
+                projection,
+                primary_file_only=self.scene_transformer.prefer_first_file,
+            )
+        except ValueError:
+            self._log_warning(f"Unknown scene_projection '{projection}', using 'report'")
+            self.stash_client.set_scene_projection(
+                "report",
+                primary_file_only=self.scene_transformer.prefer_first_file,
+            )
+        self.stash_client.measure_projection_savings = bool(processing.get("projection_telemetry", False))
+
     def _load_config(self) -> Dict[str, Any]:
         """
         Load configuration from multiple sources with precedence:
@@ -374,10 +598,21 @@ class StashYansaPlugin:
                 "auto_apply": True,
                 "include_path_in_filename": False,
                 "max_scenes": None,  # None = all
+                "database_path": None,  # Optional Stash SQLite path for the read-only fast path
+                "scene_projection": "report",  # GraphQL scene fields to fetch: full or report
+                "projection_telemetry": False,  # Re-fetch page 1 with the full projection to log savings
+                "report_format": None,  # xlsx, csv, jsonl or parquet (None = from report_path suffix, else xlsx)
             },
             "conflicts": {
                 "mark_organized": False,  # Phase 1 default: preserve unorganized status
             },
+            "pipeline": {
+                "disabled_stages": [],  # Parser stages to skip (see modules/stage_graph.py)
+                "enabled_stages": [],  # Optional stages to run, e.g. "studios_fuzzy_fallback", "catalog"
+                "catalog_path": None,  # Scene catalog for the "catalog" stage (None = ref/scraped_data.sqlite3)
+                "early_exit": [],  # e.g. {"after": "studio_codes", "when": ["studio", "studio_code"]}
+                "profile": False,  # Log per-stage timings and time saved by skipped stages
+            },
             "ui": {
                 "sort_by": "filename",
             },
@@ -415,7 +650,17 @@ class StashYansaPlugin:
 
         # Convenience: allow flat overrides in args for common settings.
         processing_overrides: Dict[str, Any] = {}
-        for key in ("batch_size", "confidence_threshold", "auto_apply", "include_path_in_filename", "max_scenes"):
+        for key in (
+            "batch_size",
+            "confidence_threshold",
+            "auto_apply",
+            "include_path_in_filename",
+            "max_scenes",
+            "database_path",
+            "scene_projection",
+            "projection_telemetry",
+            "report_format",
+        ):
             if key in self.args:
                 processing_overrides[key] = self.args[key]
         if processing_overrides:
@@ -430,8 +675,16 @@ class StashYansaPlugin:
 
         return merged
 
-    def _generate_excel_report(self) -> Dict[str, Any]:
-        """Fetch unorganized scenes, parse filenames, and emit an Excel report."""
+    def _generate_excel_report(self, incremental: bool = False) -> Dict[str, Any]:
+        """
+        Fetch unorganized scenes, parse filenames, and emit a report (Excel by default).
+
+        Full runs parse every unorganized scene and store the rows plus the
+        highest `updated_at` seen. Incremental runs only fetch scenes updated
+        since that watermark, merge them into the stored rows, and regenerate
+        the workbook from the stored state. Stored rows built by a different
+        parser, dictionary set or pipeline configuration force a full run.
+        """
         processing = self.config.get("processing") or {}
         max_scenes = processing.get("max_scenes")
         max_scenes_int: Optional[int]
@@ -442,55 +695,268 @@ class StashYansaPlugin:
         except (TypeError, ValueError):
             max_scenes_int = None
 
+        reader = self._open_sqlite_reader()
+        instance = self._state_instance(reader)
+        fingerprint = self._report_fingerprint()
+        self.parse_cache.clear()
+
+        with ReportStateStore(self._determine_state_path()) as state:
+            watermark = state.get_watermark(instance) if incremental else None
+            if incremental and watermark is None:
+                self._log("No stored report state for this Stash instance; running a full report")
+            elif watermark is not None and state.get_fingerprint(instance) != fingerprint:
+                self._log(
+                    "Parser, dictionaries or pipeline settings changed since the stored report; running a full report"
+                )
+                watermark = None
+
+            if watermark is not None:
+                stats = self._refresh_report_state(state, instance, reader, watermark, fingerprint)
+                stored_rows = list(state.iter_rows(instance))
+            else:
+                stats, stored_rows = self._rebuild_report_state(state, instance, reader, max_scenes_int, fingerprint)
+
+        self._log(self.parse_cache.summary())
+        self.parse_cache.clear()
+        profiler = self.filename_parser.stage_graph.profiler
+        if profiler is not None:
+            self._log(profiler.summary())
+            self._log(f"Studio prefilter: {self.filename_parser.studio_matcher.prefilter.describe()}")
+        self._log(f"Prepared {len(stored_rows)} report rows ({stats['skipped']} skipped)")
+        report_format = normalize_report_format(processing.get("report_format"), self.args.get("report_path"))
+        report_path = self._determine_report_path(report_format)
+        with open_report_sink(
+            report_path,
+            SceneReportRow.headers(),
+            report_format=report_format,
+            sheet_name="Filename Parser Results",
+        ) as sink:
+            for row in stored_rows:
+                sink.write_row(row.values, row.bold_mask)
+        self._log(f"Wrote {report_format} report to {report_path}")
+
+        return {
+            "output": {
+                "mode": "incremental" if watermark is not None else "report",
+                "report_path": str(report_path),
+                "report_format": report_format,
+                "total_scenes": stats["total_scenes"],
+                "parsed_rows": len(stored_rows),
+                "skipped": stats["skipped"],
+                "removed": stats["removed"],
+            }
+        }
+
+    def _rebuild_report_state(
+        self,
+        state: ReportStateStore,
+        instance: str,
+        reader: Optional[StashSQLiteReader],
+        limit: Optional[int],
+        fingerprint: str,
+    ) -> Tuple[Dict[str, int], List[StoredReportRow]]:
+        """Parse every unorganized scene and replace the stored report state."""
         self._log("Fetching unorganized scenes from Stash...")
         self._last_progress_logged = 0
-        scenes = self.stash_client.get_all_unorganized_scenes(
-            progress_callback=self._progress_callback,
-            limit=max_scenes_int,
-        )
-        self._log(f"Fetched {len(scenes)} scenes")
+        if reader is not None:
+            scenes: Iterable[Scene] = reader.iter_unorganized_scenes(
+                progress_callback=self._progress_callback,
+                limit=limit,
+            )
+        else:
+            scenes = self.stash_client.get_all_unorganized_scenes(
+                progress_callback=self._progress_callback,
+                limit=limit,
+            )
 
-        if max_scenes_int:
-            self._log(f"Limiting report to first {len(scenes)} scenes (max_scenes={max_scenes_int})")
+        stored_rows: List[StoredReportRow] = []
+        skipped = 0
+        total_scenes = 0
+        watermark: Optional[str] = None
+
+        try:
+            for scene in scenes:
+                total_scenes += 1
+                watermark = max_timestamp(watermark, scene.updated_at)
+                stored = self._build_stored_row(scene)
+                if stored is None:
+                    skipped += 1
+                    continue
+                stored_rows.append(stored)
+        except StashDatabaseError as exc:
+            if reader is None:
+                raise
+            # Nothing is stored until the fetch completes, so restarting drops the partial rows.
+            self._log_warning(f"{exc} after {total_scenes} scenes. Falling back to GraphQL.")
+            return self._rebuild_report_state(state, instance, None, limit, fingerprint)
+
+        self._log(f"Fetched {total_scenes} scenes")
+        if reader is None:
+            self._log_fetch_telemetry()
+        if limit:
+            # A truncated run is not a complete baseline for incremental updates.
+            self._log(f"Limiting report to first {total_scenes} scenes (max_scenes={limit})")
+        else:
+            state.replace_rows(instance, stored_rows)
+            if watermark:
+                state.set_watermark(instance, watermark, fingerprint)
+                self._log(f"Stored report state (updated_at watermark {watermark})")
+
+        return {"total_scenes": total_scenes, "skipped": skipped, "removed": 0}, stored_rows
+
+    def _refresh_report_state(
+        self,
+        state: ReportStateStore,
+        instance: str,
+        reader: Optional[StashSQLiteReader],
+        watermark: str,
+        fingerprint: str,
+    ) -> Dict[str, int]:
+        """
+        Re-parse only scenes updated since `watermark` and merge them into the stored state.
+
+        Rows of scenes that were deleted (or organized without a visible
+        update) are dropped by reconciling the stored scene IDs against the
+        current unorganized scene IDs.
+        """
+        self._log(f"Fetching scenes updated since {watermark}...")
+        self._last_progress_logged = 0
+        if reader is not None:
+            scenes: Iterable[Scene] = reader.iter_scenes_updated_since(
+                watermark,
+                progress_callback=self._progress_callback,
+            )
+        else:
+            scenes = self.stash_client.get_all_scenes_updated_since(
+                watermark,
+                progress_callback=self._progress_callback,
+            )
 
-        report_rows: List[SceneReportRow] = []
+        updated_rows: List[StoredReportRow] = []
+        removed_ids: List[str] = []
         skipped = 0
+        total_scenes = 0
+        new_watermark: Optional[str] = watermark
 
-        for scene in scenes:
-            try:
-                row = self._build_report_row(scene)
-            except Exception as exc:  # noqa: BLE001
-                skipped += 1
-                self._log(f"Failed to parse scene {scene.id}: {exc}")
-                continue
+        try:
+            for scene in scenes:
+                total_scenes += 1
+                new_watermark = max_timestamp(new_watermark, scene.updated_at)
+                if scene.organized:
+                    removed_ids.append(scene.id)
+                    continue
+                stored = self._build_stored_row(scene)
+                if stored is None:
+                    skipped += 1
+                    removed_ids.append(scene.id)
+                    continue
+                updated_rows.append(stored)
+            if reader is not None:
+                current_ids = reader.get_unorganized_scene_ids()
+        except StashDatabaseError as exc:
+            if reader is None:
+                raise
+            # Nothing is merged until the fetch completes, so restarting drops the partial rows.
+            self._log_warning(f"{exc} after {total_scenes} scenes. Falling back to GraphQL.")
+            return self._refresh_report_state(state, instance, None, watermark, fingerprint)
+
+        if reader is None:
+            self._log_fetch_telemetry()
+            current_ids = self.stash_client.get_unorganized_scene_ids()
+        updated_ids = {row.scene_id for row in updated_rows}
+        stale_ids = state.scene_ids(instance) - current_ids - updated_ids - set(removed_ids)
+        removed_ids.extend(sorted(stale_ids))
+
+        state.upsert_rows(instance, updated_rows)
+        state.delete_rows(instance, removed_ids)
+        if new_watermark:
+            state.set_watermark(instance, new_watermark, fingerprint)
+
+        self._log(
+            f"Merged {len(updated_rows)} updated scenes into report state "
+            f"({len(removed_ids)} removed, {state.count_rows(instance)} total)"
+        )
+        return {"total_scenes": total_scenes, "skipped": skipped, "removed": len(removed_ids)}
 
-            if row:
-                report_rows.append(row)
-            else:
-                skipped += 1
-
-        self._log(f"Prepared {len(report_rows)} report rows ({skipped} skipped)")
-        headers = SceneReportRow.headers()
-        sheet = ExcelSheetData(
-            name="Filename Parser Results",
-            headers=headers,
-            rows=[row.to_excel_row() for row in report_rows],
-            bold_cells=[row.bold_mask or [False] * len(headers) for row in report_rows],
+    def _log_fetch_telemetry(self) -> None:
+        telemetry = getattr(self.stash_client, "last_fetch_telemetry", None)
+        if telemetry is not None and telemetry.pages:
+            self._log(f"Scene fetch: {telemetry.summary()}")
+
+    def _build_stored_row(self, scene: Scene) -> Optional[StoredReportRow]:
+        """Parse a scene into a persistable report row, or None when it must be skipped."""
+        try:
+            row = self._build_report_row(scene)
+        except Exception as exc:  # noqa: BLE001
+            self._log(f"Failed to parse scene {scene.id}: {exc}")
+            return None
+        if not row:
+            return None
+
+        sort_key = f"{(scene.title or '').casefold()}\x1f{scene.id.zfill(12)}"
+        return StoredReportRow(
+            scene_id=scene.id,
+            sort_key=sort_key,
+            values=row.to_excel_row(),
+            bold_mask=row.bold_mask,
         )
 
-        report_path = self._determine_report_path()
-        write_excel_workbook(report_path, [sheet])
-        self._log(f"Wrote Excel report to {report_path}")
+    def _open_sqlite_reader(self) -> Optional[StashSQLiteReader]:
+        """
+        Return a validated SQLite reader when `database_path` is configured.
 
-        return {
-            "output": {
-                "mode": "report",
-                "report_path": str(report_path),
-                "total_scenes": len(scenes),
-                "parsed_rows": len(report_rows),
-                "skipped": skipped,
-            }
+        Falls back to the GraphQL client (returns None) if the database cannot
+        be read.
+        """
+        processing = self.config.get("processing") or {}
+        database_path = processing.get("database_path")
+        if not database_path:
+            return None
+
+        reader = StashSQLiteReader(str(database_path))
+        try:
+            # Fail fast on an unreadable database before streaming starts.
+            reader.validate_schema()
+        except StashDatabaseError as exc:
+            self._log_warning(f"{exc}. Falling back to GraphQL.")
+            return None
+
+        self._log(f"Reading scenes directly from {reader.database_path} (read-only)")
+        return reader
+
+    def _report_fingerprint(self) -> str:
+        """Fingerprint the parser code, dictionaries and settings that report rows depend on."""
+        root = Path(__file__).resolve().parent
+        paths = [
+            root / "yansa.py",
+            *root.glob("modules/*.py"),
+            *DictionaryLoader.get_dictionary_path().parent.glob("*.json"),
+        ]
+        processing = self.config.get("processing") or {}
+        settings = {
+            "pipeline": self.config.get("pipeline") or {},
+            "include_path_in_filename": processing.get("include_path_in_filename"),
         }
+        return state_fingerprint(paths, settings)
+
+    def _state_instance(self, reader: Optional[StashSQLiteReader]) -> str:
+        """Identify the Stash instance (and source) that report state belongs to."""
+        if reader is not None:
+            return f"sqlite:{reader.database_path.resolve()}"
+        return f"graphql:{self.stash_client.url}"
+
+    def _determine_state_path(self) -> Path:
+        """Resolve the SQLite file holding incremental report state."""
+        explicit_path = self.args.get("state_path")
+        if explicit_path:
+            return Path(str(explicit_path))
+        return self._state_dir() / "report-state.sqlite3"
+
+    def _state_dir(self) -> Path:
+        """Directory for persisted plugin state (report rows, studio snapshot)."""
+        plugin_dir = self.server_connection.get("PluginDir")
+        base_path = Path(str(plugin_dir)) if plugin_dir else Path(__file__).resolve().parent
+        return base_path / "state"
 
     def _build_report_row(self, scene: Scene) -> Optional[SceneReportRow]:
         """Convert a scene to a report row without overwriting existing metadata."""
@@ -499,11 +965,10 @@ class StashYansaPlugin:
             return None
 
         filename = file.basename
-        pre_result = self.filename_parser.pre_tokenize(filename)
         existing_studio = scene.studio.name if scene.studio else None
-        parse_result = self.filename_parser.parse(filename, existing_studio=existing_studio)
+        parse_result = self.parse_cache.parse(filename, existing_studio=existing_studio)
 
-        removed_str = " | ".join(f"{t.value}({t.category})" for t in pre_result.removed_tokens)
+        removed_str = " | ".join(f"{t.value}({t.category})" for t in parse_result.removed_tokens or [])
         tokens = parse_result.tokens or []
         date_token = next((token.value for token in tokens if token.type == "date"), None)
 
@@ -523,11 +988,16 @@ class StashYansaPlugin:
         studio_code_value = stash_code or getattr(parse_result, "studio_code", None)
         title_value = stash_title or parse_result.title
         performers_value = stash_performers or parsed_performers
-        date_value = stash_date or date_token
+        date_value = stash_date or date_token or parse_result.date
 
         parent = file.parent_folder_path
         if not parent and file.path:
-            parent_candidate = Path(file.path).parent.as_posix()
+            # The report projection omits parent_folder; derive it from the path
+            # (Stash on Windows reports backslash-separated paths).
+            if "\\" in file.path and "/" not in file.path:
+                parent_candidate = str(PureWindowsPath(file.path).parent)
+            else:
+                parent_candidate = Path(file.path).parent.as_posix()
             parent = "" if parent_candidate == "." else parent_candidate
 
         sequence_str = json.dumps(parse_result.sequence) if parse_result.sequence else None
@@ -561,11 +1031,23 @@ class StashYansaPlugin:
             bold_mask=bold_mask,
         )
 
-    def _determine_report_path(self) -> Path:
-        """Resolve the path for the Excel output, creating directories as needed."""
+    def _determine_report_path(self, report_format: str = "xlsx") -> Path:
+        """
+        Resolve the path for the report output, creating directories as needed.
+
+        An explicit `report_path` is used as given unless its suffix names a
+        different report format than `report_format`; then the suffix is
+        replaced so e.g. CSV is never written into a `.xlsx` file.
+        """
         explicit_path = self.args.get("report_path")
         if explicit_path:
             path = Path(str(explicit_path))
+            corrected = report_path_for_format(path, report_format)
+            if corrected != path:
+                self._log_warning(
+                    f"report_path {path.name} does not match report_format '{report_format}'; writing {corrected.name}"
+                )
+                path = corrected
             path.parent.mkdir(parents=True, exist_ok=True)
             return path
 
@@ -582,7 +1064,7 @@ class StashYansaPlugin:
         reports_dir = base_path / "reports"
         reports_dir.mkdir(parents=True, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        filename = f"filename-parser-report-{timestamp}.xlsx"
+        filename = f"filename-parser-report-{timestamp}{report_suffix(report_format)}"
         return reports_dir / filename
 
     def _progress_callback(self, current: int, total: int) -> None:
@@ -612,6 +1094,14 @@ class StashYansaPlugin:
             return
         sys.stderr.write(payload + "\n")
 
+    def _log_error(self, message: str) -> None:
+        """Log an error message via Stash's stderr logging convention."""
+        payload = f"[filename-parser] {message}"
+        if stash_log:
+            stash_log.error(payload)
+            return
+        sys.stderr.write(payload + "\n")
+
     def _error_response(self, message: str) -> Dict[str, Any]:
         """Generate error response for plugin output."""
         return {"error": message, "output": None}